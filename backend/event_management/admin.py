@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Category, Event, EventRegistration
+from django.db import transaction
+from .models import Category, CheckInScan, Event, EventRegistration, Notification, ReportJob
+from .seats import lock_event, promote_waitlisted
 
 
 @admin.register(Category)
@@ -11,6 +13,7 @@ class CategoryAdmin(admin.ModelAdmin):
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
     list_display = ('title', 'organizer', 'category', 'start_time', 'end_time', 'is_public', 'capacity')
+    list_select_related = ('organizer__user', 'category')
     list_filter = ('is_public', 'category', 'start_time', 'created_at')
     search_fields = ('title', 'description', 'location', 'organizer__username')
     readonly_fields = ('id', 'created_at', 'updated_at')
@@ -31,10 +34,21 @@ class EventAdmin(admin.ModelAdmin):
         }),
     )
 
+    def save_model(self, request, obj, form, change):
+        if not change:
+            return super().save_model(request, obj, form, change)
+        # Igual que la API: un aumento de capacidad promueve la lista de espera
+        with transaction.atomic():
+            lock_event(obj.pk)
+            super().save_model(request, obj, form, change)
+            promote_waitlisted(obj.pk)
+
 
 @admin.register(EventRegistration)
 class EventRegistrationAdmin(admin.ModelAdmin):
     list_display = ('user', 'event', 'status', 'created_at', 'rating', 'comment')
+    # Profile.__str__ usa user.username: evitar una consulta por fila
+    list_select_related = ('user__user', 'event')
     list_filter = ('status', 'created_at', 'event__category')
     search_fields = ('user__username', 'event__title')
     readonly_fields = ('id', 'created_at', 'updated_at')
@@ -46,4 +60,30 @@ class EventRegistrationAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
-    )
\ No newline at end of file
+    )
+
+@admin.register(CheckInScan)
+class CheckInScanAdmin(admin.ModelAdmin):
+    list_display = ('scan_id', 'registration', 'device_id', 'scanned_at', 'received_at')
+    list_select_related = ('registration__user__user', 'registration__event')
+    list_filter = ('received_at',)
+    search_fields = ('scan_id', 'device_id')
+    raw_id_fields = ('event', 'registration')
+    readonly_fields = ('id', 'received_at')
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ('user', 'kind', 'message', 'created_at', 'read_at')
+    list_select_related = ('user__user',)
+    list_filter = ('kind', 'created_at')
+    search_fields = ('user__username', 'message')
+    raw_id_fields = ('user', 'event')
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'period', 'status', 'attempts', 'worker', 'created_at', 'finished_at')
+    list_filter = ('status', 'period')
+    raw_id_fields = ('requested_by',)
+    readonly_fields = ('id', 'created_at', 'started_at', 'finished_at', 'result')
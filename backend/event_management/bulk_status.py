@@ -0,0 +1,98 @@
+# backend/event_management/bulk_status.py
+"""
+Cambios de estado masivos de inscripciones (organizador).
+
+Por cada bloque de ids: un SELECT para conocer el estado actual y un único
+`UPDATE ... WHERE id IN (...)`, sin cargar ni guardar instancias. Los UPDATE
+masivos no disparan señales: el timeline y las notificaciones se escriben aquí y
+quien llama debe invalidar la caché.
+"""
+import uuid
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EventRegistration, NotificationKind, RegistrationStatus
+from .notifications import notify_users
+from .seats import SEATED_STATUSES
+from .timeline import sync_registration_status
+
+# Sólo transiciones entre estados con cupo: no alteran seats_taken
+BULK_TARGET_STATUSES = SEATED_STATUSES
+BULK_CHUNK_SIZE = 500
+MAX_BULK_ITEMS = 5000
+
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+SKIPPED = "skipped"
+NOT_FOUND = "not_found"
+INVALID = "invalid"
+
+
+def _parse_ids(values, by_user):
+    """[(valor original, id normalizado o None)]"""
+    parsed = []
+    for value in values:
+        try:
+            parsed.append((value, int(value) if by_user else uuid.UUID(str(value))))
+        except (TypeError, ValueError, AttributeError):
+            parsed.append((value, None))
+    return parsed
+
+
+def apply_bulk_status(event, target, ids, by_user=False, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Lleva a `target` las inscripciones del evento indicadas por id de inscripción
+    (o por id de usuario si `by_user`). Devuelve (resultados por ítem, ids actualizados).
+    Las inscripciones en lista de espera o canceladas se omiten.
+    """
+    lookup = "user_id" if by_user else "id"
+    parsed = _parse_ids(ids, by_user)
+    outcome = {}
+    updated_ids = []
+
+    with transaction.atomic():
+        valid = list(dict.fromkeys(key for _, key in parsed if key is not None))
+        for start in range(0, len(valid), chunk_size):
+            chunk = valid[start:start + chunk_size]
+            rows = EventRegistration.objects.filter(
+                event=event, **{f"{lookup}__in": chunk}
+            ).values_list(lookup, "id", "user_id", "status")
+
+            to_update = []
+            notified = []
+            for key, registration_id, user_id, current in rows:
+                if current == target:
+                    outcome[key] = UNCHANGED
+                elif current in SEATED_STATUSES:
+                    outcome[key] = UPDATED
+                    to_update.append(registration_id)
+                    notified.append(user_id)
+                else:
+                    outcome[key] = SKIPPED
+
+            if to_update:
+                # La condición de estado repite el filtro por si cambió entre el SELECT y el UPDATE
+                now = timezone.now()
+                EventRegistration.objects.filter(
+                    id__in=to_update, status__in=SEATED_STATUSES
+                ).update(status=target, updated_at=now)
+                sync_registration_status(to_update, target, now, from_statuses=SEATED_STATUSES)
+                notify_users(
+                    notified, NotificationKind.STATUS_CHANGED, event.title,
+                    event_id=event.pk, status=target,
+                )
+                updated_ids.extend(to_update)
+
+    results = [
+        {"id": value, "result": INVALID if key is None else outcome.get(key, NOT_FOUND)}
+        for value, key in parsed
+    ]
+    return results, updated_ids
+
+
+def summarize(results):
+    summary = {UPDATED: 0, UNCHANGED: 0, SKIPPED: 0, NOT_FOUND: 0, INVALID: 0}
+    for item in results:
+        summary[item["result"]] += 1
+    return summary
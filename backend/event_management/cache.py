@@ -0,0 +1,91 @@
+# backend/event_management/cache.py
+"""
+Caché de respuestas para listados públicos (usuarios anónimos).
+
+Las claves incluyen un contador de generación: cualquier cambio en Event,
+Category o EventRegistration lo incrementa (ver signals.py) y todas las
+entradas anteriores quedan huérfanas hasta expirar. Invalidar es O(1).
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+GENERATION_KEY = "events:generation"
+HITS_KEY = "events:cache:hits"
+MISSES_KEY = "events:cache:misses"
+
+
+def _incr(key, initial):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # La clave no existe (o fue desalojada)
+        cache.add(key, initial, timeout=None)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Backends que no guardan nada (DummyCache)
+            return initial
+
+
+def _initial_generation():
+    # Si el contador se pierde, se reinicia en un valor que no choca con los anteriores
+    return int(time.time() * 1000)
+
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, _initial_generation(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    return _incr(GENERATION_KEY, _initial_generation())
+
+
+def normalized_query(request, exclude=()):
+    items = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        if key not in exclude
+        for value in values
+    )
+    return urlencode(items)
+
+
+def build_key(namespace, request):
+    digest = hashlib.md5(normalized_query(request).encode("utf-8")).hexdigest()
+    return f"events:{namespace}:{get_generation()}:{digest}"
+
+
+def get_cached(key):
+    data = cache.get(key)
+    _incr(HITS_KEY if data is not None else MISSES_KEY, 0)
+    return data
+
+
+def set_cached(key, data, timeout=None):
+    if timeout is None:
+        timeout = getattr(settings, "EVENT_CACHE_TIMEOUT", 300)
+    cache.set(key, data, timeout)
+
+
+def get_cache_stats():
+    hits = cache.get(HITS_KEY) or 0
+    misses = cache.get(MISSES_KEY) or 0
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total * 100, 2) if total else 0,
+        "generation": get_generation(),
+    }
+
+
+def reset_cache_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
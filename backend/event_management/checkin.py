@@ -0,0 +1,107 @@
+# backend/event_management/checkin.py
+"""
+Ingesta de check-ins por lotes desde los escáneres de la puerta.
+
+Cada lectura trae un scan_id generado por el dispositivo, la inscripción leída
+(QR) y la hora del dispositivo. Un lote se aplica con pocas consultas:
+
+- un SELECT por bloque para validar las inscripciones del evento,
+- bulk_create(ignore_conflicts=True) de las lecturas: la restricción única
+  (event, scan_id) descarta los reenvíos,
+- un UPDATE por bloque que marca ATTENDED a quienes aún no lo estaban (más
+  el de sus filas de UserEventTimeline).
+
+Reenviar un lote (p. ej. un dispositivo que estuvo sin conexión y no recibió
+la respuesta) es seguro: devuelve los mismos aceptados y no cambia nada más.
+"""
+import uuid
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import CheckInScan, EventRegistration, RegistrationStatus
+from .seats import SEATED_STATUSES
+from .timeline import sync_registration_status
+
+CHECK_IN_CHUNK_SIZE = 500
+MAX_SCANS_PER_BATCH = 5000
+# Tolerancia para relojes de dispositivo adelantados
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+# Estados que pasan a ATTENDED con una lectura
+CHECK_IN_FROM_STATUSES = (RegistrationStatus.REGISTERED, RegistrationStatus.CONFIRMED)
+
+
+def parse_scan(scan, now):
+    """(scan_id, registration_id, scanned_at, device_id) o None si la lectura es inválida."""
+    if not isinstance(scan, dict):
+        return None
+    scan_id = scan.get("scan_id")
+    if not isinstance(scan_id, str) or not scan_id or len(scan_id) > 64:
+        return None
+    try:
+        registration_id = uuid.UUID(str(scan.get("registration_id")))
+        scanned_at = parse_datetime(str(scan.get("scanned_at")))
+    except ValueError:
+        return None
+    if scanned_at is None:
+        return None
+    if timezone.is_naive(scanned_at):
+        scanned_at = timezone.make_aware(scanned_at, timezone.get_current_timezone())
+    if scanned_at > now + MAX_CLOCK_SKEW:
+        return None
+    device_id = scan.get("device_id") or ""
+    return scan_id, registration_id, scanned_at, str(device_id)[:64]
+
+
+def ingest_scans(event, scans, device_id="", chunk_size=CHECK_IN_CHUNK_SIZE):
+    """
+    Registra las lecturas válidas del lote y devuelve (scan_ids aceptados, inscripciones
+    pasadas a ATTENDED). Se acepta una lectura si es válida y corresponde a una
+    inscripción con cupo del evento, incluso si ya había sido recibida antes.
+    """
+    now = timezone.now()
+    parsed = {}
+    for scan in scans:
+        values = parse_scan(scan, now)
+        # Dentro del lote gana la primera lectura de cada scan_id
+        if values is not None and values[0] not in parsed:
+            parsed[values[0]] = values
+
+    accepted = []
+    checked_in = 0
+    items = list(parsed.values())
+    with transaction.atomic():
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            eligible = set(
+                EventRegistration.objects.filter(
+                    event=event,
+                    id__in={registration_id for _, registration_id, _, _ in chunk},
+                    status__in=SEATED_STATUSES,
+                ).values_list("id", flat=True)
+            )
+            rows = [
+                CheckInScan(
+                    event=event,
+                    registration_id=registration_id,
+                    scan_id=scan_id,
+                    device_id=scan_device or device_id,
+                    scanned_at=scanned_at,
+                )
+                for scan_id, registration_id, scanned_at, scan_device in chunk
+                if registration_id in eligible
+            ]
+            if not rows:
+                continue
+            CheckInScan.objects.bulk_create(rows, ignore_conflicts=True)
+            accepted.extend(row.scan_id for row in rows)
+            registration_ids = {row.registration_id for row in rows}
+            checked_in += EventRegistration.objects.filter(
+                id__in=registration_ids, status__in=CHECK_IN_FROM_STATUSES,
+            ).update(status=RegistrationStatus.ATTENDED, updated_at=now)
+            sync_registration_status(
+                registration_ids, RegistrationStatus.ATTENDED, now, from_statuses=CHECK_IN_FROM_STATUSES
+            )
+    return accepted, checked_in
@@ -0,0 +1,77 @@
+# backend/event_management/conditional.py
+"""
+Validadores baratos para GET condicionales (ETag / Last-Modified).
+
+Se calculan con un solo aggregate (COUNT + MAX(updated_at)) sobre el mismo
+queryset que alimenta la respuesta, nunca a partir del cuerpo serializado.
+Así un 304 cuesta una consulta pequeña y no serializa nada.
+"""
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.http import Http404
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from .cache import normalized_query
+
+
+def compute_validators(queryset, timestamp_fields=("updated_at",), scope=""):
+    """Devuelve (etag, last_modified, count) para el queryset."""
+    aggregates = {"validator_count": Count("pk")}
+    for index, field in enumerate(timestamp_fields):
+        aggregates[f"validator_ts_{index}"] = Max(field)
+    values = queryset.order_by().aggregate(**aggregates)
+
+    count = values.pop("validator_count")
+    timestamps = [values[f"validator_ts_{index}"] for index in range(len(timestamp_fields))]
+    present = [ts for ts in timestamps if ts is not None]
+    last_modified = max(present) if present else None
+
+    raw = "|".join([scope, str(count)] + [ts.isoformat() if ts else "-" for ts in timestamps])
+    etag = 'W/"%s"' % hashlib.md5(raw.encode("utf-8")).hexdigest()
+    return etag, last_modified, count
+
+
+class ConditionalGetMixin:
+    """
+    Mixin para ViewSets: `check_conditions()` responde 304 si el cliente ya tiene
+    la versión actual, y `finalize_response` agrega ETag/Last-Modified a la respuesta.
+    """
+
+    def get_validator_scope(self, request):
+        # La respuesta depende del usuario (eventos públicos vs todos, `mine`) y de los filtros
+        user = request.user.pk if request.user.is_authenticated else "anon"
+        return f"{self.__class__.__name__}:{self.action}:{user}:{normalized_query(request)}"
+
+    def get_detail_queryset(self, queryset):
+        """Queryset de la fila pedida por la URL; 404 si la pk está mal formada (UUID inválido)."""
+        value = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        try:
+            value = queryset.model._meta.pk.to_python(value)
+        except ValidationError:
+            raise Http404
+        return queryset.filter(pk=value)
+
+    def check_conditions(self, request, queryset, timestamp_fields=("updated_at",)):
+        etag, last_modified, count = compute_validators(
+            queryset, timestamp_fields, scope=self.get_validator_scope(request)
+        )
+        self._validators = (etag, last_modified)
+        return get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, "_validators", None)
+        if validators and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response["ETag"] = etag
+            if last_modified:
+                response["Last-Modified"] = http_date(last_modified.timestamp())
+            patch_vary_headers(response, ("Authorization",))
+        return response
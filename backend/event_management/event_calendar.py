@@ -0,0 +1,94 @@
+# backend/event_management/event_calendar.py
+"""
+Vista de calendario (mes/semana) con un payload compacto.
+
+Una sola consulta por rango sobre start_time (idx_events_start_time_id) trae
+sólo las columnas que dibuja el calendario, como tuplas. Los eventos se agrupan
+por el día local de su inicio y cada evento es una fila posicional según
+CALENDAR_FIELDS, en lugar de un objeto con claves repetidas.
+"""
+from datetime import date, datetime, time, timedelta
+
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .fast_serializers import datetime_formatter
+
+CALENDAR_FIELDS = ("id", "title", "start_time", "end_time", "category")
+# Una grilla mensual ocupa como máximo 6 semanas
+MAX_CALENDAR_DAYS = 42
+
+
+def _parse_date(value, name):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValidationError({name: "Formato esperado: AAAA-MM-DD."})
+
+
+def parse_range(params):
+    """
+    (desde, hasta) inclusivos a partir de ?start=&end= o de ?month=AAAA-MM.
+    Lanza ValidationError (400) si faltan o el rango es inválido.
+    """
+    month = params.get("month")
+    if month:
+        try:
+            first = datetime.strptime(month, "%Y-%m").date()
+        except ValueError:
+            raise ValidationError({"month": "Formato esperado: AAAA-MM."})
+        following = (first.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return first, following - timedelta(days=1)
+
+    if not params.get("start") or not params.get("end"):
+        raise ValidationError({"detail": "Se requieren start y end, o month."})
+    start = _parse_date(params.get("start"), "start")
+    end = _parse_date(params.get("end"), "end")
+    if end < start:
+        raise ValidationError({"end": "Debe ser igual o posterior a start."})
+    if (end - start).days + 1 > MAX_CALENDAR_DAYS:
+        raise ValidationError({"end": f"El rango no puede superar {MAX_CALENDAR_DAYS} días."})
+    return start, end
+
+
+def range_bounds(start, end, tz=None):
+    """Límites [desde, hasta) en datetime aware para filtrar start_time."""
+    tz = tz or timezone.get_current_timezone()
+    lower = timezone.make_aware(datetime.combine(start, time.min), tz)
+    upper = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz)
+    return lower, upper
+
+
+def calendar_queryset(queryset, start, end):
+    lower, upper = range_bounds(start, end)
+    return (
+        queryset.filter(start_time__gte=lower, start_time__lt=upper)
+        .order_by("start_time", "id")
+        .values_list("id", "title", "start_time", "end_time", "category_id")
+    )
+
+
+def build_calendar(rows, start, end):
+    """Agrupa las filas por día local; sólo aparecen los días con eventos."""
+    tz = timezone.get_current_timezone()
+    format_datetime = datetime_formatter(tz)
+    days = {}
+    count = 0
+    for event_id, title, start_time, end_time, category_id in rows:
+        day = timezone.localtime(start_time, tz).date().isoformat()
+        days.setdefault(day, []).append([
+            str(event_id),
+            title,
+            format_datetime(start_time),
+            format_datetime(end_time) if end_time else None,
+            category_id,
+        ])
+        count += 1
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "timezone": str(tz),
+        "fields": list(CALENDAR_FIELDS),
+        "count": count,
+        "days": days,
+    }
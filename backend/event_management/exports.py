@@ -0,0 +1,233 @@
+# backend/event_management/exports.py
+"""
+Exportación completa de eventos e inscripciones para análisis fuera de línea.
+
+Cada tabla se lee con `.values_list(...).iterator(chunk_size=...)` (cursor del
+lado del servidor en PostgreSQL) y se escribe por bloques, así la memoria no
+depende del tamaño de la tabla:
+
+- Parquet (un row group por bloque) si pyarrow está instalado;
+- si no, CSV comprimido con gzip.
+
+`since` limita la exportación a las filas con updated_at >= since, para
+corridas incrementales (el comando imprime el valor a usar en la siguiente).
+"""
+import csv
+import io
+import json
+import zlib
+
+from django.db.models import JSONField
+
+from .models import Event, EventRegistration
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow es opcional
+    pa = pq = None
+
+EXPORT_CHUNK_SIZE = 5000
+
+EXPORT_TABLES = {
+    "events": (Event, (
+        "id", "organizer_id", "title", "description", "category_id", "location",
+        "latitude", "longitude", "start_time", "end_time", "capacity", "seats_taken",
+        "is_public", "cover_url", "metadata", "rating_sum", "rating_count",
+        "created_at", "updated_at",
+    )),
+    "registrations": (EventRegistration, (
+        "id", "event_id", "user_id", "status", "rating", "comment", "commented_at",
+        "created_at", "updated_at",
+    )),
+}
+
+FORMATS = ("parquet", "csv")
+FILE_EXTENSIONS = {"parquet": "parquet", "csv": "csv.gz"}
+CONTENT_TYPES = {"parquet": "application/vnd.apache.parquet", "csv": "application/gzip"}
+
+
+class ExportError(ValueError):
+    """Tabla o formato inválido (se responde 400/404 con el mensaje)."""
+
+
+def resolve_format(requested=None):
+    """Formato pedido, o Parquet si pyarrow está disponible y CSV si no."""
+    if not requested:
+        return "parquet" if pq is not None else "csv"
+    if requested not in FORMATS:
+        raise ExportError(f"Formato inválido. Opciones: {', '.join(FORMATS)}.")
+    if requested == "parquet" and pq is None:
+        raise ExportError("La exportación a Parquet requiere pyarrow; usa format=csv.")
+    return requested
+
+
+def get_table(table):
+    if table not in EXPORT_TABLES:
+        raise ExportError(f"Tabla inválida. Opciones: {', '.join(EXPORT_TABLES)}.")
+    return EXPORT_TABLES[table]
+
+
+def export_rows(table, since=None, chunk_size=EXPORT_CHUNK_SIZE):
+    model, columns = get_table(table)
+    rows = model.objects.all()
+    if since is not None:
+        # Cubierto por los índices de updated_at
+        rows = rows.filter(updated_at__gte=since).order_by("updated_at", "pk")
+    else:
+        rows = rows.order_by()
+    return rows.values_list(*columns).iterator(chunk_size=chunk_size)
+
+
+def chunked(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _json_text(value):
+    return None if value is None else json.dumps(value, ensure_ascii=False)
+
+
+def _text(value):
+    return None if value is None else str(value)
+
+
+def column_fields(model, columns):
+    # get_field acepta el attname de las FK (organizer_id); su tipo es el de la pk
+    # destino, que a su vez puede ser una relación (Profile.user)
+    fields = []
+    for name in columns:
+        field = model._meta.get_field(name)
+        while field.is_relation:
+            field = field.target_field
+        fields.append(field)
+    return fields
+
+
+def converters(fields):
+    """Valor de values_list -> valor exportable (UUID y JSON como texto)."""
+    result = []
+    for field in fields:
+        if isinstance(field, JSONField):
+            result.append(_json_text)
+        elif field.get_internal_type() == "UUIDField":
+            result.append(_text)
+        else:
+            result.append(None)
+    return result
+
+
+def convert_row(row, convert):
+    return [value if fn is None else fn(value) for value, fn in zip(row, convert)]
+
+
+# --- CSV + gzip ---
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def csv_gzip_chunks(table, since=None, chunk_size=EXPORT_CHUNK_SIZE):
+    model, columns = get_table(table)
+    convert = converters(column_fields(model, columns))
+    # wbits=31: salida con cabecera gzip (un .csv.gz válido)
+    compressor = zlib.compressobj(wbits=31)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for chunk in chunked(export_rows(table, since, chunk_size), chunk_size):
+        writer.writerows([_csv_value(value) for value in convert_row(row, convert)] for row in chunk)
+        data = compressor.compress(buffer.getvalue().encode("utf-8"))
+        buffer.seek(0)
+        buffer.truncate()
+        if data:
+            yield data
+    yield compressor.compress(buffer.getvalue().encode("utf-8")) + compressor.flush()
+
+
+# --- Parquet ---
+
+def arrow_type(field):
+    internal = field.get_internal_type()
+    if internal in ("AutoField", "BigAutoField", "IntegerField", "BigIntegerField",
+                    "PositiveIntegerField", "PositiveSmallIntegerField", "SmallIntegerField"):
+        return pa.int64()
+    if internal == "FloatField":
+        return pa.float64()
+    if internal == "BooleanField":
+        return pa.bool_()
+    if internal == "DateTimeField":
+        return pa.timestamp("us", tz="UTC")
+    # UUID, texto y JSON
+    return pa.string()
+
+
+class StreamSink(io.RawIOBase):
+    """
+    Destino para ParquetWriter que acumula lo escrito hasta drain(). tell() es
+    la posición total (el writer la usa para los offsets del footer).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def parquet_chunks(table, since=None, chunk_size=EXPORT_CHUNK_SIZE):
+    if pq is None:
+        raise ExportError("La exportación a Parquet requiere pyarrow.")
+    model, columns = get_table(table)
+    fields = column_fields(model, columns)
+    convert = converters(fields)
+    schema = pa.schema([(name, arrow_type(field)) for name, field in zip(columns, fields)])
+
+    sink = StreamSink()
+    with pq.ParquetWriter(sink, schema, compression="snappy") as writer:
+        for chunk in chunked(export_rows(table, since, chunk_size), chunk_size):
+            values = list(zip(*(convert_row(row, convert) for row in chunk)))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=schema.field(index).type) for index, column in enumerate(values)],
+                schema=schema,
+            ))
+            yield sink.drain()
+    # Footer
+    yield sink.drain()
+
+
+def export_chunks(table, export_format, since=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Bloques de bytes del archivo exportado."""
+    get_table(table)
+    if resolve_format(export_format) == "parquet":
+        return parquet_chunks(table, since, chunk_size)
+    return csv_gzip_chunks(table, since, chunk_size)
+
+
+def export_filename(table, export_format, now):
+    return f"{table}-{now:%Y%m%dT%H%M%SZ}.{FILE_EXTENSIONS[export_format]}"
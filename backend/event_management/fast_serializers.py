@@ -0,0 +1,248 @@
+# backend/event_management/fast_serializers.py
+"""
+Serialización de sólo lectura para listados grandes.
+
+Construye la salida directamente desde filas de `.values()` con extractores
+precompilados (un callable por campo), sin instanciar modelos ni pasar por
+`SerializerMethodField`. Cada clase refleja a un serializer DRF y debe producir
+exactamente el mismo JSON (mismas claves, mismo orden, mismos valores);
+`manage.py benchmark_serializers` lo verifica y compara tiempos.
+
+Respeta ?fields= / ?omit= igual que SparseFieldsetMixin.
+"""
+from operator import itemgetter
+
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from .serializers import EventRegistrationSerializer, EventSerializer
+
+_datetime_field = serializers.DateTimeField()
+
+
+def datetime_formatter(current_timezone):
+    """
+    Igual que DateTimeField.to_representation de DRF, pero con la zona horaria
+    resuelta una sola vez por serialización y no por cada valor.
+    """
+    if api_settings.DATETIME_FORMAT is None or api_settings.DATETIME_FORMAT.lower() != ISO_8601:
+        return _datetime_field.to_representation
+
+    def format_datetime(value):
+        if timezone.is_naive(value):
+            return _datetime_field.to_representation(value)
+        value = value.astimezone(current_timezone).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return format_datetime
+
+
+# Cada extractor es (columnas de .values(), build); build(context) devuelve el
+# callable que recibe la fila. El contexto se arma una vez por serializer.
+
+def column(name, convert=None):
+    """Extractor para una columna; `convert` no se aplica a None (como DRF)."""
+    getter = itemgetter(name)
+
+    def build(context):
+        if convert is None:
+            return getter
+
+        def extract(row):
+            value = getter(row)
+            return None if value is None else convert(value)
+
+        return extract
+
+    return (name,), build
+
+
+def datetime_column(name):
+    getter = itemgetter(name)
+
+    def build(context):
+        format_datetime = context["format_datetime"]
+
+        def extract(row):
+            value = getter(row)
+            return None if value is None else format_datetime(value)
+
+        return extract
+
+    return (name,), build
+
+
+def computed(columns, function):
+    """Extractor que combina varias columnas."""
+    getters = [itemgetter(name) for name in columns]
+
+    def build(context):
+        def extract(row):
+            return function(*[getter(row) for getter in getters])
+
+        return extract
+
+    return tuple(columns), build
+
+
+def constant(value):
+    return (), lambda context: (lambda row: value)
+
+
+class FastSerializer:
+    serializer_class = None
+    # nombre del campo -> (columnas de .values(), build)
+    extractors = {}
+    # Campos que salen de una anotación opcional: DRF los omite si no existe
+    optional_annotations = ()
+    # Columnas que siempre se leen; por defecto las del serializer DRF
+    always_columns = None
+
+    def __init__(self, request=None):
+        self.field_names = self.get_field_names(request)
+        self.context = {"format_datetime": datetime_formatter(timezone.get_current_timezone())}
+        self.compile(self.field_names)
+
+    def get_field_names(self, request):
+        return self.serializer_class.selected_fields(request)
+
+    def compile(self, field_names):
+        columns = []
+        compiled = []
+        for name in field_names:
+            field_columns, build = self.extractors[name]
+            for col in field_columns:
+                if col not in columns:
+                    columns.append(col)
+            compiled.append((name, build(self.context)))
+        always = self.always_columns
+        if always is None:
+            always = self.serializer_class.sparse_always_columns
+        for col in always:
+            if col not in columns:
+                columns.append(col)
+        self.columns = columns
+        self.compiled = compiled
+
+    def values(self, queryset):
+        annotations = queryset.query.annotations
+        missing = [
+            name for name in self.optional_annotations
+            if name in self.field_names and name not in annotations
+        ]
+        if missing:
+            self.compile([name for name in self.field_names if name not in missing])
+        return queryset.values(*self.columns)
+
+    def to_representation(self, row):
+        return {name: extract(row) for name, extract in self.compiled}
+
+    def serialize(self, rows):
+        compiled = self.compiled
+        return [{name: extract(row) for name, extract in compiled} for row in rows]
+
+
+def _average(rating_sum, rating_count):
+    return rating_sum / rating_count if rating_count else None
+
+
+def _seats_left(capacity, seats_taken):
+    return None if capacity is None else max(capacity - seats_taken, 0)
+
+
+class FastEventSerializer(FastSerializer):
+    """Equivalente de EventSerializer."""
+    serializer_class = EventSerializer
+    extractors = {
+        "id": column("id", str),
+        "organizer": column("organizer_id"),
+        "organizer_username": column("organizer__user__username", str),
+        "title": column("title", str),
+        "description": column("description", str),
+        "category": column("category_id"),
+        "category_name": column("category__name"),
+        "location": column("location", str),
+        "start_time": datetime_column("start_time"),
+        "end_time": datetime_column("end_time"),
+        "capacity": column("capacity", int),
+        "is_public": column("is_public", bool),
+        "cover_url": column("cover_url", str),
+        "created_at": datetime_column("created_at"),
+        "updated_at": datetime_column("updated_at"),
+        "average_rating": computed(("rating_sum", "rating_count"), _average),
+        "seats_left": computed(("capacity", "seats_taken"), _seats_left),
+        "latitude": column("latitude", float),
+        "longitude": column("longitude", float),
+        "distance_km": column("distance_km", float),
+    }
+    optional_annotations = ("distance_km",)
+
+
+class FastEventRegistrationSerializer(FastSerializer):
+    """Equivalente de EventRegistrationSerializer."""
+    serializer_class = EventRegistrationSerializer
+    extractors = {
+        "id": column("id", str),
+        # PrimaryKeyRelatedField devuelve el UUID tal cual
+        "event": column("event_id"),
+        "user": column("user_id"),
+        "rating": column("rating", int),
+        "comment": column("comment", str),
+        "status": column("status", str),
+        "user_username": computed(("user__user__username",), lambda username: username or "Usuario"),
+        # Profile no tiene full_name: el serializer siempre devuelve "Usuario"
+        "user_full_name": constant("Usuario"),
+        "user_email": computed(("user__user__email",), lambda email: email or ""),
+        "created_at": datetime_column("created_at"),
+        "updated_at": datetime_column("updated_at"),
+    }
+
+
+class FastTimelineSerializer(FastSerializer):
+    """
+    Salida de my_events desde UserEventTimeline: los campos de EventSerializer
+    (agenda desde la fila, el resto por JOIN al evento) más los de la inscripción.
+    """
+    serializer_class = EventSerializer
+    # Clave de la paginación por cursor de my_events
+    always_columns = ("registration_id", "event_start_time")
+    registration_fields = (
+        "registration_id", "registration_status", "rating", "comment",
+        "registration_created_at", "registration_updated_at",
+    )
+    extractors = {
+        "id": column("event_id", str),
+        "organizer": column("event__organizer_id"),
+        "organizer_username": column("event__organizer__user__username", str),
+        "title": column("event_title", str),
+        "description": column("event__description", str),
+        "category": column("event_category_id"),
+        "category_name": column("event_category_name"),
+        "location": column("event_location", str),
+        "start_time": datetime_column("event_start_time"),
+        "end_time": datetime_column("event_end_time"),
+        "capacity": column("event__capacity", int),
+        "is_public": column("event_is_public", bool),
+        "cover_url": column("event_cover_url", str),
+        "created_at": datetime_column("event__created_at"),
+        "updated_at": datetime_column("event__updated_at"),
+        "average_rating": computed(("event__rating_sum", "event__rating_count"), _average),
+        "seats_left": computed(("event__capacity", "event__seats_taken"), _seats_left),
+        "latitude": column("event__latitude", float),
+        "longitude": column("event__longitude", float),
+        "distance_km": column("distance_km", float),
+        "registration_id": column("registration_id", str),
+        "registration_status": column("registration_status"),
+        "rating": column("rating"),
+        "comment": column("comment"),
+        "registration_created_at": datetime_column("registration_created_at"),
+        "registration_updated_at": datetime_column("registration_updated_at"),
+    }
+    optional_annotations = ("distance_km",)
+
+    def get_field_names(self, request):
+        # En my_events "rating" y "comment" son los de la inscripción
+        return list(self.serializer_class.selected_fields(request)) + list(self.registration_fields)
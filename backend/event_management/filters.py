@@ -1,6 +1,13 @@
 import django_filters
 from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import SearchFilter
+from .geo import bounding_box, covering_cells, distance_expression, prefix_range, split_longitudes
 from .models import Event
+from .search import get_search_backend, is_ranked
+
+DEFAULT_RADIUS_KM = 10
+MAX_RADIUS_KM = 500
 
 class EventFilter(django_filters.FilterSet):
     search = django_filters.CharFilter(method='filter_search')
@@ -8,6 +15,9 @@ class EventFilter(django_filters.FilterSet):
     location = django_filters.CharFilter(field_name="location", lookup_expr="icontains")
     start_date = django_filters.DateFilter(field_name='start_time', lookup_expr='gte')
     end_date = django_filters.DateFilter(field_name='start_time', lookup_expr='lte')
+    # ?near=lat,lon&radius_km=5 -> eventos dentro del radio, ordenados por distancia
+    near = django_filters.CharFilter(method='filter_near')
+    radius_km = django_filters.NumberFilter(method='filter_radius')
     class Meta:
         model = Event
         fields = {
@@ -17,9 +27,60 @@ class EventFilter(django_filters.FilterSet):
             "end_time": ["lte"],
         }
 
+    def filter_radius(self, qs, name, value):
+        # Se usa dentro de filter_near
+        return qs
+
+    def filter_near(self, qs, name, value):
+        try:
+            latitude, longitude = (float(part) for part in value.split(','))
+        except ValueError:
+            raise ValidationError({'near': 'Formato esperado: lat,lon'})
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValidationError({'near': 'Coordenadas fuera de rango.'})
+
+        radius = self.form.cleaned_data.get('radius_km') or DEFAULT_RADIUS_KM
+        if radius <= 0 or radius > MAX_RADIUS_KM:
+            raise ValidationError({'radius_km': f'Debe estar entre 0 y {MAX_RADIUS_KM}.'})
+        radius = float(radius)
+
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius)
+        lon_ranges = split_longitudes(min_lon, max_lon)
+
+        # 1. Celdas geohash (rangos sobre idx_events_geohash)
+        cells = Q()
+        for prefix in covering_cells(min_lat, max_lat, lon_ranges):
+            start, end = prefix_range(prefix)
+            cells |= Q(geohash__gte=start, geohash__lt=end)
+
+        # 2. Bounding box exacto
+        box = Q()
+        for lon_start, lon_end in lon_ranges:
+            box |= Q(longitude__gte=lon_start, longitude__lte=lon_end)
+        box &= Q(latitude__gte=min_lat, latitude__lte=max_lat)
+
+        # 3. Distancia real para el filtro fino y el orden
+        return (
+            qs.filter(cells, box)
+            .annotate(distance_km=distance_expression(latitude, longitude))
+            .filter(distance_km__lte=radius)
+            .order_by('distance_km', 'start_time')
+        )
+
     def filter_search(self, qs, name, value):
-        return qs.filter(
-            Q(title__icontains=value) |
-            Q(description__icontains=value) |
-            Q(location__icontains=value)
-        )
\ No newline at end of file
+        if is_ranked(qs):
+            return qs
+        return get_search_backend().search(qs, value)
+
+
+class EventSearchFilter(SearchFilter):
+    """
+    SearchFilter que usa el backend indexado (ver search.py) con el mismo parámetro `search`.
+    Si EventFilter ya aplicó la búsqueda, no se vuelve a filtrar.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get(self.search_param, '').strip()
+        if not value or is_ranked(queryset):
+            return queryset
+        return get_search_backend().search(queryset, value)
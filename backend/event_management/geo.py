@@ -0,0 +1,136 @@
+# backend/event_management/geo.py
+"""
+Utilidades geoespaciales sin dependencias externas.
+
+Cada evento con coordenadas guarda su geohash (precisión GEOHASH_PRECISION) en una
+columna indexada. Una búsqueda "cerca de" se resuelve en tres pasos:
+
+1. Celdas geohash que cubren el bounding box del radio -> rangos sobre el índice.
+2. Bounding box exacto sobre latitude/longitude.
+3. Distancia haversine en SQL para el filtro fino y el orden.
+
+Funciona igual en SQLite y PostgreSQL (índice B-tree normal).
+"""
+import math
+
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_PRECISION = 9
+MAX_COVER_CELLS = 16
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Cualquier carácter mayor que 'z' sirve como límite superior de un prefijo
+_PREFIX_END = "{"
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lon_range[0] = mid
+            else:
+                bits <<= 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits <<= 1
+                lat_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def cell_size(precision):
+    """(alto, ancho) en grados de una celda geohash."""
+    total_bits = precision * 5
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """(min_lat, max_lat, min_lon, max_lon) que contiene el círculo."""
+    delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat = max(latitude - delta_lat, -90.0)
+    max_lat = min(latitude + delta_lat, 90.0)
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        # Incluye un polo: todas las longitudes
+        return min_lat, max_lat, -180.0, 180.0
+    delta_lon = math.degrees(
+        math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(latitude))))
+    )
+    return min_lat, max_lat, longitude - delta_lon, longitude + delta_lon
+
+
+def split_longitudes(min_lon, max_lon):
+    """Separa un rango que cruza el antimeridiano en rangos dentro de [-180, 180]."""
+    if max_lon - min_lon >= 360.0:
+        return [(-180.0, 180.0)]
+    if min_lon < -180.0:
+        return [(min_lon + 360.0, 180.0), (-180.0, max_lon)]
+    if max_lon > 180.0:
+        return [(min_lon, 180.0), (-180.0, max_lon - 360.0)]
+    return [(min_lon, max_lon)]
+
+
+def covering_cells(min_lat, max_lat, lon_ranges):
+    """
+    Prefijos geohash que cubren el bounding box, con la mayor precisión que
+    no supere MAX_COVER_CELLS celdas.
+    """
+    best = None
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        height, width = cell_size(precision)
+        cells = set()
+        for min_lon, max_lon in lon_ranges:
+            lat = min_lat
+            while True:
+                lon = min_lon
+                while True:
+                    cells.add(encode_geohash(min(lat, 90.0), min(lon, 180.0), precision))
+                    if lon >= max_lon:
+                        break
+                    lon = min(lon + width, max_lon)
+                if lat >= max_lat:
+                    break
+                lat = min(lat + height, max_lat)
+            if len(cells) > MAX_COVER_CELLS:
+                break
+        if len(cells) > MAX_COVER_CELLS:
+            break
+        best = cells
+    return sorted(best or [""])
+
+
+def prefix_range(prefix):
+    """Rango [desde, hasta) de todos los geohash que empiezan con el prefijo."""
+    return prefix, prefix + _PREFIX_END
+
+
+def distance_expression(latitude, longitude):
+    """Expresión SQL (haversine, km) entre el punto dado y latitude/longitude del evento."""
+    lat1 = math.radians(latitude)
+    lat2 = Radians(F("latitude"))
+    half_dlat = (lat2 - Value(lat1)) / 2
+    half_dlon = (Radians(F("longitude")) - Value(math.radians(longitude))) / 2
+    a = Power(Sin(half_dlat), 2) + Value(math.cos(lat1)) * Cos(lat2) * Power(Sin(half_dlon), 2)
+    # Least evita que el redondeo deje a > 1 (fuera del dominio de asin)
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(Least(a, Value(1.0))), output_field=FloatField())
@@ -0,0 +1,377 @@
+# backend/event_management/live.py
+"""
+Actualizaciones en vivo de eventos por Server-Sent Events (requiere ASGI).
+
+GET /api/events/live/?events=<id>,<id>  (máx. MAX_LIVE_EVENTS)
+POST /api/events/live/ticket/  -> {"ticket": ...} para abrir el stream autenticado
+
+EventSource no permite headers, así que el navegador no puede enviar el JWT sin
+ponerlo en la URL (y de ahí a los logs de acceso). En su lugar pide un ticket
+firmado que sólo sirve para este stream y vence en EVENT_LIVE_TICKET_MAX_AGE
+segundos, y lo pasa como ?ticket=. Otros clientes pueden usar el header Authorization.
+
+- Quien escribe (señales de inscripciones, bulk_status, check_in) sólo llama a
+  publish_on_commit(event_id): el broker incrementa la versión del evento.
+- Un hub por proceso revisa las versiones de los eventos suscritos cada
+  EVENT_LIVE_TICK segundos y, para los que cambiaron, arma las instantáneas con
+  una sola consulta y las entrega a cada suscriptor. Una ráfaga de inscripciones
+  produce una actualización por tick, no una por inscripción.
+- Cada instantánea lleva la versión del broker: un suscriptor nunca recibe dos
+  veces la misma versión, y si consume lento sólo queda pendiente la última.
+
+El broker se elige con el setting EVENT_LIVE_BROKER (ruta con puntos):
+InProcessBroker sirve cuando las escrituras y el stream ocurren en el mismo
+proceso; con varios workers (o WSGI + ASGI por separado) CacheBroker comparte
+las versiones por la caché (Redis si se define REDIS_URL).
+
+Sin servidor ASGI la vista responde las instantáneas actuales y `retry:`, de
+modo que EventSource se reconecta periódicamente (equivale a un sondeo).
+"""
+import asyncio
+import json
+import threading
+import uuid
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Q, Subquery
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.module_loading import import_string
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .cache import _incr, _initial_generation
+from .models import CheckInScan, Event, RegistrationStatus
+from .query_budget import query_budget
+
+MAX_LIVE_EVENTS = 20
+DEFAULT_TICK = 1.0
+DEFAULT_HEARTBEAT = 15.0
+DEFAULT_TICKET_MAX_AGE = 60
+TICKET_SALT = "event_management.live.ticket"
+# Reconexión de EventSource (ms) cuando no hay stream (WSGI)
+FALLBACK_RETRY_MS = 5000
+
+# Campos que sólo ve el organizador del evento
+ORGANIZER_FIELDS = ("attended", "last_registration_at", "last_check_in_at")
+
+
+# --- Brokers ---
+
+class BaseBroker:
+    """Guarda un número de versión por evento que aumenta con cada cambio."""
+
+    def publish(self, event_id):
+        raise NotImplementedError
+
+    def versions(self, event_ids):
+        """{event_id: versión} (0 si el evento nunca cambió)."""
+        raise NotImplementedError
+
+
+class InProcessBroker(BaseBroker):
+    """Versiones en memoria del proceso; publish() puede llamarse desde cualquier hilo."""
+
+    def __init__(self):
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def publish(self, event_id):
+        with self._lock:
+            self._versions[event_id] = self._versions.get(event_id, 0) + 1
+
+    def versions(self, event_ids):
+        with self._lock:
+            return {event_id: self._versions.get(event_id, 0) for event_id in event_ids}
+
+
+class CacheBroker(BaseBroker):
+    """Versiones en la caché de Django: compartidas entre procesos con Redis."""
+    key_prefix = "live:event:"
+
+    def key(self, event_id):
+        return f"{self.key_prefix}{event_id}"
+
+    def publish(self, event_id):
+        # Si la clave se pierde, reinicia por encima de las versiones ya entregadas
+        _incr(self.key(event_id), _initial_generation())
+
+    def versions(self, event_ids):
+        keys = {self.key(event_id): event_id for event_id in event_ids}
+        found = cache.get_many(list(keys))
+        return {event_id: found.get(key, 0) for key, event_id in keys.items()}
+
+
+@lru_cache(maxsize=1)
+def get_broker():
+    path = getattr(settings, "EVENT_LIVE_BROKER", "event_management.live.InProcessBroker")
+    return import_string(path)()
+
+
+def publish_on_commit(event_id):
+    # Tras el commit: la instantánea debe ver el cambio
+    transaction.on_commit(lambda: get_broker().publish(event_id))
+
+
+# --- Instantáneas ---
+
+def build_snapshots(event_ids, versions):
+    """Estado en vivo de varios eventos con una consulta: {event_id: instantánea}."""
+    last_check_in = (
+        CheckInScan.objects.filter(event=OuterRef("pk"))
+        .order_by("-scanned_at")
+        .values("scanned_at")[:1]
+    )
+    rows = (
+        Event.objects.filter(pk__in=event_ids)
+        .annotate(
+            waitlisted=Count("registrations", filter=Q(registrations__status=RegistrationStatus.WAITLISTED)),
+            attended=Count("registrations", filter=Q(registrations__status=RegistrationStatus.ATTENDED)),
+            last_registration_at=Max("registrations__created_at"),
+            last_check_in_at=Subquery(last_check_in),
+        )
+        .values(
+            "id", "organizer_id", "capacity", "seats_taken", "waitlisted", "attended",
+            "last_registration_at", "last_check_in_at",
+        )
+    )
+    snapshots = {}
+    for row in rows:
+        capacity = row["capacity"]
+        row["seats_left"] = None if capacity is None else max(capacity - row["seats_taken"], 0)
+        row["version"] = versions.get(row["id"], 0)
+        snapshots[row.pop("id")] = row
+    return snapshots
+
+
+def present(event_id, snapshot, organized):
+    """Lo que recibe un suscriptor: sin los campos de organizador si no lo es."""
+    data = {"event_id": event_id}
+    data.update(
+        (name, value) for name, value in snapshot.items()
+        if name != "organizer_id" and (event_id in organized or name not in ORGANIZER_FIELDS)
+    )
+    return data
+
+
+def format_sse(data):
+    payload = json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":"))
+    return f"id: {data['event_id']}:{data['version']}\nevent: snapshot\ndata: {payload}\n\n"
+
+
+# --- Hub por proceso ---
+
+class Subscriber:
+    def __init__(self, event_ids, organized, seen):
+        self.event_ids = set(event_ids)
+        self.organized = organized
+        # Última versión entregada por evento
+        self.seen = dict(seen)
+        self.pending = {}
+        self.wake = asyncio.Event()
+
+    def offer(self, event_id, snapshot):
+        if snapshot["version"] <= self.seen.get(event_id, -1):
+            return
+        self.seen[event_id] = snapshot["version"]
+        # Si el cliente consume lento, sólo queda la última instantánea
+        self.pending[event_id] = present(event_id, snapshot, self.organized)
+        self.wake.set()
+
+    async def next_batch(self, timeout):
+        """Instantáneas pendientes, o [] si pasó `timeout` sin cambios (heartbeat)."""
+        try:
+            await asyncio.wait_for(self.wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self.wake.clear()
+        batch, self.pending = list(self.pending.values()), {}
+        return batch
+
+
+class LiveHub:
+    def __init__(self, broker, tick):
+        self.broker = broker
+        self.tick = tick
+        self.subscribers = set()
+        self.task = None
+
+    def subscribe(self, subscriber):
+        self.subscribers.add(subscriber)
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self.run())
+
+    def unsubscribe(self, subscriber):
+        self.subscribers.discard(subscriber)
+
+    async def run(self):
+        while self.subscribers:
+            await asyncio.sleep(self.tick)
+            subscribers = list(self.subscribers)
+            watched = set().union(*(subscriber.event_ids for subscriber in subscribers))
+            versions = await sync_to_async(self.broker.versions, thread_sensitive=False)(watched)
+            # Eventos con alguna versión aún no entregada
+            changed = [
+                event_id for event_id, version in versions.items()
+                if any(
+                    event_id in subscriber.event_ids and subscriber.seen.get(event_id, -1) < version
+                    for subscriber in subscribers
+                )
+            ]
+            if not changed:
+                continue
+
+            snapshots = await sync_to_async(build_snapshots)(changed, versions)
+            for event_id in changed:
+                # Un evento eliminado se informa una vez y no vuelve a consultarse
+                snapshot = snapshots.get(event_id) or {"deleted": True, "version": versions[event_id]}
+                for subscriber in subscribers:
+                    if event_id in subscriber.event_ids:
+                        subscriber.offer(event_id, snapshot)
+
+
+_hub = None
+
+
+def get_hub():
+    """Un hub por loop de eventos (en la práctica, uno por proceso ASGI)."""
+    global _hub
+    loop = asyncio.get_running_loop()
+    if _hub is None or _hub.loop is not loop:
+        _hub = LiveHub(get_broker(), getattr(settings, "EVENT_LIVE_TICK", DEFAULT_TICK))
+        _hub.loop = loop
+    return _hub
+
+
+# --- Vista ---
+
+def get_ticket_max_age():
+    return getattr(settings, "EVENT_LIVE_TICKET_MAX_AGE", DEFAULT_TICKET_MAX_AGE)
+
+
+def issue_ticket(user):
+    """Ticket firmado para abrir el stream: no sirve como JWT ni para otra vista."""
+    return signing.dumps(user.pk, salt=TICKET_SALT)
+
+
+def read_ticket(ticket):
+    """Usuario del ticket. Lanza AuthenticationFailed si está alterado o vencido."""
+    try:
+        user_id = signing.loads(ticket, salt=TICKET_SALT, max_age=get_ticket_max_age())
+    except signing.BadSignature:
+        raise AuthenticationFailed("Ticket inválido o expirado.")
+    user = get_user_model().objects.filter(pk=user_id, is_active=True).first()
+    if user is None:
+        raise AuthenticationFailed("Ticket inválido o expirado.")
+    return user
+
+
+def authenticate(request):
+    """
+    Usuario del ?ticket= (navegadores) o del JWT en el header Authorization, o None
+    si es anónimo. Lanza InvalidToken/AuthenticationFailed si la credencial no sirve.
+    """
+    ticket = request.GET.get("ticket")
+    if ticket:
+        return read_ticket(ticket)
+    authenticator = JWTAuthentication()
+    header = authenticator.get_header(request)
+    raw = authenticator.get_raw_token(header) if header else None
+    if not raw:
+        return None
+    return authenticator.get_user(authenticator.get_validated_token(raw))
+
+
+@query_budget(post=1)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def stream_ticket(request):
+    return Response({"ticket": issue_ticket(request.user), "expires_in": get_ticket_max_age()})
+
+
+def resolve_subscription(request):
+    """(event_ids, eventos que organiza el usuario) o una respuesta de error."""
+    try:
+        user = authenticate(request)
+    except (InvalidToken, AuthenticationFailed):
+        return JsonResponse({"detail": "Credenciales inválidas o expiradas."}, status=401)
+
+    values = [value for value in request.GET.get("events", "").split(",") if value]
+    if not values:
+        return JsonResponse({"detail": "Se requiere ?events=<id>,<id>."}, status=400)
+    if len(values) > MAX_LIVE_EVENTS:
+        return JsonResponse({"detail": f"Máximo {MAX_LIVE_EVENTS} eventos por conexión."}, status=400)
+
+    try:
+        event_ids = {uuid.UUID(value) for value in values}
+    except ValueError:
+        return JsonResponse({"detail": "Id de evento inválido."}, status=400)
+
+    # Misma visibilidad que el listado: los anónimos sólo ven eventos públicos
+    events = Event.objects.filter(pk__in=event_ids)
+    if user is None:
+        events = events.filter(is_public=True)
+    found = dict(events.values_list("pk", "organizer_id"))
+    if len(found) != len(event_ids):
+        return JsonResponse({"detail": "Eventos no encontrados."}, status=404)
+
+    organized = {event_id for event_id, organizer_id in found.items() if user and organizer_id == user.pk}
+    return list(found), organized
+
+
+def initial_state(event_ids):
+    versions = get_broker().versions(event_ids)
+    return versions, build_snapshots(event_ids, versions)
+
+
+async def stream(subscriber, snapshots):
+    hub = get_hub()
+    hub.subscribe(subscriber)
+    heartbeat = getattr(settings, "EVENT_LIVE_HEARTBEAT", DEFAULT_HEARTBEAT)
+    try:
+        for event_id, snapshot in snapshots.items():
+            yield format_sse(present(event_id, snapshot, subscriber.organized))
+        while True:
+            batch = await subscriber.next_batch(heartbeat)
+            if not batch:
+                # Comentario SSE: mantiene viva la conexión a través de proxies
+                yield ": ping\n\n"
+            for data in batch:
+                yield format_sse(data)
+    finally:
+        hub.unsubscribe(subscriber)
+
+
+async def event_stream(request):
+    if request.method != "GET":
+        return JsonResponse({"detail": "Método no permitido."}, status=405)
+
+    subscription = await sync_to_async(resolve_subscription)(request)
+    if isinstance(subscription, HttpResponse):
+        return subscription
+    event_ids, organized = subscription
+    versions, snapshots = await sync_to_async(initial_state)(event_ids)
+
+    if not isinstance(request, ASGIRequest):
+        # Sin ASGI no hay stream: estado actual y reconexión (sondeo)
+        body = f"retry: {FALLBACK_RETRY_MS}\n\n" + "".join(
+            format_sse(present(event_id, snapshot, organized)) for event_id, snapshot in snapshots.items()
+        )
+        return HttpResponse(body, content_type="text/event-stream")
+
+    subscriber = Subscriber(event_ids, organized, versions)
+    response = StreamingHttpResponse(stream(subscriber, snapshots), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Evita que nginx acumule el stream
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,128 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from event_management.fast_serializers import FastEventRegistrationSerializer, FastEventSerializer
+from event_management.models import Category, Event, EventRegistration
+from event_management.serializers import EventRegistrationSerializer, EventSerializer
+from users.models import Profile
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara EventSerializer/EventRegistrationSerializer con la ruta rápida desde .values(): "
+        "verifica que el JSON sea idéntico byte a byte y mide tiempos. "
+        "Los datos de prueba se crean en una transacción que se revierte al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=2000)
+        parser.add_argument("--registrations", type=int, default=2000,
+                            help="Inscripciones para el evento usado en el roster.")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.seed(options["events"], options["registrations"])
+                self.run(options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, n_events, n_registrations):
+        now = timezone.now()
+        organizer = User.objects.create_user("bench_organizer", "bench@example.com").profile
+        category = Category.objects.create(name="bench-category")
+        events = [
+            Event(
+                organizer=organizer,
+                title=f"Evento {i}",
+                description="Descripción " * 10,
+                category=category if i % 3 else None,
+                location="Auditorio",
+                start_time=now + timedelta(hours=i),
+                end_time=now + timedelta(hours=i + 2) if i % 2 else None,
+                capacity=100 if i % 4 else None,
+                rating_sum=i % 17,
+                rating_count=i % 5,
+            )
+            for i in range(n_events)
+        ]
+        Event.objects.bulk_create(events, batch_size=500)
+
+        users = User.objects.bulk_create([
+            User(username=f"bench_user_{i}", email=f"bench{i}@example.com" if i % 2 else "")
+            for i in range(n_registrations)
+        ], batch_size=500)
+        # bulk_create no dispara post_save: se crean los perfiles a mano
+        profiles = Profile.objects.bulk_create([Profile(user=user) for user in users], batch_size=500)
+
+        self.roster_event = events[0]
+        EventRegistration.objects.bulk_create([
+            EventRegistration(
+                event=self.roster_event,
+                user=profile,
+                rating=(i % 5) + 1 if i % 3 else None,
+                comment="ok" if i % 2 else None,
+            )
+            for i, profile in enumerate(profiles)
+        ], batch_size=500)
+
+    def run(self, repeat):
+        renderer = JSONRenderer()
+        events = Event.objects.order_by("-start_time", "-id")
+        registrations = EventRegistration.objects.filter(event=self.roster_event).order_by("created_at", "id")
+
+        cases = [
+            (
+                "events",
+                lambda: EventSerializer(EventSerializer.prune_queryset(events, None), many=True).data,
+                lambda: self.fast(FastEventSerializer(), events),
+            ),
+            (
+                "registrations",
+                lambda: EventRegistrationSerializer(
+                    EventRegistrationSerializer.prune_queryset(registrations, None), many=True
+                ).data,
+                lambda: self.fast(FastEventRegistrationSerializer(), registrations),
+            ),
+        ]
+
+        for name, slow, fast in cases:
+            slow_bytes = renderer.render(slow())
+            fast_bytes = renderer.render(fast())
+            if slow_bytes != fast_bytes:
+                raise CommandError(f"{name}: la salida rápida difiere del serializer DRF.")
+
+            slow_time = self.measure(slow, repeat)
+            fast_time = self.measure(fast, repeat)
+            self.stdout.write(
+                f"{name:<14} drf={slow_time * 1000:8.1f} ms  fast={fast_time * 1000:8.1f} ms  "
+                f"x{slow_time / fast_time:4.1f}  ({len(slow_bytes)} bytes, idénticos)"
+            )
+
+    @staticmethod
+    def fast(serializer, queryset):
+        return serializer.serialize(serializer.values(queryset))
+
+    @staticmethod
+    def measure(function, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
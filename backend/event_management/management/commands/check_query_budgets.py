@@ -0,0 +1,187 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from event_management.models import Category, Event, EventRegistration, RegistrationStatus, ReportJob
+from event_management.query_budget import get_view_budget
+from event_management.ratings import rebuild_rating_aggregates
+from users.models import UserRole
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Siembra un dataset en una transacción que se revierte, recorre los endpoints de la API "
+        "y falla si alguno ejecuta más consultas SQL que su presupuesto (query_budgets)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=30)
+        parser.add_argument("--attendees", type=int, default=25)
+
+    def handle(self, *args, **options):
+        # Caché nula: se mide siempre el peor caso (miss)
+        dummy_cache = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+        with override_settings(ALLOWED_HOSTS=["*"], CACHES=dummy_cache, QUERY_BUDGET_ENABLED=False):
+            try:
+                with transaction.atomic():
+                    self.seed(options["events"], options["attendees"])
+                    failures = self.check_endpoints()
+                    raise Rollback
+            except Rollback:
+                pass
+
+        if failures:
+            raise CommandError(f"{failures} endpoint(s) exceden su presupuesto de consultas.")
+        self.stdout.write(self.style.SUCCESS("Todos los endpoints respetan su presupuesto."))
+
+    # --- Datos ---
+
+    def seed(self, n_events, n_attendees):
+        now = timezone.now()
+        category = Category.objects.create(name="budget-category")
+        self.organizer = User.objects.create_user("budget_organizer", "org@example.com", "x")
+        self.attendees = [
+            User.objects.create_user(f"budget_attendee_{i}", f"a{i}@example.com", "x")
+            for i in range(n_attendees)
+        ]
+        self.events = [
+            Event.objects.create(
+                organizer=self.organizer.profile,
+                title=f"Evento presupuesto {i}",
+                description="Descripción",
+                category=category,
+                location="Auditorio",
+                start_time=now + timedelta(days=i),
+                capacity=n_attendees * 2,
+            )
+            for i in range(n_events)
+        ]
+        self.event = self.events[0]
+        for i, attendee in enumerate(self.attendees):
+            for event in self.events[:5]:
+                EventRegistration.objects.create(
+                    event=event,
+                    user=attendee.profile,
+                    status=RegistrationStatus.ATTENDED if i % 3 == 0 else RegistrationStatus.REGISTERED,
+                    rating=(i % 5) + 1,
+                    comment=f"Comentario {i}",
+                    commented_at=now,
+                )
+        # Las calificaciones se sembraron directo: recalcular los agregados
+        rebuild_rating_aggregates()
+        self.registration = EventRegistration.objects.filter(
+            user=self.attendees[0].profile, event=self.event
+        ).get()
+        self.cancellable = EventRegistration.objects.filter(
+            user=self.attendees[0].profile, event=self.events[1]
+        ).get()
+        self.newcomer = User.objects.create_user("budget_newcomer", "new@example.com", "x")
+        self.admin = User.objects.create_user("budget_admin", "admin@example.com", "x")
+        self.admin.profile.role = UserRole.ADMIN
+        self.admin.profile.save(update_fields=["role"])
+        self.report_job = ReportJob.objects.create(period="all", requested_by=self.admin.profile)
+        self.scans = [
+            {"scan_id": f"scan-{registration_id}", "registration_id": str(registration_id),
+             "scanned_at": now.isoformat()}
+            for registration_id in self.event.registrations.values_list("id", flat=True)
+        ]
+
+    def client_for(self, user):
+        client = APIClient()
+        if user is not None:
+            token = RefreshToken.for_user(user).access_token
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    # --- Endpoints ---
+
+    def get_requests(self):
+        event = self.event.id
+        attendee = self.attendees[0]
+        return [
+            (None, "get", "/api/events/", None),
+            (None, "get", "/api/events/?page_size=10", None),
+            (None, "get", "/api/events/?search=presupuesto", None),
+            (None, "get", "/api/events/?fields=id,title,start_time,cover_url", None),
+            (attendee, "get", "/api/events/", None),
+            (self.organizer, "get", "/api/events/?mine=true", None),
+            (None, "get", f"/api/events/{event}/", None),
+            (None, "get", f"/api/events/{event}/registrations/", None),
+            (None, "get", f"/api/events/{event}/registrations/?status=attended&username=budget&page_size=5", None),
+            (attendee, "get", f"/api/events/{event}/check_registration/", None),
+            (attendee, "get", "/api/events/my_event_count/", None),
+            (self.organizer, "get", f"/api/events/{event}/attendance_report/", None),
+            (self.organizer, "get", f"/api/events/{event}/attendance_report/?format=csv", None),
+            (self.organizer, "get", f"/api/events/{event}/attendance_report/?format=ndjson", None),
+            (None, "get", f"/api/events/{event}/comments/", None),
+            (None, "get", f"/api/events/calendar/?month={self.event.start_time:%Y-%m}", None),
+            (self.organizer, "get", f"/api/events/calendar/?month={self.event.start_time:%Y-%m}&mine=true", None),
+            (self.newcomer, "post", f"/api/events/{event}/join/", None),
+            (
+                self.organizer, "post", f"/api/events/{event}/bulk_status/",
+                {"status": "confirmed", "user_ids": [user.pk for user in self.attendees]},
+            ),
+            (self.organizer, "post", f"/api/events/{event}/check_in/", {"scans": self.scans}),
+            (None, "get", "/api/categories/", None),
+            (attendee, "post", "/api/events/live/ticket/", None),
+            (self.admin, "get", "/api/admin-reports/?period=all", None),
+            (self.admin, "get", "/api/admin-reports/?period=week", None),
+            (self.admin, "get", "/api/admin-reports/trends/", None),
+            (self.admin, "get", "/api/admin-reports/trends/?bucket=week&by_category=true", None),
+            (self.admin, "get", "/api/admin-reports/export/events/", None),
+            (self.admin, "get", "/api/admin-reports/export/registrations/?format=csv", None),
+            (self.admin, "post", "/api/admin-reports/jobs/", {"period": "week"}),
+            (self.admin, "get", f"/api/admin-reports/jobs/{self.report_job.id}/", None),
+            (attendee, "get", "/api/registrations/", None),
+            (attendee, "get", "/api/registrations/my_events/", None),
+            (attendee, "get", "/api/registrations/my_events/?search=presupuesto&page_size=2", None),
+            (attendee, "patch", f"/api/registrations/{self.registration.id}/rate/", {"rating": 4, "comment": "ok"}),
+            (attendee, "post", f"/api/registrations/{self.registration.id}/confirm_attendance/", None),
+            (attendee, "get", "/api/users/notifications/", None),
+            (attendee, "get", "/api/users/notifications/unread/", None),
+            (attendee, "get", "/api/users/notifications/inbox/?page_size=5", None),
+            (attendee, "post", "/api/users/notifications/read/", {}),
+            (attendee, "delete", f"/api/users/cancel-registration/{self.cancellable.id}/", None),
+        ]
+
+    def check_endpoints(self):
+        failures = 0
+        for user, method, url, data in self.get_requests():
+            client = self.client_for(user)
+            with CaptureQueriesContext(connection) as queries:
+                response = getattr(client, method)(url, data, format="json")
+                if response.streaming:
+                    # Las consultas de una respuesta en streaming ocurren al consumirla
+                    b"".join(response.streaming_content)
+
+            budget = get_view_budget(resolve(url.split("?")[0]).func, method)
+            count = len(queries.captured_queries)
+            who = user.username if user else "anónimo"
+            label = f"{method.upper():<5} {url} ({who})"
+
+            if response.status_code >= 400:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"{label}: respuesta {response.status_code}"))
+            elif budget is None:
+                self.stdout.write(self.style.WARNING(f"{label}: {count} consultas, sin presupuesto declarado"))
+            elif count > budget:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"{label}: {count} consultas > presupuesto {budget}"))
+                for query in queries.captured_queries:
+                    self.stdout.write(f"    {query['sql'][:200]}")
+            else:
+                self.stdout.write(f"{label}: {count}/{budget}")
+        return failures
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from event_management.cache import get_cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Muestra los contadores de aciertos/fallos de la caché de listados públicos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Pone los contadores en cero.")
+
+    def handle(self, *args, **options):
+        stats = get_cache_stats()
+        self.stdout.write(
+            f"hits={stats['hits']} misses={stats['misses']} "
+            f"hit_rate={stats['hit_rate']}% generation={stats['generation']}"
+        )
+        if options["reset"]:
+            reset_cache_stats()
+            self.stdout.write(self.style.SUCCESS("Contadores reiniciados."))
@@ -0,0 +1,116 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from event_management.models import CheckInScan, Event, EventRegistration, RegistrationStatus
+from users.models import Profile
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Prueba de carga del endpoint check_in: envía lotes de lecturas (con reenvíos "
+        "duplicados, como un dispositivo que se reconecta) y mide lecturas por segundo. "
+        "Verifica idempotencia y que todos terminen ATTENDED. "
+        "Los datos se crean en una transacción que se revierte al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--attendees", type=int, default=5000)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--duplicates", type=float, default=0.2,
+                            help="Fracción de lecturas que se reenvían en otro lote.")
+        parser.add_argument("--min-rate", type=float, default=1000,
+                            help="Lecturas por segundo mínimas; 0 para sólo medir.")
+
+    def handle(self, *args, **options):
+        with override_settings(ALLOWED_HOSTS=["*"], QUERY_BUDGET_ENABLED=False):
+            try:
+                with transaction.atomic():
+                    self.seed(options["attendees"])
+                    rate = self.run(options["batch_size"], options["duplicates"])
+                    raise Rollback
+            except Rollback:
+                pass
+
+        if options["min_rate"] and rate < options["min_rate"]:
+            raise CommandError(f"{rate:.0f} lecturas/s, por debajo del mínimo {options['min_rate']:.0f}.")
+
+    def seed(self, n_attendees):
+        organizer = User.objects.create_user("load_organizer", "load@example.com")
+        self.organizer = organizer
+        self.event = Event.objects.create(
+            organizer=organizer.profile,
+            title="Evento de carga",
+            start_time=timezone.now(),
+        )
+        users = User.objects.bulk_create([
+            User(username=f"load_user_{i}", email=f"load{i}@example.com")
+            for i in range(n_attendees)
+        ], batch_size=500)
+        # bulk_create no dispara post_save: se crean los perfiles a mano
+        profiles = Profile.objects.bulk_create([Profile(user=user) for user in users], batch_size=500)
+        registrations = EventRegistration.objects.bulk_create([
+            EventRegistration(event=self.event, user=profile) for profile in profiles
+        ], batch_size=500)
+        self.registration_ids = [registration.id for registration in registrations]
+
+    def run(self, batch_size, duplicates):
+        client = APIClient()
+        client.force_authenticate(self.organizer)
+        url = f"/api/events/{self.event.id}/check_in/"
+
+        now = timezone.now()
+        scans = [
+            {
+                "scan_id": f"door-1-{i}",
+                "registration_id": str(registration_id),
+                "scanned_at": (now - timedelta(seconds=i)).isoformat(),
+            }
+            for i, registration_id in enumerate(self.registration_ids)
+        ]
+        resent = random.sample(scans, int(len(scans) * duplicates))
+        stream = scans + resent
+        random.shuffle(stream)
+        batches = [stream[i:i + batch_size] for i in range(0, len(stream), batch_size)]
+
+        start = time.perf_counter()
+        accepted = set()
+        for batch in batches:
+            response = client.post(url, {"device_id": "door-1", "scans": batch}, format="json")
+            if response.status_code != 200:
+                raise CommandError(f"Respuesta {response.status_code}: {response.content[:200]}")
+            accepted.update(response.data["accepted"])
+        elapsed = time.perf_counter() - start
+
+        # Reenviar un lote completo no cambia nada
+        response = client.post(url, {"device_id": "door-1", "scans": batches[0]}, format="json")
+        if sorted(response.data["accepted"]) != sorted({scan["scan_id"] for scan in batches[0]}):
+            raise CommandError("Reenviar un lote no devolvió los mismos aceptados.")
+
+        stored = CheckInScan.objects.filter(event=self.event).count()
+        attended = self.event.registrations.filter(status=RegistrationStatus.ATTENDED).count()
+        if len(accepted) != len(scans) or stored != len(scans):
+            raise CommandError(f"{len(accepted)} aceptadas y {stored} guardadas para {len(scans)} lecturas únicas.")
+        if attended != len(self.registration_ids):
+            raise CommandError(f"Sólo {attended} de {len(self.registration_ids)} inscripciones quedaron ATTENDED.")
+
+        rate = len(stream) / elapsed
+        self.stdout.write(
+            f"{len(stream)} lecturas ({len(resent)} reenviadas) en {len(batches)} lotes: "
+            f"{elapsed:.2f} s, {rate:.0f} lecturas/s"
+        )
+        self.stdout.write(self.style.SUCCESS(f"{stored} check-ins únicos, {attended} asistentes."))
+        return rate
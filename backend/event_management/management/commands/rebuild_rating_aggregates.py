@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from event_management.ratings import rebuild_rating_aggregates
+
+
+class Command(BaseCommand):
+    help = "Recalcula rating_sum, rating_count y el histograma de estrellas de cada evento."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            action="append",
+            dest="events",
+            help="ID de un evento a recalcular (se puede repetir). Por defecto, todos.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = rebuild_rating_aggregates(
+                event_ids=options["events"],
+                batch_size=options["batch_size"],
+            )
+        self.stdout.write(self.style.SUCCESS(f"Agregados recalculados para {updated} eventos."))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from event_management.seats import rebuild_seat_counts
+
+
+class Command(BaseCommand):
+    help = "Recalcula seats_taken de cada evento desde las inscripciones que ocupan cupo."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            action="append",
+            dest="events",
+            help="ID de un evento a recalcular (se puede repetir). Por defecto, todos.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = rebuild_seat_counts(
+                event_ids=options["events"],
+                batch_size=options["batch_size"],
+            )
+        self.stdout.write(self.style.SUCCESS(f"Cupos recalculados para {updated} eventos."))
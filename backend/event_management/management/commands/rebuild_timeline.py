@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from event_management.timeline import rebuild_timeline
+
+
+class Command(BaseCommand):
+    help = "Reconstruye UserEventTimeline (modelo de lectura de my_events) desde las inscripciones."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            action="append",
+            dest="users",
+            type=int,
+            help="ID de un usuario a reconstruir (se puede repetir). Por defecto, todos.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            created = rebuild_timeline(
+                user_ids=options["users"],
+                batch_size=options["batch_size"],
+            )
+        self.stdout.write(self.style.SUCCESS(f"Timeline reconstruido: {created} filas."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from event_management.rollups import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Actualiza los rollups de los reportes de administrador con los cambios desde la "
+        "última ejecución (pensado para cron, p. ej. cada 5 minutos). --full los reconstruye."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Reconstruir todos los rollups.")
+
+    def handle(self, *args, **options):
+        events, days = refresh_rollups(full=options["full"])
+        self.stdout.write(self.style.SUCCESS(f"Rollups actualizados: {events} eventos, {days} días."))
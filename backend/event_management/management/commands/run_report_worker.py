@@ -0,0 +1,59 @@
+import os
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from event_management.report_jobs import claim_next, purge_finished, run_job
+from event_management.reports import build_admin_report
+
+PURGE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker de reportes de administrador: toma los jobs encolados en la base de "
+        "datos (POST /api/admin-reports/jobs/) y guarda su resultado. Pueden correr "
+        "varios a la vez; cada job lo toma uno solo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true",
+                            help="Procesar los jobs pendientes y terminar.")
+        parser.add_argument("--poll-interval", type=float, default=2.0,
+                            help="Segundos entre consultas a la cola cuando está vacía.")
+        parser.add_argument("--max-jobs", type=int, default=0,
+                            help="Terminar tras procesar N jobs (0 = sin límite).")
+
+    def handle(self, *args, **options):
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+        processed = 0
+        last_purge = 0.0
+        self.stdout.write(f"Worker de reportes {worker} iniciado.")
+        try:
+            while not options["max_jobs"] or processed < options["max_jobs"]:
+                # Conexiones caídas o vencidas entre jobs (como entre peticiones)
+                close_old_connections()
+                if time.monotonic() - last_purge > PURGE_INTERVAL:
+                    purge_finished()
+                    last_purge = time.monotonic()
+
+                job = claim_next(worker)
+                if job is None:
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                started = time.monotonic()
+                status = run_job(job, build_admin_report)
+                processed += 1
+                self.stdout.write(
+                    f"[{timezone.now():%H:%M:%S}] job {job.pk} ({job.period}): {status} "
+                    f"en {time.monotonic() - started:.2f}s"
+                )
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Worker detenido: {processed} jobs procesados."))
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:28
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def populate_rating_aggregates(apps, schema_editor):
+    """Calcular los agregados iniciales desde las calificaciones existentes"""
+    Event = apps.get_model('event_management', 'Event')
+    EventRegistration = apps.get_model('event_management', 'EventRegistration')
+
+    histogram = {
+        f'rating_hist_{star}': Count('id', filter=Q(rating=star))
+        for star in range(1, 6)
+    }
+    rows = (
+        EventRegistration.objects.filter(rating__isnull=False)
+        .order_by()
+        .values('event_id')
+        .annotate(rating_sum=Sum('rating'), rating_count=Count('id'), **histogram)
+    )
+    for row in rows:
+        event_id = row.pop('event_id')
+        Event.objects.filter(pk=event_id).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_management', '0008_event_start_time_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_hist_1',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_hist_2',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_hist_3',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_hist_4',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_hist_5',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_rating_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Índices de búsqueda de texto completo para Event
+
+from django.db import migrations
+
+FTS_TABLE = 'event_management_event_fts'
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    Event = apps.get_model('event_management', 'Event')
+
+    if vendor == 'postgresql':
+        from django.contrib.postgres.indexes import GinIndex
+        from django.contrib.postgres.search import SearchVector
+
+        # Misma expresión que PostgresSearchBackend.vector() para que el planner use
+        # el índice (copiada: una migración no debe depender del código de la app)
+        vector = (
+            SearchVector('title', weight='A', config='spanish')
+            + SearchVector('description', weight='B', config='spanish')
+            + SearchVector('location', weight='C', config='spanish')
+        )
+        schema_editor.add_index(Event, GinIndex(vector, name='idx_events_search_vector'))
+
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "event_id UNINDEXED, title, description, location, "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        for event in Event.objects.only('title', 'description', 'location').iterator():
+            schema_editor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, event_id, title, description, location) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                [
+                    event.pk.int >> 65,
+                    event.pk.hex,
+                    event.title or '',
+                    event.description or '',
+                    event.location or '',
+                ],
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS idx_events_search_vector')
+    elif vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_management', '0009_event_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
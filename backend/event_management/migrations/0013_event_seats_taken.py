@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:47
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_seats_taken(apps, schema_editor):
+    """Contar los cupos ocupados por las inscripciones existentes"""
+    Event = apps.get_model('event_management', 'Event')
+    EventRegistration = apps.get_model('event_management', 'EventRegistration')
+
+    rows = (
+        EventRegistration.objects.filter(status__in=['registered', 'confirmed', 'attended'])
+        .order_by()
+        .values('event_id')
+        .annotate(seats_taken=Count('id'))
+    )
+    for row in rows:
+        Event.objects.filter(pk=row['event_id']).update(seats_taken=row['seats_taken'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_management', '0012_event_coordinates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='seats_taken',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_seats_taken, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:52
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_management', '0013_event_seats_taken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckInScan',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('scan_id', models.CharField(max_length=64)),
+                ('device_id', models.CharField(blank=True, default='', max_length=64)),
+                ('scanned_at', models.DateTimeField()),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='check_in_scans', to='event_management.event')),
+                ('registration', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='check_in_scans', to='event_management.eventregistration')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['registration', 'scanned_at'], name='idx_checkin_registration')],
+                'constraints': [models.UniqueConstraint(fields=('event', 'scan_id'), name='ux_checkin_event_scan')],
+            },
+        ),
+    ]
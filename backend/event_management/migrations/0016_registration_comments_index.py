@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_management', '0015_registration_roster_index'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eventregistration',
+            index=models.Index(fields=['event', 'created_at'], name='idx_reg_event_created'),
+        ),
+    ]
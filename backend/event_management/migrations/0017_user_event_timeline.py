@@ -0,0 +1,65 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def populate_timeline(apps, schema_editor):
+    """Una fila por cada inscripción existente"""
+    EventRegistration = apps.get_model('event_management', 'EventRegistration')
+    UserEventTimeline = apps.get_model('event_management', 'UserEventTimeline')
+
+    now = timezone.now()
+    rows = EventRegistration.objects.order_by().values_list(
+        'id', 'user_id', 'event_id', 'status', 'rating', 'comment', 'created_at', 'updated_at',
+        'event__title', 'event__start_time', 'event__end_time', 'event__location',
+        'event__category_id', 'event__category__name', 'event__cover_url', 'event__is_public',
+    )
+    UserEventTimeline.objects.bulk_create([
+        UserEventTimeline(
+            registration_id=row[0], user_id=row[1], event_id=row[2], registration_status=row[3],
+            rating=row[4], comment=row[5], registration_created_at=row[6], registration_updated_at=row[7],
+            event_title=row[8], event_start_time=row[9], event_end_time=row[10], event_location=row[11],
+            event_category_id=row[12], event_category_name=row[13], event_cover_url=row[14],
+            event_is_public=row[15], updated_at=now,
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_management', '0016_registration_comments_index'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserEventTimeline',
+            fields=[
+                ('registration', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='timeline_entry', serialize=False, to='event_management.eventregistration')),
+                ('registration_status', models.CharField(choices=[('registered', 'Registered'), ('confirmed', 'Confirmed'), ('attended', 'Attended'), ('cancelled', 'Cancelled'), ('waitlisted', 'Waitlisted')], max_length=16)),
+                ('rating', models.PositiveIntegerField(blank=True, null=True)),
+                ('comment', models.TextField(blank=True, null=True)),
+                ('registration_created_at', models.DateTimeField()),
+                ('registration_updated_at', models.DateTimeField()),
+                ('event_title', models.CharField(max_length=200)),
+                ('event_start_time', models.DateTimeField()),
+                ('event_end_time', models.DateTimeField(blank=True, null=True)),
+                ('event_location', models.CharField(blank=True, max_length=255, null=True)),
+                ('event_category_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('event_cover_url', models.URLField(blank=True, null=True)),
+                ('event_is_public', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='event_management.event')),
+                ('event_category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='event_management.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users.profile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-event_start_time', 'registration'], name='idx_timeline_user_start')],
+            },
+        ),
+        migrations.RunPython(populate_timeline, migrations.RunPython.noop),
+    ]
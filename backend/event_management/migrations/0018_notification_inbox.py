@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_management', '0017_user_event_timeline'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('registered', 'Registered'), ('waitlisted', 'Waitlisted'), ('promoted', 'Promoted'), ('status_changed', 'Status changed'), ('event_updated', 'Event updated'), ('event_cancelled', 'Event cancelled')], max_length=20)),
+                ('message', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+                ('event', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='event_management.event')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='users.profile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-id'], name='idx_notifications_user'), models.Index(condition=models.Q(('read_at__isnull', True)), fields=['user'], name='idx_notifications_unread')],
+            },
+        ),
+    ]
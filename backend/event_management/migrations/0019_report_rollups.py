@@ -0,0 +1,85 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_management', '0018_notification_inbox'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('registered', models.PositiveIntegerField(default=0)),
+                ('confirmed', models.PositiveIntegerField(default=0)),
+                ('attended', models.PositiveIntegerField(default=0)),
+                ('cancelled', models.PositiveIntegerField(default=0)),
+                ('waitlisted', models.PositiveIntegerField(default=0)),
+                ('day', models.DateField()),
+                ('events', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='EventRollup',
+            fields=[
+                ('total', models.PositiveIntegerField(default=0)),
+                ('registered', models.PositiveIntegerField(default=0)),
+                ('confirmed', models.PositiveIntegerField(default=0)),
+                ('attended', models.PositiveIntegerField(default=0)),
+                ('cancelled', models.PositiveIntegerField(default=0)),
+                ('waitlisted', models.PositiveIntegerField(default=0)),
+                ('event', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='+', serialize=False, to='event_management.event')),
+                ('day', models.DateField()),
+                ('start_time', models.DateTimeField()),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['updated_at'], name='idx_events_updated_at'),
+        ),
+        migrations.AddIndex(
+            model_name='eventregistration',
+            index=models.Index(fields=['updated_at'], name='idx_registrations_updated_at'),
+        ),
+        migrations.AddField(
+            model_name='dailyrollup',
+            name='category',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='event_management.category'),
+        ),
+        migrations.AddField(
+            model_name='eventrollup',
+            name='category',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='event_management.category'),
+        ),
+        migrations.AddIndex(
+            model_name='dailyrollup',
+            index=models.Index(fields=['day', 'category'], name='idx_rollup_daily_day'),
+        ),
+        migrations.AddIndex(
+            model_name='eventrollup',
+            index=models.Index(fields=['day'], name='idx_rollup_event_day'),
+        ),
+        migrations.AddIndex(
+            model_name='eventrollup',
+            index=models.Index(fields=['start_time'], name='idx_rollup_event_start'),
+        ),
+        migrations.AddIndex(
+            model_name='eventrollup',
+            index=models.Index(fields=['-total', '-start_time'], name='idx_rollup_event_top'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_management', '0020_report_jobs'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eventregistration',
+            index=models.Index(fields=['created_at'], name='idx_registrations_created_at'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:56
+
+from django.db import migrations, models
+
+
+def backfill_commented_at(apps, schema_editor):
+    """Comentarios existentes: la mejor aproximación es la última modificación de la inscripción"""
+    EventRegistration = apps.get_model('event_management', 'EventRegistration')
+    EventRegistration.objects.filter(comment__isnull=False).exclude(comment='').update(
+        commented_at=models.F('updated_at')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_management', '0021_registration_created_index'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventregistration',
+            name='commented_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='eventregistration',
+            index=models.Index(fields=['event', 'commented_at'], name='idx_reg_event_commented'),
+        ),
+        migrations.RunPython(backfill_commented_at, migrations.RunPython.noop),
+    ]
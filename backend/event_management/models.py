@@ -3,6 +3,7 @@ from django.db import models
 from django.db.models import Q, F
 from users.models import Profile
 from django.core.validators import MinValueValidator, MaxValueValidator
+from .geo import encode_geohash
 import django_filters
 
 
@@ -17,12 +18,19 @@ class RegistrationStatus(models.TextChoices):
 class Category(models.Model):
     id = models.AutoField(primary_key=True)
     name = models.CharField(max_length=100, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
         return self.name
 
 
 class Event(models.Model):
+    # Contadores que sólo se modifican con UPDATE ... F() (seats.py, ratings.py)
+    COUNTER_FIELDS = (
+        "seats_taken", "rating_sum", "rating_count",
+        "rating_hist_1", "rating_hist_2", "rating_hist_3", "rating_hist_4", "rating_hist_5",
+    )
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     organizer = models.ForeignKey(
         Profile,
@@ -39,12 +47,30 @@ class Event(models.Model):
         related_name="events",
     )
     location = models.CharField(max_length=255, null=True, blank=True)
+    # Coordenadas opcionales; geohash se calcula al guardar (ver geo.py)
+    latitude = models.FloatField(
+        null=True, blank=True, validators=[MinValueValidator(-90), MaxValueValidator(90)]
+    )
+    longitude = models.FloatField(
+        null=True, blank=True, validators=[MinValueValidator(-180), MaxValueValidator(180)]
+    )
+    geohash = models.CharField(max_length=12, null=True, blank=True, editable=False)
     start_time = models.DateTimeField()
     end_time = models.DateTimeField(null=True, blank=True)
     capacity = models.PositiveIntegerField(null=True, blank=True)
+    # Inscripciones que ocupan cupo (ver event_management/seats.py)
+    seats_taken = models.PositiveIntegerField(default=0, editable=False)
     is_public = models.BooleanField(default=True)
     cover_url = models.URLField(null=True, blank=True)
     metadata = models.JSONField(default=dict, blank=True)
+    # Agregados de calificaciones (ver event_management/ratings.py)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_hist_1 = models.PositiveIntegerField(default=0, editable=False)
+    rating_hist_2 = models.PositiveIntegerField(default=0, editable=False)
+    rating_hist_3 = models.PositiveIntegerField(default=0, editable=False)
+    rating_hist_4 = models.PositiveIntegerField(default=0, editable=False)
+    rating_hist_5 = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -57,12 +83,55 @@ class Event(models.Model):
         ]
         indexes = [
             models.Index(fields=["start_time"], name="idx_events_start_time"),
+            models.Index(fields=["start_time", "id"], name="idx_events_start_time_id"),
             models.Index(fields=["category"], name="idx_events_category_id"),
+            models.Index(fields=["geohash"], name="idx_events_geohash"),
+            # Refresco incremental de los rollups de reportes (ver rollups.py)
+            models.Index(fields=["updated_at"], name="idx_events_updated_at"),
         ]
 
     def __str__(self) -> str:
         return self.title
 
+    def save(self, *args, **kwargs):
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = encode_geohash(self.latitude, self.longitude)
+        else:
+            self.geohash = None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = set(update_fields) | {"geohash"}
+        elif update_fields is None and not self._state.adding and not kwargs.get("force_insert"):
+            # Un save() completo (PATCH/PUT, admin) no escribe los contadores: una
+            # instancia leída antes de una inscripción pisaría seats_taken y permitiría sobreventa
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def average_rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    @property
+    def seats_left(self):
+        if self.capacity is None:
+            return None
+        return max(self.capacity - self.seats_taken, 0)
+
+    @property
+    def rating_histogram(self):
+        return {
+            star: getattr(self, f"rating_hist_{star}")
+            for star in range(1, 6)
+        }
+
 
 class EventRegistration(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -83,6 +152,8 @@ class EventRegistration(models.Model):
     )
     rating = models.PositiveIntegerField(null=True, blank=True, validators=[MinValueValidator(1), MaxValueValidator(5)])
     comment = models.TextField(null=True, blank=True)
+    # Cuándo se escribió el comentario actual (lo asigna la acción `rate`)
+    commented_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -96,7 +167,234 @@ class EventRegistration(models.Model):
         indexes = [
             models.Index(fields=["event"], name="idx_registrations_event"),
             models.Index(fields=["user"], name="idx_registrations_user"),
+            # Roster filtrado por estado y paginado por fecha de inscripción
+            models.Index(fields=["event", "status", "created_at"], name="idx_reg_event_status_created"),
+            # Roster de un evento por fecha de inscripción
+            models.Index(fields=["event", "created_at"], name="idx_reg_event_created"),
+            # Comentarios de un evento por recencia
+            models.Index(fields=["event", "commented_at"], name="idx_reg_event_commented"),
+            # Refresco incremental de los rollups de reportes (ver rollups.py)
+            models.Index(fields=["updated_at"], name="idx_registrations_updated_at"),
+            # Series de tiempo por fecha de inscripción (ver trends.py)
+            models.Index(fields=["created_at"], name="idx_registrations_created_at"),
         ]
 
     def __str__(self) -> str:
         return f"{self.user} → {self.event} ({self.status})"
+
+
+class CheckInScan(models.Model):
+    """Lectura de un escáner en la puerta; scan_id lo genera el dispositivo (idempotencia)."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name="check_in_scans",
+    )
+    registration = models.ForeignKey(
+        EventRegistration,
+        on_delete=models.CASCADE,
+        related_name="check_in_scans",
+    )
+    scan_id = models.CharField(max_length=64)
+    device_id = models.CharField(max_length=64, blank=True, default="")
+    # Hora del dispositivo (puede llegar tarde si estaba sin conexión)
+    scanned_at = models.DateTimeField()
+    received_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "scan_id"],
+                name="ux_checkin_event_scan",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["registration", "scanned_at"], name="idx_checkin_registration"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.scan_id} → {self.registration_id}"
+
+
+class UserEventTimeline(models.Model):
+    """
+    Modelo de lectura de "mis eventos": una fila por inscripción con los campos
+    de la inscripción y los del evento que definen la agenda (ver timeline.py).
+    """
+    registration = models.OneToOneField(
+        EventRegistration,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="timeline_entry",
+    )
+    user = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="+")
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="+")
+    registration_status = models.CharField(max_length=16, choices=RegistrationStatus.choices)
+    rating = models.PositiveIntegerField(null=True, blank=True)
+    comment = models.TextField(null=True, blank=True)
+    registration_created_at = models.DateTimeField()
+    registration_updated_at = models.DateTimeField()
+    event_title = models.CharField(max_length=200)
+    event_start_time = models.DateTimeField()
+    event_end_time = models.DateTimeField(null=True, blank=True)
+    event_location = models.CharField(max_length=255, null=True, blank=True)
+    event_category = models.ForeignKey(
+        Category, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    event_category_name = models.CharField(max_length=100, null=True, blank=True)
+    event_cover_url = models.URLField(null=True, blank=True)
+    event_is_public = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "-event_start_time", "registration"],
+                name="idx_timeline_user_start",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id} → {self.event_title}"
+
+
+class NotificationKind(models.TextChoices):
+    REGISTERED = "registered", "Registered"
+    WAITLISTED = "waitlisted", "Waitlisted"
+    PROMOTED = "promoted", "Promoted"
+    STATUS_CHANGED = "status_changed", "Status changed"
+    EVENT_UPDATED = "event_updated", "Event updated"
+    EVENT_CANCELLED = "event_cancelled", "Event cancelled"
+
+
+class Notification(models.Model):
+    """Bandeja de notificaciones; se escribe al ocurrir el cambio (ver notifications.py)."""
+    id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="notifications")
+    # Null si el evento se eliminó (el título queda en el mensaje)
+    event = models.ForeignKey(
+        Event, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    kind = models.CharField(max_length=20, choices=NotificationKind.choices)
+    message = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Lectura de la bandeja por cursor (id descendente)
+            models.Index(fields=["user", "-id"], name="idx_notifications_user"),
+            # Conteo de no leídas: sólo indexa las pendientes
+            models.Index(
+                fields=["user"],
+                name="idx_notifications_unread",
+                condition=Q(read_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id}: {self.message}"
+
+
+class RollupCounts(models.Model):
+    """Conteos de inscripciones por estado, comunes a los rollups de reportes."""
+    total = models.PositiveIntegerField(default=0)
+    registered = models.PositiveIntegerField(default=0)
+    confirmed = models.PositiveIntegerField(default=0)
+    attended = models.PositiveIntegerField(default=0)
+    cancelled = models.PositiveIntegerField(default=0)
+    waitlisted = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class EventRollup(RollupCounts):
+    """
+    Totales de inscripciones de un evento (ver rollups.py). Sin restricción de FK:
+    la fila sobrevive al borrado del evento hasta el próximo refresco, que la quita
+    y recalcula su día.
+    """
+    event = models.OneToOneField(
+        Event,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        primary_key=True,
+        related_name="+",
+    )
+    # Día (UTC) de inicio del evento
+    day = models.DateField()
+    start_time = models.DateTimeField()
+    category = models.ForeignKey(
+        Category, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["day"], name="idx_rollup_event_day"),
+            models.Index(fields=["start_time"], name="idx_rollup_event_start"),
+            # Eventos más populares
+            models.Index(fields=["-total", "-start_time"], name="idx_rollup_event_top"),
+        ]
+
+
+class DailyRollup(RollupCounts):
+    """Totales por día (UTC) de inicio de los eventos y categoría (ver rollups.py)."""
+    day = models.DateField()
+    category = models.ForeignKey(
+        Category, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    events = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["day", "category"], name="idx_rollup_daily_day"),
+        ]
+
+
+class RollupWatermark(models.Model):
+    """Hasta cuándo (updated_at) están incorporados los cambios en los rollups."""
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.DateTimeField()
+
+
+
+class ReportJobStatus(models.TextChoices):
+    QUEUED = "queued", "Queued"
+    RUNNING = "running", "Running"
+    DONE = "done", "Done"
+    FAILED = "failed", "Failed"
+
+
+class ReportJob(models.Model):
+    """Reporte de administrador calculado por el worker en segundo plano (ver report_jobs.py)."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    requested_by = models.ForeignKey(
+        Profile, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    period = models.CharField(max_length=10)
+    status = models.CharField(
+        max_length=10, choices=ReportJobStatus.choices, default=ReportJobStatus.QUEUED
+    )
+    result = models.JSONField(null=True, blank=True)
+    # Mensaje para quien consulta; el detalle del error queda en el log del worker
+    error = models.CharField(max_length=255, blank=True, default="")
+    # Cada reclamo lo incrementa: el worker sólo guarda si sigue siendo el suyo
+    attempts = models.PositiveSmallIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Cola: pendientes por orden de llegada
+            models.Index(fields=["status", "created_at"], name="idx_report_jobs_queue"),
+            # Reutilizar el resultado más reciente de un período
+            models.Index(fields=["period", "-created_at"], name="idx_report_jobs_period"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.period} ({self.status})"
@@ -0,0 +1,114 @@
+# backend/event_management/notifications.py
+"""
+Bandeja de notificaciones con fan-out al escribir.
+
+Las entradas se crean cuando ocurre el cambio (inscripción, promoción desde la
+lista de espera, cambio de estado masivo, edición o eliminación del evento), así
+leer la bandeja o contar las no leídas es una consulta indexada por usuario:
+
+- notify(): una entrada para un usuario.
+- notify_users(): un bulk_create por bloque para muchos usuarios.
+- fan_out_event(): a todos los inscritos de un evento, leyendo sus ids con
+  .iterator() para no cargar eventos con miles de asistentes en memoria.
+"""
+from django.utils import timezone
+
+from .models import EventRegistration, Notification, NotificationKind, RegistrationStatus
+
+FAN_OUT_BATCH_SIZE = 1000
+MAX_MESSAGE_LENGTH = 255
+
+# Inscripciones que reciben avisos del evento (todas salvo las canceladas)
+NOTIFIED_STATUSES = (
+    RegistrationStatus.REGISTERED,
+    RegistrationStatus.CONFIRMED,
+    RegistrationStatus.ATTENDED,
+    RegistrationStatus.WAITLISTED,
+)
+
+STATUS_LABELS = {
+    RegistrationStatus.REGISTERED: "inscrito",
+    RegistrationStatus.CONFIRMED: "confirmado",
+    RegistrationStatus.ATTENDED: "asistió",
+    RegistrationStatus.CANCELLED: "cancelado",
+    RegistrationStatus.WAITLISTED: "en lista de espera",
+}
+
+MESSAGES = {
+    NotificationKind.REGISTERED: 'Te inscribiste en "{title}".',
+    NotificationKind.WAITLISTED: 'El evento "{title}" está lleno: quedaste en la lista de espera.',
+    NotificationKind.PROMOTED: 'Se liberó un cupo: ya estás inscrito en "{title}".',
+    NotificationKind.STATUS_CHANGED: 'Tu inscripción en "{title}" cambió a: {status}.',
+    NotificationKind.EVENT_UPDATED: 'El evento "{title}" fue actualizado.',
+    NotificationKind.EVENT_CANCELLED: 'El evento "{title}" fue cancelado.',
+}
+
+
+def build_message(kind, title, **extra):
+    if "status" in extra:
+        extra["status"] = STATUS_LABELS.get(extra["status"], extra["status"])
+    return MESSAGES[kind].format(title=title, **extra)[:MAX_MESSAGE_LENGTH]
+
+
+def notify(user_id, kind, event, **extra):
+    return Notification.objects.create(
+        user_id=user_id,
+        event=event,
+        kind=kind,
+        message=build_message(kind, event.title, **extra),
+    )
+
+
+def notify_users(user_ids, kind, title, event_id=None, batch_size=FAN_OUT_BATCH_SIZE, **extra):
+    """Una entrada por usuario; un INSERT por bloque. Devuelve cuántas se crearon."""
+    message = build_message(kind, title, **extra)
+    now = timezone.now()
+    created = 0
+    batch = []
+    for user_id in user_ids:
+        batch.append(Notification(
+            user_id=user_id, event_id=event_id, kind=kind, message=message, created_at=now,
+        ))
+        if len(batch) >= batch_size:
+            Notification.objects.bulk_create(batch)
+            created += len(batch)
+            batch = []
+    if batch:
+        Notification.objects.bulk_create(batch)
+        created += len(batch)
+    return created
+
+
+# Campos de un evento cuyo cambio se avisa a los inscritos (EVENT_UPDATED)
+EVENT_NOTIFIED_FIELDS = ("title", "start_time", "end_time", "location", "capacity", "is_public")
+
+
+def fan_out_event(event, kind, keep_event=True, batch_size=FAN_OUT_BATCH_SIZE):
+    """
+    Avisa a todos los inscritos del evento. `keep_event=False` para un evento que
+    se está eliminando: la referencia se perdería igual y el título queda en el mensaje.
+    """
+    user_ids = (
+        EventRegistration.objects.filter(event_id=event.pk, status__in=NOTIFIED_STATUSES)
+        .order_by()
+        .values_list("user_id", flat=True)
+        .iterator(chunk_size=batch_size)
+    )
+    return notify_users(
+        user_ids, kind, event.title,
+        event_id=event.pk if keep_event else None,
+        batch_size=batch_size,
+    )
+
+
+def unread_count(user_id):
+    # Cubierta por idx_notifications_unread
+    return Notification.objects.filter(user_id=user_id, read_at__isnull=True).count()
+
+
+def mark_read(user_id, ids=None):
+    """Marca como leídas las entradas indicadas (o todas). Devuelve cuántas cambiaron."""
+    entries = Notification.objects.filter(user_id=user_id, read_at__isnull=True)
+    if ids is not None:
+        entries = entries.filter(id__in=ids)
+    return entries.update(read_at=timezone.now())
@@ -0,0 +1,251 @@
+# backend/event_management/pagination.py
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) sobre una tupla de columnas únicas y no nulas.
+
+    - Es opcional: sólo se activa si la petición trae `cursor` o `page_size`,
+      así los clientes actuales siguen recibiendo la lista completa.
+    - No ejecuta COUNT(*): se pide un registro extra para saber si hay más.
+    - El cursor es opaco (base64 de la posición), estable aunque se inserten filas.
+    """
+    ordering = ('-start_time', '-id')
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def is_enabled(self, request):
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_enabled(request):
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+
+        position, reverse = self.decode_cursor(request)
+        self.has_cursor = position is not None
+
+        ordering = self.get_ordering(reverse)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.build_seek_filter(position, reverse))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        if reverse:
+            self.has_next = self.has_cursor
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.has_cursor
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Cursor opaco de paginación.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Cantidad de resultados por página.',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    # --- Ordenamiento y filtro de posición ---
+
+    def get_fields(self):
+        return [(name.lstrip('-'), name.startswith('-')) for name in self.ordering]
+
+    def get_ordering(self, reverse):
+        ordering = []
+        for name, descending in self.get_fields():
+            if descending != reverse:
+                ordering.append('-' + name)
+            else:
+                ordering.append(name)
+        return ordering
+
+    def build_seek_filter(self, position, reverse):
+        """
+        Construye (a < x) | (a = x & b < y) | ... según la dirección de cada columna.
+        """
+        seek = Q()
+        equal = Q()
+        for (name, descending), value in zip(self.get_fields(), position):
+            lookup = 'lt' if descending != reverse else 'gt'
+            seek |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return seek
+
+    # --- Codificación del cursor ---
+
+    def get_position(self, instance):
+        return [
+            self._get_value(instance, name)
+            for name, _ in self.get_fields()
+        ]
+
+    def _get_value(self, instance, name):
+        if isinstance(instance, dict):
+            value = instance[name]
+        else:
+            value = getattr(instance, name)
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return str(value)
+
+    def encode_cursor(self, position, reverse):
+        payload = {'p': position}
+        if reverse:
+            payload['r'] = 1
+        raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        encoded = base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            padding = '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(encoded + padding))
+            values = payload['p']
+            fields = self.get_fields()
+            if len(values) != len(fields):
+                raise ValueError
+            position = [
+                self.model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(fields, values)
+            ]
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, bool(payload.get('r'))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
+
+
+class EventCursorPagination(KeysetPagination):
+    """
+    Listado de eventos: los más recientes primero, desempate por id.
+
+    Al paginar, ?search= y ?near= también se recorren por fecha (el orden por
+    relevancia o distancia no sirve de clave del cursor); si el cliente pide
+    explícitamente ?ordering=relevance o ?ordering=distance se rechaza.
+    """
+    ordering = ('-start_time', '-id')
+    ordering_query_param = 'ordering'
+    unpaginated_orderings = ('relevance', 'distance')
+    unpaginated_message = (
+        'ordering=relevance/distance no admite paginación (cursor/page_size): '
+        'las páginas se recorren por fecha de inicio.'
+    )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if (
+            self.is_enabled(request)
+            and request.query_params.get(self.ordering_query_param) in self.unpaginated_orderings
+        ):
+            raise ParseError(self.unpaginated_message)
+        return super().paginate_queryset(queryset, request, view)
+
+
+class RegistrationCursorPagination(KeysetPagination):
+    """Roster de un evento: en orden de inscripción, desempate por id."""
+    ordering = ('created_at', 'id')
+    page_size = 50
+    max_page_size = 200
+
+
+class TimelineCursorPagination(KeysetPagination):
+    """my_events sobre UserEventTimeline: igual que el listado de eventos."""
+    ordering = ('-event_start_time', '-registration_id')
+
+
+class CommentCursorPagination(KeysetPagination):
+    """Comentarios de un evento: siempre paginados, los escritos más recientemente primero."""
+    ordering = ('-commented_at', '-id')
+    page_size = 20
+    max_page_size = 100
+
+    def is_enabled(self, request):
+        return True
+
+
+class NotificationCursorPagination(KeysetPagination):
+    """Bandeja de notificaciones: siempre paginada, las más nuevas primero (id creciente)."""
+    ordering = ('-id',)
+    page_size = 20
+    max_page_size = 100
+
+    def is_enabled(self, request):
+        return True
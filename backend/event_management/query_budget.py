@@ -0,0 +1,130 @@
+# backend/event_management/query_budget.py
+"""
+Presupuesto de consultas SQL por endpoint.
+
+Cada vista declara cuántas consultas puede ejecutar por petición:
+
+- ViewSets: `query_budgets = {"list": 3, "retrieve": 3, "join": 6}` (por acción).
+- APIView: `query_budgets = {"get": 3}` (por método HTTP).
+- Vistas función con @api_view: decorador `@query_budget(get=4)` por fuera de @api_view.
+
+El presupuesto incluye la autenticación (JWT carga el usuario) y el acceso a
+`request.user.profile`. `QueryBudgetMiddleware` lo vigila en desarrollo (y en
+modo estricto durante `manage.py test`, ver test_runner.py) y
+`manage.py check_query_budgets` lo verifica contra un dataset sembrado, de modo
+que un N+1 nuevo hace fallar la verificación en lugar de llegar a producción.
+"""
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(**budgets):
+    """Declara el presupuesto de una vista función (por método HTTP en minúsculas)."""
+    def decorator(view):
+        view.query_budgets = {method.lower(): value for method, value in budgets.items()}
+        return view
+    return decorator
+
+
+def get_view_budget(view_func, method):
+    """Presupuesto de la vista resuelta para el método dado, o None si no declara."""
+    if view_func is None:
+        return None
+    method = method.lower()
+
+    budgets = getattr(view_func, "query_budgets", None)
+    if budgets is not None:
+        return budgets.get(method)
+
+    view_class = getattr(view_func, "cls", None)
+    budgets = getattr(view_class, "query_budgets", None)
+    if not budgets:
+        return None
+
+    # ViewSet: as_view() guarda el mapeo método -> acción
+    actions = getattr(view_func, "actions", None)
+    if actions:
+        action = actions.get(method)
+        return budgets.get(action) if action else None
+    return budgets.get(method)
+
+
+class QueryCounter:
+    """execute_wrapper que cuenta las consultas ejecutadas."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetMiddleware:
+    """
+    En desarrollo (QUERY_BUDGET_ENABLED, por defecto DEBUG) cuenta las consultas de
+    cada petición, agrega `X-Query-Count` y marca/loguea las que exceden su presupuesto.
+    Con QUERY_BUDGET_STRICT la petición falla con QueryBudgetExceeded.
+
+    Admite ASGI sin pasar por un hilo: las vistas async (el stream de
+    event_management.live) se atienden en el loop, como el resto de la cadena.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "QUERY_BUDGET_ENABLED", settings.DEBUG)
+        self.strict = getattr(settings, "QUERY_BUDGET_STRICT", False)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        return self.check_budget(request, response, counter.count)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        # Con ASGI las consultas corren en el hilo de sync_to_async de la petición
+        # (thread_sensitive), no en el del loop: el contador se instala allí
+        counter = QueryCounter()
+        await sync_to_async(lambda: connection.execute_wrappers.append(counter))()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(lambda: connection.execute_wrappers.remove(counter))()
+        return self.check_budget(request, response, counter.count)
+
+    def check_budget(self, request, response, count):
+        response["X-Query-Count"] = str(count)
+        match = getattr(request, "resolver_match", None)
+        budget = get_view_budget(match.func if match else None, request.method)
+        if budget is not None:
+            response["X-Query-Budget"] = str(budget)
+            if count > budget:
+                message = (
+                    f"{request.method} {request.path} ejecutó {count} consultas "
+                    f"(presupuesto: {budget})"
+                )
+                logger.warning(message)
+                if self.strict:
+                    raise QueryBudgetExceeded(message)
+        return response
@@ -0,0 +1,78 @@
+# backend/event_management/ratings.py
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import Event, EventRegistration
+
+RATING_STARS = range(1, 6)
+
+
+def _histogram_field(star):
+    return f"rating_hist_{star}"
+
+
+def apply_rating_change(event_id, old_rating, new_rating):
+    """
+    Ajusta los agregados de calificación del evento con un único UPDATE.
+    Debe llamarse dentro de la misma transacción que modifica la inscripción.
+    """
+    old_rating = int(old_rating) if old_rating is not None else None
+    new_rating = int(new_rating) if new_rating is not None else None
+    if old_rating == new_rating:
+        return
+
+    # updated_at también cambia: average_rating es parte de la representación del evento
+    updates = {"updated_at": timezone.now()}
+    sum_delta = (new_rating or 0) - (old_rating or 0)
+    count_delta = (new_rating is not None) - (old_rating is not None)
+    if sum_delta:
+        updates["rating_sum"] = F("rating_sum") + sum_delta
+    if count_delta:
+        updates["rating_count"] = F("rating_count") + count_delta
+    if old_rating is not None:
+        field = _histogram_field(old_rating)
+        updates[field] = F(field) - 1
+    if new_rating is not None:
+        field = _histogram_field(new_rating)
+        updates[field] = F(field) + 1
+
+    Event.objects.filter(pk=event_id).update(**updates)
+
+
+def rebuild_rating_aggregates(event_ids=None, batch_size=500):
+    """
+    Recalcula los agregados desde EventRegistration con una sola consulta agrupada.
+    Devuelve la cantidad de eventos actualizados.
+    """
+    events = Event.objects.all()
+    registrations = EventRegistration.objects.filter(rating__isnull=False)
+    if event_ids is not None:
+        events = events.filter(pk__in=event_ids)
+        registrations = registrations.filter(event_id__in=event_ids)
+
+    fields = ["rating_sum", "rating_count"] + [_histogram_field(s) for s in RATING_STARS]
+    events.update(updated_at=timezone.now(), **{name: 0 for name in fields})
+
+    histogram = {
+        _histogram_field(star): Count("id", filter=Q(rating=star))
+        for star in RATING_STARS
+    }
+    rows = (
+        registrations.order_by()
+        .values("event_id")
+        .annotate(rating_sum=Sum("rating"), rating_count=Count("id"), **histogram)
+    )
+
+    updated = 0
+    batch = []
+    for row in rows.iterator(chunk_size=batch_size):
+        event = Event(pk=row["event_id"])
+        for name in fields:
+            setattr(event, name, row[name])
+        batch.append(event)
+        if len(batch) >= batch_size:
+            updated += Event.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        updated += Event.objects.bulk_update(batch, fields)
+    return updated
@@ -0,0 +1,55 @@
+# backend/event_management/renderers.py
+"""
+Renderers para las exportaciones en streaming (?format=csv / ?format=ndjson /
+?format=parquet).
+
+Las vistas devuelven directamente un StreamingHttpResponse; estos renderers
+existen para que la negociación de DRF acepte el formato y sólo se usan para
+las respuestas de error (403, 404), que se escriben en el mismo formato.
+"""
+import csv
+import io
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+
+class CSVRenderer(BaseRenderer):
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if not isinstance(data, dict):
+            data = {"detail": data}
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(data.keys())
+        writer.writerow(data.values())
+        return buffer.getvalue().encode(self.charset)
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return (json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n").encode(self.charset)
+
+
+class ParquetRenderer(BaseRenderer):
+    """Un error no se puede escribir como Parquet: va como JSON (ver exports.py)."""
+    media_type = "application/vnd.apache.parquet"
+    format = "parquet"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False).encode("utf-8")
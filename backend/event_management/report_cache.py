@@ -0,0 +1,103 @@
+# backend/event_management/report_cache.py
+"""
+Caché de admin_reports por período con protección contra estampidas.
+
+Cada entrada guarda el payload y el instante hasta el que está fresca
+(ADMIN_REPORT_CACHE_TTL). La clave vive bastante más (STALE_FACTOR × TTL) para
+poder servirla vencida mientras se recalcula:
+
+- fresca: se devuelve tal cual;
+- vencida: un solo worker toma el lock (cache.add) y la recalcula; el resto
+  sigue sirviendo la versión vencida;
+- ausente: quien toma el lock la calcula y los demás esperan hasta
+  LOCK_TIMEOUT a que aparezca antes de calcularla por su cuenta;
+- ?refresh=1: se recalcula aunque esté fresca (si otro ya la está calculando,
+  se espera esa).
+
+`generated_at` del payload es el momento en que se construyó la entrada.
+Con LocMem el lock es por proceso; con Redis (REDIS_URL) es compartido.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+KEY_PREFIX = "admin_report:"
+DEFAULT_TTL = 60
+STALE_FACTOR = 10
+# Tiempo máximo que se espera a otro worker (y vida del lock si ese worker muere)
+LOCK_TIMEOUT = 30
+WAIT_INTERVAL = 0.1
+
+HIT = "hit"
+STALE = "stale"
+MISS = "miss"
+REFRESH = "refresh"
+
+
+def get_ttl():
+    return getattr(settings, "ADMIN_REPORT_CACHE_TTL", DEFAULT_TTL)
+
+
+def entry_key(period):
+    return f"{KEY_PREFIX}{period}"
+
+
+def lock_key(period):
+    return f"{KEY_PREFIX}{period}:lock"
+
+
+def build_entry(period, build):
+    ttl = get_ttl()
+    entry = {"payload": build(period), "fresh_until": time.time() + ttl}
+    cache.set(entry_key(period), entry, timeout=ttl * STALE_FACTOR)
+    return entry
+
+
+def rebuild(period, build):
+    """Recalcula con el lock tomado. Devuelve None si otro worker ya lo tiene."""
+    if not cache.add(lock_key(period), 1, timeout=LOCK_TIMEOUT):
+        return None
+    try:
+        return build_entry(period, build)
+    finally:
+        cache.delete(lock_key(period))
+
+
+def wait_for_entry(period, newer_than=0):
+    """Espera a que otro worker publique una entrada construida después de `newer_than`."""
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        entry = cache.get(entry_key(period))
+        if entry is not None and entry["fresh_until"] > newer_than:
+            return entry
+        if cache.get(lock_key(period)) is None:
+            # El otro worker terminó sin publicar (error): no seguir esperando
+            break
+    return None
+
+
+def get_report(period, build, refresh=False):
+    """
+    (payload, estado de la caché: hit | stale | miss | refresh). `build(period)`
+    construye el payload (build_admin_report).
+    """
+    now = time.time()
+    entry = cache.get(entry_key(period))
+
+    if entry is not None and not refresh:
+        if now < entry["fresh_until"]:
+            return entry["payload"], HIT
+        # Vencida: la recalcula quien consiga el lock; los demás sirven la anterior
+        rebuilt = rebuild(period, build)
+        return (rebuilt or entry)["payload"], STALE if rebuilt is None else MISS
+
+    state = REFRESH if refresh else MISS
+    rebuilt = rebuild(period, build)
+    if rebuilt is None:
+        # Otro worker la está calculando: esperar su resultado
+        rebuilt = wait_for_entry(period, newer_than=now + get_ttl() if refresh else 0)
+    if rebuilt is None:
+        rebuilt = build_entry(period, build)
+    return rebuilt["payload"], state
@@ -0,0 +1,116 @@
+# backend/event_management/report_jobs.py
+"""
+Reportes de administrador en segundo plano, con la base de datos como cola.
+
+- submit() crea un ReportJob en estado queued (o devuelve uno reutilizable del
+  mismo administrador: uno pendiente del mismo período o uno terminado hace
+  menos de ADMIN_REPORT_JOB_RESULT_TTL segundos). Cada administrador sólo ve
+  sus propios jobs.
+- El worker (manage.py run_report_worker) reclama el más antiguo con un UPDATE
+  condicional (status=queued -> running): si dos workers eligen el mismo job,
+  sólo a uno le afecta la fila.
+- Un job que lleva más de JOB_TIMEOUT en running se da por perdido (el worker
+  murió) y vuelve a la cola, hasta MAX_ATTEMPTS intentos.
+- El resultado se guarda en el job; `attempts` hace de testigo para que un
+  worker que perdió el job no pise el resultado de quien lo reclamó después.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import ReportJob, ReportJobStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULT_TTL = 300
+JOB_TIMEOUT = timedelta(minutes=10)
+MAX_ATTEMPTS = 3
+# Candidatos que se intentan reclamar por pasada
+CLAIM_BATCH = 5
+FINISHED_RETENTION = timedelta(days=7)
+FAILED_MESSAGE = "No se pudo generar el reporte."
+
+
+def get_result_ttl():
+    return getattr(settings, "ADMIN_REPORT_JOB_RESULT_TTL", DEFAULT_RESULT_TTL)
+
+
+def submit(period, profile=None, refresh=False):
+    """
+    (job, creado). Sin `refresh` reutiliza un job de `profile` pendiente o en curso
+    del período, o uno terminado dentro del TTL; con `refresh` sólo uno que aún no empezó.
+    """
+    reusable = Q(status=ReportJobStatus.QUEUED)
+    if not refresh:
+        reusable |= Q(status=ReportJobStatus.RUNNING)
+        reusable |= Q(
+            status=ReportJobStatus.DONE,
+            finished_at__gte=timezone.now() - timedelta(seconds=get_result_ttl()),
+        )
+    job = ReportJob.objects.filter(reusable, period=period, requested_by=profile).order_by("-created_at").first()
+    if job is not None:
+        return job, False
+    return ReportJob.objects.create(period=period, requested_by=profile), True
+
+
+def requeue_stale(now):
+    """Devuelve a la cola (o da por fallidos) los jobs de workers que murieron."""
+    stale = ReportJob.objects.filter(status=ReportJobStatus.RUNNING, started_at__lt=now - JOB_TIMEOUT)
+    stale.filter(attempts__gte=MAX_ATTEMPTS).update(
+        status=ReportJobStatus.FAILED, error=FAILED_MESSAGE, finished_at=now
+    )
+    return stale.update(status=ReportJobStatus.QUEUED, worker="")
+
+
+def claim_next(worker):
+    """Reclama el job pendiente más antiguo para `worker`, o None si no hay."""
+    now = timezone.now()
+    requeue_stale(now)
+    candidates = list(
+        ReportJob.objects.filter(status=ReportJobStatus.QUEUED)
+        .order_by("created_at")
+        .values_list("pk", flat=True)[:CLAIM_BATCH]
+    )
+    for pk in candidates:
+        claimed = ReportJob.objects.filter(pk=pk, status=ReportJobStatus.QUEUED).update(
+            status=ReportJobStatus.RUNNING,
+            worker=worker,
+            started_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return ReportJob.objects.get(pk=pk)
+    return None
+
+
+def run_job(job, build):
+    """
+    Calcula el reporte con `build(period)` (build_admin_report) y guarda el
+    resultado. Devuelve el estado final.
+    """
+    try:
+        result = build(job.period)
+        status, error = ReportJobStatus.DONE, ""
+    except Exception:
+        logger.exception("Falló el job de reporte %s (período %s)", job.pk, job.period)
+        result, status, error = None, ReportJobStatus.FAILED, FAILED_MESSAGE
+
+    saved = ReportJob.objects.filter(
+        pk=job.pk, status=ReportJobStatus.RUNNING, attempts=job.attempts
+    ).update(status=status, result=result, error=error, finished_at=timezone.now())
+    if not saved:
+        logger.warning("El job de reporte %s fue reasignado; se descarta el resultado", job.pk)
+    return status
+
+
+def purge_finished(now=None):
+    """Elimina los jobs terminados hace más de FINISHED_RETENTION."""
+    now = now or timezone.now()
+    deleted, _ = ReportJob.objects.filter(
+        status__in=[ReportJobStatus.DONE, ReportJobStatus.FAILED],
+        finished_at__lt=now - FINISHED_RETENTION,
+    ).delete()
+    return deleted
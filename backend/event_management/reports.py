@@ -1,157 +1,408 @@
 # backend/event_management/reports.py
-from rest_framework.decorators import api_view
+"""
+Reportes de administrador.
+
+build_admin_report() calcula todo con un número fijo de consultas, sin importar
+cuántos eventos haya. Si los rollups están al día (manage.py
+refresh_report_rollups, por cron; ver ADMIN_REPORT_ROLLUP_MAX_AGE), suma sus
+filas; si no, agrupa las inscripciones:
+
+1. un aggregate con los totales globales (Count condicionales en una pasada),
+2. los eventos más populares agrupados con Count(filter=Q(...)) y ORDER BY ... LIMIT,
+3. la distribución por categoría,
+4. el total de usuarios.
+"""
+from rest_framework.decorators import api_view, renderer_classes
+from rest_framework.settings import api_settings
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Count
+from django.db.models import Count, F, Q, Sum
 from django.utils import timezone
+from django.http import StreamingHttpResponse
+from django.urls import reverse
 from datetime import timedelta
-from .models import Event, EventRegistration, RegistrationStatus, Category
+import logging
+from django.conf import settings
+from .models import DailyRollup, Event, EventRollup, RegistrationStatus, ReportJob, ReportJobStatus
+from .query_budget import query_budget
+from .exports import CONTENT_TYPES, ExportError, export_chunks, export_filename, get_table, resolve_format
+from .renderers import CSVRenderer, ParquetRenderer
+from .report_cache import get_report
+from .report_jobs import submit as submit_report_job
+from .trends import TrendsError, build_trends, parse_bound
+from .rollups import get_watermark
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
-@api_view(['GET'])
-def admin_reports(request):
+TOP_EVENTS_LIMIT = 50
+PERIODS = ('today', 'week', 'month', 'all')
+DEFAULT_ROLLUP_MAX_AGE = 900
+
+
+def get_rollup_max_age():
+    """Antigüedad máxima de la marca de agua para usar los rollups (segundos)."""
+    return timedelta(seconds=getattr(settings, 'ADMIN_REPORT_ROLLUP_MAX_AGE', DEFAULT_ROLLUP_MAX_AGE))
+
+
+def period_start(period, now):
+    """Inicio del período (None para 'all' o un valor desconocido)."""
+    if period == 'today':
+        return now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == 'week':
+        return now - timedelta(days=7)
+    if period == 'month':
+        return now - timedelta(days=30)
+    return None
+
+
+def registration_counts(prefix='registrations'):
+    """Total, confirmados y asistentes como Count condicionales sobre `prefix`."""
+    return {
+        'attendees': Count(prefix),
+        'confirmed': Count(prefix, filter=Q(**{f'{prefix}__status': RegistrationStatus.CONFIRMED})),
+        'attended': Count(prefix, filter=Q(**{f'{prefix}__status': RegistrationStatus.ATTENDED})),
+    }
+
+
+def event_status(start_time, end_time, now):
+    if end_time and end_time < now:
+        return 'finished'
+    if start_time and start_time > now:
+        return 'upcoming'
+    return 'active'
+
+
+def percentage(part, total):
+    return round((part / total) * 100, 2) if total > 0 else 0
+
+
+def format_event(row, now):
+    start_time = row['start_time']
+    return {
+        'id': str(row['id']),
+        'name': row['title'],
+        'date': start_time.strftime('%Y-%m-%d') if start_time else None,
+        'time': start_time.strftime('%H:%M') if start_time else None,
+        'category': row['category_name'] or 'Sin categoría',
+        'organizer': row['organizer_username'] or 'Desconocido',
+        'location': row['location'] or 'No especificada',
+        'attendees': row['attendees'],
+        'confirmed': row['confirmed'],  # Confirmados
+        'attended': row['attended'],    # Que realmente asistieron
+        'status': event_status(row['start_time'], row['end_time'], now),
+        'attendance_rate': percentage(row['attended'], row['attendees']),
+        'capacity': row['capacity'],
+        'is_public': row['is_public'],
+    }
+
+
+def live_sections(events, limit=TOP_EVENTS_LIMIT):
+    """(totales, eventos por categoría, eventos más populares) desde las inscripciones."""
+    # Totales globales en una sola pasada
+    totals = events.aggregate(events=Count('id', distinct=True), **registration_counts())
+
+    # Distribución por categoría
+    by_category = [
+        (item['category__name'], item['count'])
+        for item in events.values('category__name').annotate(count=Count('id')).order_by('-count')
+    ]
+
+    # Agrupado, ordenado y limitado en la base de datos
+    top = (
+        events.annotate(**registration_counts())
+        .order_by('-attendees', '-start_time', 'id')
+        .values(
+            'id', 'title', 'start_time', 'end_time', 'location', 'capacity', 'is_public',
+            'attendees', 'confirmed', 'attended',
+            category_name=F('category__name'), organizer_username=F('organizer__user__username'),
+        )[:limit]
+    )
+    return totals, by_category, top
+
+
+def rollup_sections(start_date, limit=TOP_EVENTS_LIMIT):
     """
-    Endpoint para reportes de administrador.
-    Solo usuarios con role='admin' pueden acceder.
+    Lo mismo desde los rollups (ver rollups.py): los días completos salen de
+    DailyRollup y el día en que empieza el período, de los EventRollup de ese día.
+    """
+    sums = {'events': Sum('events'), 'total': Sum('total'), 'confirmed': Sum('confirmed'), 'attended': Sum('attended')}
+    daily = DailyRollup.objects.all()
+    per_event = EventRollup.objects.all()
+    if start_date is not None:
+        boundary_day = start_date.date()
+        daily = daily.filter(day__gt=boundary_day)
+        per_event = per_event.filter(start_time__gte=start_date)
+        partial = per_event.filter(day=boundary_day)
+
+    groups = list(daily.values('category__name').annotate(**sums).order_by())
+    if start_date is not None:
+        groups += list(
+            partial.values('category__name')
+            .annotate(events=Count('pk'), **{name: Sum(name) for name in ('total', 'confirmed', 'attended')})
+            .order_by()
+        )
+
+    totals = {'events': 0, 'attendees': 0, 'confirmed': 0, 'attended': 0}
+    categories = {}
+    for group in groups:
+        totals['events'] += group['events'] or 0
+        totals['attendees'] += group['total'] or 0
+        totals['confirmed'] += group['confirmed'] or 0
+        totals['attended'] += group['attended'] or 0
+        name = group['category__name']
+        categories[name] = categories.get(name, 0) + (group['events'] or 0)
+    by_category = sorted(categories.items(), key=lambda item: -item[1])
+
+    # El JOIN con Event descarta las filas de eventos ya eliminados
+    top = (
+        per_event.order_by('-total', '-start_time', 'event_id')
+        .values(
+            'start_time', 'confirmed', 'attended',
+            id=F('event_id'), attendees=F('total'), category_name=F('category__name'),
+            title=F('event__title'), end_time=F('event__end_time'), location=F('event__location'),
+            capacity=F('event__capacity'), is_public=F('event__is_public'),
+            organizer_username=F('event__organizer__user__username'),
+        )[:limit]
+    )
+    return totals, by_category, top
+
+
+def build_admin_report(period, now=None, source=None):
+    """
+    Payload de admin_reports para el período ('today', 'week', 'month' o 'all').
+    `source`: 'rollups', 'live' o None (rollups si se refrescaron hace menos de
+    ADMIN_REPORT_ROLLUP_MAX_AGE; si no, se calcula en vivo).
     """
+    now = now or timezone.now()
+    start_date = period_start(period, now)
+
+    data_as_of = now
+    stale = False
+    if source != 'live':
+        watermark = get_watermark()
+        if watermark is None:
+            if source == 'rollups':
+                raise ValueError('Los rollups de reportes no se han calculado (refresh_report_rollups).')
+            source = 'live'
+        else:
+            stale = watermark < now - get_rollup_max_age()
+            if stale and source is None:
+                # El cron de refresh_report_rollups no está corriendo: mejor lento que desactualizado
+                logger.warning('Rollups de reportes desactualizados (marca de agua %s); se calcula en vivo', watermark)
+                source, stale = 'live', False
+            else:
+                source, data_as_of = 'rollups', watermark
+
+    if source == 'rollups':
+        totals, by_category, top = rollup_sections(start_date)
+    else:
+        events = Event.objects.all()
+        if start_date is not None:
+            events = events.filter(start_time__gte=start_date)
+        totals, by_category, top = live_sections(events)
+
+    total_registrations = totals['attendees']
+    total_confirmed = totals['confirmed']
+    total_attended = totals['attended']
+    # Para reportes, "confirmados" puede incluir tanto CONFIRMED como ATTENDED
+    total_confirmed_and_attended = total_confirmed + total_attended
+
+    category_dict = {}
+    for name, count in by_category:
+        key = name or 'Sin categoría'
+        category_dict[key] = category_dict.get(key, 0) + count
+
+    return {
+        'events': [format_event(row, now) for row in top],
+        'stats': {
+            'totalEvents': totals['events'],
+            'totalRegistrations': total_registrations,
+            'totalConfirmed': total_confirmed,           # Solo CONFIRMED
+            'totalAttended': total_attended,             # Solo ATTENDED
+            'totalConfirmedAndAttended': total_confirmed_and_attended,  # Ambos
+            'confirmationRate': percentage(total_confirmed_and_attended, total_registrations),
+            'totalUsers': User.objects.count(),
+            'eventsByCategory': category_dict,
+            'period': period,
+            'generated_at': now.isoformat(),
+            # Fuente de los totales y hasta cuándo incluyen cambios
+            'source': source,
+            'dataAsOf': data_as_of.isoformat(),
+            # Sólo con source='rollups' forzado: la marca de agua superó ADMIN_REPORT_ROLLUP_MAX_AGE
+            'stale': stale,
+        }
+    }
+
+
+def admin_denied(request):
+    """Respuesta 401/403 si el usuario no puede ver los reportes, o None."""
     # 1. Verificar autenticación
     if not request.user.is_authenticated:
         return Response({'error': 'No autenticado'}, status=401)
-    
-    # 2. Verificar si es admin (usando tu campo role en Profile)
-    # 2. Verificar si es admin
+
+    # 2. Verificar si es admin (superusuario o role='admin' en Profile)
     if request.user.is_superuser:
-        pass # Es superusuario, acceso concedido
-    else:
-        try:
-           if not hasattr(request.user, 'profile') or request.user.profile.role != 'admin':
-                return Response({'error': 'No tienes permisos de administrador'}, status=403)
-        except Exception as e:
-           return Response({'error': f'Error al verificar permisos: {str(e)}'}, status=403)
-    
+        return None
+    profile = getattr(request.user, 'profile', None)
+    if profile is None or profile.role != 'admin':
+        return Response({'error': 'No tienes permisos de administrador'}, status=403)
+    return None
+
+
+def internal_error():
+    # El detalle queda en el log; al cliente sólo un mensaje genérico
+    logger.exception('Error en los reportes de administrador')
+    return Response({'error': 'Error interno del servidor'}, status=500)
+
+
+def serialize_job(job):
+    data = {
+        'id': str(job.id),
+        'period': job.period,
+        'status': job.status,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+    }
+    if job.status == ReportJobStatus.DONE:
+        data['result'] = job.result
+    elif job.status == ReportJobStatus.FAILED:
+        data['error'] = job.error
+    return data
+
+
+# Autenticación + perfil (rol) + marca de agua de los rollups + 4 consultas del reporte
+# (en un acierto de la caché, sólo las dos primeras)
+@query_budget(get=7)
+@api_view(['GET'])
+def admin_reports(request):
+    """
+    Endpoint para reportes de administrador.
+    Solo usuarios con role='admin' pueden acceder.
+    Para períodos largos usar admin_report_jobs (en segundo plano).
+    """
+    denied = admin_denied(request)
+    if denied is not None:
+        return denied
+
     try:
         # 3. Parámetros de filtro
         period = request.GET.get('period', 'all')
-        
-        # 4. Obtener eventos
-        events = Event.objects.all().select_related('category', 'organizer', 'organizer__user')
-        
-        # 5. Filtrar por período (si se especifica)
-        now = timezone.now()
-        if period == 'today':
-            start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            events = events.filter(start_time__gte=start_date)
-        elif period == 'week':
-            start_date = now - timedelta(days=7)
-            events = events.filter(start_time__gte=start_date)
-        elif period == 'month':
-            start_date = now - timedelta(days=30)
-            events = events.filter(start_time__gte=start_date)
-        
-        # 6. Estadísticas generales
-        total_events = events.count()
-        
-        # Obtener todas las inscripciones para estos eventos
-        registrations = EventRegistration.objects.filter(event__in=events)
-        total_registrations = registrations.count()
-        
-        # Contar por estado
-        total_confirmed = registrations.filter(status=RegistrationStatus.CONFIRMED).count()
-        total_attended = registrations.filter(status=RegistrationStatus.ATTENDED).count()
-        
-        # Para reportes, "confirmados" puede incluir tanto CONFIRMED como ATTENDED
-        total_confirmed_and_attended = total_confirmed + total_attended
-        
-        # Tasa de confirmación (incluyendo attended)
-        confirmation_rate = 0
-        if total_registrations > 0:
-            confirmation_rate = round((total_confirmed_and_attended / total_registrations) * 100, 2)
-        
-        # 7. Distribución por categoría
-        events_by_category = events.values('category__name').annotate(
-            count=Count('id')
-        ).order_by('-count')
-        
-        category_dict = {}
-        for item in events_by_category:
-            category_name = item['category__name'] or 'Sin categoría'
-            category_dict[category_name] = item['count']
-        
-        # 8. Eventos más populares (por número de inscripciones)
-        events_with_stats = []
-        for event in events:
-            # Obtener estadísticas de este evento
-            event_registrations = EventRegistration.objects.filter(event=event)
-            total_for_event = event_registrations.count()
-            
-            confirmed_for_event = event_registrations.filter(
-                status=RegistrationStatus.CONFIRMED
-            ).count()
-            
-            attended_for_event = event_registrations.filter(
-                status=RegistrationStatus.ATTENDED
-            ).count()
-            
-            # Calcular tasa de asistencia
-            attendance_rate = 0
-            if total_for_event > 0:
-                attendance_rate = round((attended_for_event / total_for_event) * 100, 2)
-            
-            # Determinar estado del evento
-            if event.end_time and event.end_time < now:
-                event_status = 'finished'
-            elif event.start_time and event.start_time > now:
-                event_status = 'upcoming'
-            else:
-                event_status = 'active'
-            
-            events_with_stats.append({
-                'id': str(event.id),
-                'name': event.title,
-                'date': event.start_time.strftime('%Y-%m-%d') if event.start_time else None,
-                'time': event.start_time.strftime('%H:%M') if event.start_time else None,
-                'category': event.category.name if event.category else 'Sin categoría',
-                'organizer': event.organizer.user.username if event.organizer and event.organizer.user else 'Desconocido',
-                'location': event.location or 'No especificada',
-                'attendees': total_for_event,
-                'confirmed': confirmed_for_event,  # Confirmados
-                'attended': attended_for_event,    # Que realmente asistieron
-                'status': event_status,
-                'attendance_rate': attendance_rate,
-                'capacity': event.capacity,
-                'is_public': event.is_public
-            })
-        
-        # Ordenar por número de asistentes
-        events_with_stats.sort(key=lambda x: x['attendees'], reverse=True)
-        
-        # 9. Estadísticas adicionales
-        total_users = User.objects.count()
-        
-        # 10. Preparar respuesta
-        return Response({
-            'events': events_with_stats[:50],  # Limitar a 50 eventos
-            'stats': {
-                'totalEvents': total_events,
-                'totalRegistrations': total_registrations,
-                'totalConfirmed': total_confirmed,           # Solo CONFIRMED
-                'totalAttended': total_attended,             # Solo ATTENDED
-                'totalConfirmedAndAttended': total_confirmed_and_attended,  # Ambos
-                'confirmationRate': confirmation_rate,
-                'totalUsers': total_users,
-                'eventsByCategory': category_dict,
-                'period': period,
-                'generated_at': now.isoformat()
-            }
-        })
-        
-    except Exception as e:
-        import traceback
-        error_details = {
-            'error': str(e),
-            'traceback': traceback.format_exc()
-        }
-        print(f"Error en admin_reports: {error_details}")
-        return Response({'error': 'Error interno del servidor', 'details': str(e)}, status=500)
\ No newline at end of file
+        if period not in PERIODS:
+            # Sin caché para valores desconocidos: no crear una clave por cada uno
+            return Response(build_admin_report(period))
+
+        # Caché por período; ?refresh=1 fuerza el recálculo (ver report_cache.py)
+        refresh = request.GET.get('refresh', '').lower() in ('1', 'true')
+        payload, cache_state = get_report(period, build_admin_report, refresh=refresh)
+        response = Response(payload)
+        response['X-Report-Cache'] = cache_state
+        return response
+    except Exception:
+        return internal_error()
+
+
+# Autenticación + perfil + job reutilizable + INSERT del job nuevo
+@query_budget(post=4)
+@api_view(['POST'])
+def admin_report_jobs(request):
+    """
+    Encola un reporte para el worker (manage.py run_report_worker).
+    Body: {"period": "all", "refresh": false}. Responde 202 con el job; el
+    resultado se consulta en admin_report_job_detail.
+    """
+    denied = admin_denied(request)
+    if denied is not None:
+        return denied
+
+    period = request.data.get('period', 'all')
+    if period not in PERIODS:
+        return Response({'error': f'Período inválido. Opciones: {", ".join(PERIODS)}.'}, status=400)
+    refresh = str(request.data.get('refresh', '')).lower() in ('1', 'true')
+
+    try:
+        job, _ = submit_report_job(period, getattr(request.user, 'profile', None), refresh=refresh)
+    except Exception:
+        return internal_error()
+    response = Response(serialize_job(job), status=200 if job.status == ReportJobStatus.DONE else 202)
+    response['Location'] = request.build_absolute_uri(reverse('admin-report-job-detail', args=[job.id]))
+    return response
+
+
+# Autenticación + perfil + el job
+@query_budget(get=3)
+@api_view(['GET'])
+def admin_report_job_detail(request, job_id):
+    """Estado de un job de reporte y, cuando terminó, su resultado."""
+    denied = admin_denied(request)
+    if denied is not None:
+        return denied
+
+    # Sólo los jobs que pidió este administrador
+    job = ReportJob.objects.filter(pk=job_id, requested_by=getattr(request.user, 'profile', None)).first()
+    if job is None:
+        return Response({'error': 'Job no encontrado'}, status=404)
+    return Response(serialize_job(job))
+
+
+# Autenticación + perfil + la consulta agrupada
+@query_budget(get=3)
+@api_view(['GET'])
+def admin_report_trends(request):
+    """
+    Series de inscripciones, confirmados y asistentes por intervalo (ver trends.py).
+    Parámetros: bucket=hour|day|week, start, end (fecha o ISO 8601), by_category=true.
+    """
+    denied = admin_denied(request)
+    if denied is not None:
+        return denied
+
+    params = request.GET
+    try:
+        payload = build_trends(
+            bucket=params.get('bucket', 'day'),
+            start=parse_bound(params['start'], 'start') if params.get('start') else None,
+            end=parse_bound(params['end'], 'end') if params.get('end') else None,
+            by_category=params.get('by_category', '').lower() in ('1', 'true'),
+        )
+    except TrendsError as e:
+        return Response({'error': str(e)}, status=400)
+    except Exception:
+        return internal_error()
+    return Response(payload)
+
+
+# Autenticación + perfil + la lectura de la tabla (un cursor, leído por bloques)
+@query_budget(get=3)
+@api_view(['GET'])
+@renderer_classes(api_settings.DEFAULT_RENDERER_CLASSES + [CSVRenderer, ParquetRenderer])
+def admin_export(request, table):
+    """
+    Exporta una tabla completa (events o registrations) en streaming (ver exports.py).
+    ?format=parquet|csv (por defecto Parquet si pyarrow está instalado; CSV con gzip si no).
+    ?since=<fecha ISO> sólo las filas con updated_at posterior, para cargas incrementales.
+    """
+    denied = admin_denied(request)
+    if denied is not None:
+        return denied
+
+    try:
+        get_table(table)
+    except ExportError as e:
+        return Response({'error': str(e)}, status=404)
+
+    requested = request.accepted_renderer.format
+    try:
+        export_format = resolve_format(requested if requested in CONTENT_TYPES else None)
+        since = parse_bound(request.GET['since'], 'since') if request.GET.get('since') else None
+    except ValueError as e:
+        return Response({'error': str(e)}, status=400)
+
+    now = timezone.now()
+    response = StreamingHttpResponse(export_chunks(table, export_format, since), content_type=CONTENT_TYPES[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{export_filename(table, export_format, now)}"'
+    # Valor para ?since= en la siguiente exportación incremental
+    response['X-Export-Started-At'] = now.isoformat()
+    return response
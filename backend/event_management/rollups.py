@@ -0,0 +1,144 @@
+# backend/event_management/rollups.py
+"""
+Rollups de inscripciones para los reportes de administrador.
+
+- EventRollup: una fila por evento con sus conteos por estado y el día de inicio.
+- DailyRollup: una fila por (día de inicio, categoría) con la suma de las anteriores.
+
+refresh_rollups() es incremental: recalcula sólo los eventos con cambios desde
+la última marca de agua (updated_at del evento o de alguna de sus inscripciones)
+y luego los días afectados. Cómo llega cada cambio a un updated_at:
+
+- inscripciones nuevas, cambios de estado, calificaciones, bulk_status y
+  check_in actualizan EventRegistration.updated_at;
+- borrar una inscripción con cupo cambia seats_taken (Event.updated_at) o
+  promueve a otra (su updated_at); sin cupo, la señal toca Event.updated_at;
+- un evento borrado deja su EventRollup huérfano, que el refresco detecta.
+
+Cada refresco vuelve a leer SAFETY_LAG antes de la marca, por las transacciones
+que confirman tarde con un updated_at anterior; recalcular un evento es idempotente.
+"""
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q, Sum
+from django.utils import timezone
+
+from .models import DailyRollup, Event, EventRegistration, EventRollup, RegistrationStatus, RollupWatermark
+
+WATERMARK_NAME = "report_rollups"
+SAFETY_LAG = timedelta(minutes=5)
+ROLLUP_CHUNK_SIZE = 500
+STATUS_FIELDS = tuple(RegistrationStatus.values)
+COUNT_FIELDS = ("total",) + STATUS_FIELDS
+
+
+def event_counts(event_ids):
+    """(id, start_time, category_id, total, conteos por estado) con una consulta agrupada."""
+    counts = {"total": Count("registrations")}
+    counts.update(
+        (status, Count("registrations", filter=Q(registrations__status=status)))
+        for status in STATUS_FIELDS
+    )
+    return (
+        Event.objects.filter(pk__in=event_ids)
+        .annotate(**counts)
+        .order_by()
+        .values_list("id", "start_time", "category_id", *COUNT_FIELDS)
+    )
+
+
+def refresh_event_rollups(event_ids, now, chunk_size=ROLLUP_CHUNK_SIZE):
+    """Recalcula las filas de los eventos indicados. Devuelve los días afectados."""
+    days = set()
+    for start in range(0, len(event_ids), chunk_size):
+        chunk = event_ids[start:start + chunk_size]
+        # El día anterior también cambia si el evento se movió de fecha
+        previous = dict(EventRollup.objects.filter(event_id__in=chunk).values_list("event_id", "day"))
+        days.update(previous.values())
+
+        rows = []
+        for event_id, start_time, category_id, *counts in event_counts(chunk):
+            day = start_time.astimezone(dt_timezone.utc).date()
+            days.add(day)
+            rows.append(EventRollup(
+                event_id=event_id, day=day, start_time=start_time, category_id=category_id,
+                refreshed_at=now, **dict(zip(COUNT_FIELDS, counts)),
+            ))
+        EventRollup.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["event"],
+            update_fields=["day", "start_time", "category", "refreshed_at", *COUNT_FIELDS],
+        )
+
+        # Eventos eliminados
+        deleted = set(previous) - {row.event_id for row in rows}
+        if deleted:
+            EventRollup.objects.filter(event_id__in=deleted).delete()
+    return days
+
+
+def refresh_daily_rollups(days):
+    """Reemplaza las filas de los días indicados sumando sus EventRollup."""
+    days = list(days)
+    if not days:
+        return 0
+    sums = {field: Sum(field) for field in COUNT_FIELDS}
+    DailyRollup.objects.filter(day__in=days).delete()
+    rows = [
+        DailyRollup(**row)
+        for row in EventRollup.objects.filter(day__in=days)
+        .values("day", "category_id")
+        .annotate(events=Count("pk"), **sums)
+        .order_by()
+    ]
+    DailyRollup.objects.bulk_create(rows, batch_size=ROLLUP_CHUNK_SIZE)
+    return len(rows)
+
+
+def changed_event_ids(since):
+    changed = set(Event.objects.filter(updated_at__gte=since).values_list("id", flat=True))
+    changed.update(
+        EventRegistration.objects.filter(updated_at__gte=since)
+        .order_by()
+        .values_list("event_id", flat=True)
+        .distinct()
+    )
+    # Filas huérfanas: el evento se eliminó
+    changed.update(
+        EventRollup.objects.filter(~Exists(Event.objects.filter(pk=OuterRef("event_id"))))
+        .values_list("event_id", flat=True)
+    )
+    return changed
+
+
+def get_watermark():
+    return RollupWatermark.objects.filter(name=WATERMARK_NAME).values_list("value", flat=True).first()
+
+
+def refresh_rollups(full=False):
+    """
+    Incorpora los cambios desde la última marca de agua (o reconstruye todo si
+    `full` o si nunca se calcularon). Devuelve (eventos recalculados, días recalculados).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        # Serializa refrescos concurrentes (no-op en SQLite, que ya serializa escrituras)
+        watermark = (
+            RollupWatermark.objects.select_for_update()
+            .filter(name=WATERMARK_NAME)
+            .values_list("value", flat=True)
+            .first()
+        )
+        if full or watermark is None:
+            EventRollup.objects.all().delete()
+            DailyRollup.objects.all().delete()
+            event_ids = list(Event.objects.values_list("id", flat=True))
+        else:
+            event_ids = list(changed_event_ids(watermark - SAFETY_LAG))
+
+        days = refresh_event_rollups(event_ids, now)
+        refresh_daily_rollups(days)
+        RollupWatermark.objects.update_or_create(name=WATERMARK_NAME, defaults={"value": now})
+    return len(event_ids), len(days)
@@ -0,0 +1,197 @@
+# backend/event_management/search.py
+"""
+Backends de búsqueda de eventos.
+
+- PostgreSQL: tsvector ponderado (title > description > location) con índice GIN
+  sobre la misma expresión, creado en la migración 0010.
+- SQLite: tabla sombra FTS5 (`event_management_event_fts`) sincronizada con las
+  señales de guardado/borrado de Event.
+- Cualquier otro motor: `icontains` como antes.
+
+Todos agregan la columna `search_rank` (mayor es mejor) y ordenan por relevancia.
+Se puede forzar un backend con el setting `EVENT_SEARCH_BACKEND` (ruta con puntos).
+"""
+import re
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import FloatField, Q, Value
+from django.utils.module_loading import import_string
+
+SEARCH_FIELDS = ("title", "description", "location")
+SEARCH_RANK = "search_rank"
+POSTGRES_CONFIG = "spanish"
+FTS_TABLE = "event_management_event_fts"
+MAX_TERMS = 8
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(value):
+    return _TOKEN_RE.findall(value or "")[:MAX_TERMS]
+
+
+def is_ranked(queryset):
+    """True si el queryset ya pasó por un backend de búsqueda."""
+    # SQLiteSearchBackend agrega el rank con extra(), no como anotación
+    return SEARCH_RANK in queryset.query.annotations or SEARCH_RANK in queryset.query.extra
+
+
+class BaseSearchBackend:
+    def search(self, queryset, value):
+        raise NotImplementedError
+
+    def index_event(self, event):
+        """Sincroniza el índice tras guardar un evento (no-op si el motor lo mantiene)."""
+
+    def remove_event(self, event_id):
+        """Quita un evento del índice tras borrarlo."""
+
+    def rebuild(self):
+        """Reconstruye el índice completo. Devuelve la cantidad de eventos indexados."""
+        return 0
+
+
+class BasicSearchBackend(BaseSearchBackend):
+    """Búsqueda por `icontains` (comportamiento original, sin índice)."""
+
+    def search(self, queryset, value):
+        condition = Q()
+        for field in SEARCH_FIELDS:
+            condition |= Q(**{f"{field}__icontains": value})
+        return queryset.filter(condition).annotate(
+            **{SEARCH_RANK: Value(0.0, output_field=FloatField())}
+        )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """tsvector + GIN. El índice es de expresión, así que Postgres lo mantiene solo."""
+
+    @staticmethod
+    def vector():
+        # Debe coincidir con la expresión del índice de la migración 0010
+        from django.contrib.postgres.search import SearchVector
+
+        return (
+            SearchVector("title", weight="A", config=POSTGRES_CONFIG)
+            + SearchVector("description", weight="B", config=POSTGRES_CONFIG)
+            + SearchVector("location", weight="C", config=POSTGRES_CONFIG)
+        )
+
+    def search(self, queryset, value):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        terms = tokenize(value)
+        if not terms:
+            return BasicSearchBackend().search(queryset, value)
+
+        # Prefijos para búsqueda mientras se escribe: "musi:* & bogo:*"
+        query = SearchQuery(
+            " & ".join(f"{term}:*" for term in terms),
+            search_type="raw",
+            config=POSTGRES_CONFIG,
+        )
+        vector = self.vector()
+        return (
+            queryset.alias(search_document=vector)
+            .filter(search_document=query)
+            .annotate(**{SEARCH_RANK: SearchRank(vector, query)})
+            .order_by(f"-{SEARCH_RANK}", "-start_time")
+        )
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """
+    FTS5 con rowid derivado del UUID del evento, para que actualizar o borrar
+    una fila del índice sea una búsqueda por clave y no un recorrido completo.
+    """
+
+    @staticmethod
+    def rowid(event_id):
+        # 63 bits superiores del UUID: entra en el rowid firmado de SQLite
+        return event_id.int >> 65
+
+    @staticmethod
+    def match_expression(terms):
+        return " ".join(f'"{term}"*' for term in terms)
+
+    def search(self, queryset, value):
+        terms = tokenize(value)
+        if not terms:
+            return BasicSearchBackend().search(queryset, value)
+
+        expression = self.match_expression(terms)
+        event_table = queryset.model._meta.db_table
+        # Un solo MATCH: la tabla FTS se une al evento y bm25 sale de esa misma
+        # fila (una subconsulta correlacionada repetiría el MATCH por cada evento).
+        # bm25 devuelve valores negativos (menor es mejor): se invierte el signo
+        return queryset.extra(
+            select={SEARCH_RANK: f"-bm25({FTS_TABLE}, 0, 10.0, 4.0, 2.0)"},
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE} MATCH %s", f"{FTS_TABLE}.event_id = {event_table}.id"],
+            params=[expression],
+        ).order_by(f"-{SEARCH_RANK}", "-start_time")
+
+    def index_event(self, event):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [self.rowid(event.pk)])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, event_id, title, description, location) "
+                f"VALUES (%s, %s, %s, %s, %s)",
+                [
+                    self.rowid(event.pk),
+                    event.pk.hex,
+                    event.title or "",
+                    event.description or "",
+                    event.location or "",
+                ],
+            )
+
+    def remove_event(self, event_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [self.rowid(event_id)])
+
+    def rebuild(self):
+        from .models import Event
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        count = 0
+        events = Event.objects.only(*SEARCH_FIELDS).order_by()
+        for event in events.iterator(chunk_size=1000):
+            self.index_event(event)
+            count += 1
+        return count
+
+
+def _sqlite_fts_available():
+    try:
+        return FTS_TABLE in connection.introspection.table_names()
+    except DatabaseError:
+        return False
+
+
+_backends = {}
+
+
+def _backend_for(vendor, dotted_path):
+    key = (vendor, dotted_path)
+    if key in _backends:
+        return _backends[key]
+    if dotted_path:
+        backend = import_string(dotted_path)()
+    elif vendor == "postgresql":
+        backend = PostgresSearchBackend()
+    elif vendor == "sqlite" and _sqlite_fts_available():
+        backend = SQLiteSearchBackend()
+    elif vendor == "sqlite":
+        # Sin cachear: la tabla FTS aparece al correr la migración 0010 sin reiniciar
+        return BasicSearchBackend()
+    else:
+        backend = BasicSearchBackend()
+    _backends[key] = backend
+    return backend
+
+
+def get_search_backend():
+    return _backend_for(connection.vendor, getattr(settings, "EVENT_SEARCH_BACKEND", None))
@@ -0,0 +1,157 @@
+# backend/event_management/seats.py
+"""
+Asignación de cupos sin sobreventa.
+
+Event.seats_taken cuenta las inscripciones que ocupan cupo (SEATED_STATUSES).
+Toda operación que lo modifica bloquea primero la fila del evento, de modo que
+las inscripciones y cancelaciones concurrentes de un mismo evento se serializan;
+además el UPDATE que toma un cupo es condicional (seats_taken < capacity), así
+que aun sin bloqueo (SQLite) el contador nunca supera la capacidad.
+
+Si no hay cupo la inscripción queda en WAITLISTED, y al liberarse un cupo (o
+aumentar la capacidad) se promueve la inscripción en espera más antigua (FIFO).
+
+seats_taken no se escribe con save(): Event.save() lo excluye (ver models.py).
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import Event, EventRegistration, NotificationKind, RegistrationStatus
+from .notifications import notify, notify_users
+
+SEATED_STATUSES = (
+    RegistrationStatus.REGISTERED,
+    RegistrationStatus.CONFIRMED,
+    RegistrationStatus.ATTENDED,
+)
+
+
+class AlreadyRegistered(Exception):
+    pass
+
+
+def lock_event(event_id):
+    # No-op en SQLite, que de todas formas serializa las escrituras
+    list(Event.objects.select_for_update().filter(pk=event_id).values_list("pk"))
+
+
+def reserve_seat(event_id):
+    """Toma un cupo con un UPDATE condicional. Devuelve False si el evento está lleno."""
+    return bool(
+        Event.objects.filter(pk=event_id)
+        .filter(Q(capacity__isnull=True) | Q(seats_taken__lt=F("capacity")))
+        # updated_at también cambia: seats_left es parte de la representación del evento
+        .update(seats_taken=F("seats_taken") + 1, updated_at=timezone.now())
+    )
+
+
+def release_seat(event_id):
+    Event.objects.filter(pk=event_id, seats_taken__gt=0).update(
+        seats_taken=F("seats_taken") - 1, updated_at=timezone.now()
+    )
+
+
+def join_event(event, profile):
+    """
+    Inscribe al usuario: con cupo queda REGISTERED, si no WAITLISTED.
+    La restricción única (evento, usuario) resuelve las inscripciones duplicadas
+    concurrentes: lanza AlreadyRegistered y el cupo tomado se revierte.
+    """
+    try:
+        with transaction.atomic():
+            lock_event(event.pk)
+            seated = reserve_seat(event.pk)
+            return EventRegistration.objects.create(
+                event=event,
+                user=profile,
+                status=RegistrationStatus.REGISTERED if seated else RegistrationStatus.WAITLISTED,
+            )
+    except IntegrityError:
+        raise AlreadyRegistered
+
+
+def seat_freed(event_id):
+    """
+    Un cupo quedó libre: pasa a la primera inscripción en espera o, si no hay,
+    descuenta el contador. Debe llamarse dentro de la transacción que liberó el cupo.
+    """
+    lock_event(event_id)
+    next_in_line = (
+        EventRegistration.objects.select_for_update()
+        .select_related("event")
+        .filter(event_id=event_id, status=RegistrationStatus.WAITLISTED)
+        .order_by("created_at", "id")
+        .first()
+    )
+    if next_in_line is None:
+        release_seat(event_id)
+        return None
+
+    # El cupo se transfiere: seats_taken no cambia
+    next_in_line.status = RegistrationStatus.REGISTERED
+    next_in_line.save(update_fields=["status", "updated_at"])
+    notify(next_in_line.user_id, NotificationKind.PROMOTED, next_in_line.event)
+    return next_in_line
+
+
+def promote_waitlisted(event_id):
+    """
+    Ocupa los cupos libres (p. ej. tras aumentar la capacidad) con las inscripciones
+    en espera, en orden de llegada. Debe llamarse dentro de la transacción que
+    modificó el evento. Devuelve las inscripciones promovidas.
+    """
+    lock_event(event_id)
+    event = Event.objects.only("id", "title", "capacity", "seats_taken").get(pk=event_id)
+    waitlist = (
+        EventRegistration.objects.select_for_update()
+        .filter(event_id=event_id, status=RegistrationStatus.WAITLISTED)
+        .order_by("created_at", "id")
+    )
+    if event.capacity is not None:
+        free = event.capacity - event.seats_taken
+        if free <= 0:
+            return []
+        waitlist = waitlist[:free]
+    promoted = list(waitlist)
+    if not promoted:
+        return []
+
+    Event.objects.filter(pk=event_id).update(
+        seats_taken=F("seats_taken") + len(promoted), updated_at=timezone.now()
+    )
+    # save() por inscripción: las señales actualizan el timeline, la caché y el stream en vivo
+    for registration in promoted:
+        registration.status = RegistrationStatus.REGISTERED
+        registration.save(update_fields=["status", "updated_at"])
+    notify_users(
+        [registration.user_id for registration in promoted],
+        NotificationKind.PROMOTED, event.title, event_id=event_id,
+    )
+    return promoted
+
+
+def rebuild_seat_counts(event_ids=None, batch_size=500):
+    """
+    Recalcula seats_taken desde las inscripciones (reparación tras cambios
+    directos de estado, p. ej. desde el admin). Devuelve los eventos actualizados.
+    """
+    events = Event.objects.all()
+    if event_ids is not None:
+        events = events.filter(pk__in=event_ids)
+    counts = dict(
+        EventRegistration.objects.filter(event__in=events, status__in=SEATED_STATUSES)
+        .values_list("event_id")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+
+    to_update = []
+    for event in events.only("id", "seats_taken").iterator(chunk_size=batch_size):
+        seats_taken = counts.get(event.pk, 0)
+        if event.seats_taken != seats_taken:
+            event.seats_taken = seats_taken
+            event.updated_at = timezone.now()
+            to_update.append(event)
+    Event.objects.bulk_update(to_update, ["seats_taken", "updated_at"], batch_size=batch_size)
+    return len(to_update)
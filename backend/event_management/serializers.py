@@ -2,16 +2,97 @@ from rest_framework import serializers
 from .models import Event, Category, EventRegistration
 from django.contrib.auth.models import User
 
+
+def parse_fieldset(request):
+    """
+    Lee ?fields=a,b y ?omit=c de la petición (sólo en GET).
+    Devuelve (fields, omit): fields es None si no se pidió un subconjunto.
+    """
+    if request is None or request.method != 'GET':
+        return None, set()
+
+    def split(param):
+        raw = request.query_params.get(param, '')
+        return {name.strip() for name in raw.split(',') if name.strip()}
+
+    return split('fields') or None, split('omit')
+
+
+class SparseFieldsetMixin:
+    """
+    Recorta la salida del serializer según ?fields= / ?omit= y permite podar el
+    queryset (JOINs y columnas) para que coincida con los campos pedidos.
+
+    - `sparse_columns`: columnas del modelo que necesita cada campo (por defecto, el mismo nombre).
+    - `sparse_related`: relación a unir con select_related para ese campo.
+    - `sparse_always`: campos que nunca se quitan (p. ej. el id).
+    """
+    sparse_columns = {}
+    sparse_related = {}
+    sparse_always = ('id',)
+    sparse_always_columns = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.selected_fields(self.context.get('request'))
+        for name in list(self.fields):
+            if name not in selected:
+                self.fields.pop(name)
+
+    @classmethod
+    def selected_fields(cls, request):
+        fields, omit = parse_fieldset(request)
+        names = list(cls.Meta.fields)
+        return [
+            name for name in names
+            if name in cls.sparse_always
+            or ((fields is None or name in fields) and name not in omit)
+        ]
+
+    @classmethod
+    def prune_queryset(cls, queryset, request):
+        """Aplica select_related y only() según los campos que se van a serializar."""
+        columns = set(cls.sparse_always_columns)
+        related = set()
+        for name in cls.selected_fields(request):
+            columns.update(cls.sparse_columns.get(name, (name,)))
+            if name in cls.sparse_related:
+                related.add(cls.sparse_related[name])
+        if related:
+            queryset = queryset.select_related(*sorted(related))
+        return queryset.only(*sorted(columns))
+
+
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ('id', 'name')
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     category_name = serializers.SerializerMethodField()
     organizer_username = serializers.CharField(source='organizer.user.username', read_only=True) 
     cover_url = serializers.URLField(required=False, allow_null=True, allow_blank=True)
+    # Calculado desde los agregados persistidos en Event (sin JOIN por petición)
     average_rating = serializers.FloatField(read_only=True)
+    # None si el evento no tiene capacidad
+    seats_left = serializers.IntegerField(read_only=True)
+    # Sólo aparece cuando se filtra con ?near=
+    distance_km = serializers.FloatField(read_only=True)
+
+    # Columnas/JOINs que necesita cada campo (ver SparseFieldsetMixin)
+    sparse_columns = {
+        'organizer_username': ('organizer', 'organizer__user__username'),
+        'category_name': ('category', 'category__name'),
+        'average_rating': ('rating_sum', 'rating_count'),
+        'seats_left': ('capacity', 'seats_taken'),
+        'distance_km': (),
+    }
+    sparse_related = {
+        'organizer_username': 'organizer__user',
+        'category_name': 'category',
+    }
+    # start_time e id son la clave de orden y de la paginación por cursor
+    sparse_always_columns = ('id', 'start_time')
 
     def get_category_name(self, obj):
         return obj.category.name if obj.category else None
@@ -22,14 +103,27 @@ class EventSerializer(serializers.ModelSerializer):
             'id', 'organizer', 'organizer_username', 'title', 'description', 
             'category', 'category_name', 'location', 'start_time', 'end_time', 
             'capacity', 'is_public', 'cover_url', 'created_at', 'updated_at',
-            'average_rating'
+            'average_rating', 'seats_left', 'latitude', 'longitude', 'distance_km'
         ]
         read_only_fields = ['id', 'organizer', 'organizer_username', 'created_at', 'updated_at']
 
-class EventRegistrationSerializer(serializers.ModelSerializer):
+class EventRegistrationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user_username = serializers.SerializerMethodField()
     user_full_name = serializers.SerializerMethodField()
     user_email = serializers.SerializerMethodField()
+
+    sparse_columns = {
+        'user_username': ('user', 'user__user__username'),
+        'user_full_name': ('user',),
+        'user_email': ('user', 'user__user__email'),
+    }
+    sparse_related = {
+        'user_username': 'user__user',
+        'user_full_name': 'user',
+        'user_email': 'user__user',
+    }
+    # created_at e id son la clave de la paginación por cursor del roster
+    sparse_always_columns = ('id', 'created_at')
     
     def get_user_username(self, obj):
         """Get username from the related User model through Profile."""
@@ -65,7 +159,12 @@ class EventRegistrationSerializer(serializers.ModelSerializer):
             "user_username", "user_full_name", "user_email",
             "created_at", "updated_at"
         ]
-        read_only_fields = ['id', 'user', 'created_at', 'updated_at']
+        # El evento y el estado cambian sólo por las acciones (join, cancelación,
+        # asistencia), que llevan la cuenta de cupos (ver seats.py); la calificación
+        # sólo por `rate`, que ajusta los agregados del evento (ver ratings.py)
+        read_only_fields = [
+            'id', 'event', 'user', 'rating', 'comment', 'status', 'created_at', 'updated_at'
+        ]
 
 class UserProfileSerializer(serializers.ModelSerializer):
     class Meta:
@@ -77,4 +176,4 @@ class EventCommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = EventRegistration
-        fields = ['id', 'user_name', 'rating', 'comment', 'created_at']
\ No newline at end of file
+        fields = ['id', 'user_name', 'rating', 'comment', 'commented_at', 'created_at']
\ No newline at end of file
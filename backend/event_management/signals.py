@@ -0,0 +1,130 @@
+# backend/event_management/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import bump_generation
+from .live import publish_on_commit
+from .models import Category, Event, EventRegistration, NotificationKind, RegistrationStatus, UserEventTimeline
+from .notifications import EVENT_NOTIFIED_FIELDS, fan_out_event, notify
+from .ratings import apply_rating_change
+from .search import get_search_backend
+from .seats import SEATED_STATUSES, seat_freed
+from .timeline import sync_category, sync_event, sync_registration
+
+
+@receiver(post_delete, sender=EventRegistration)
+def remove_rating_on_registration_delete(sender, instance, **kwargs):
+    # Se ejecuta dentro de la transacción del delete
+    if instance.rating is not None:
+        apply_rating_change(instance.event_id, instance.rating, None)
+
+
+@receiver(post_delete, sender=EventRegistration)
+def free_seat_on_registration_delete(sender, instance, **kwargs):
+    # Dentro de la misma transacción: el cupo pasa al primero en lista de espera
+    if instance.status in SEATED_STATUSES:
+        seat_freed(instance.event_id)
+    else:
+        # Sin cupo no cambia seats_taken: marcar el evento para los rollups (ver rollups.py)
+        Event.objects.filter(pk=instance.event_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=EventRegistration)
+def sync_timeline_on_registration_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_registration(instance)
+
+
+@receiver(post_save, sender=Event)
+def sync_timeline_on_event_save(sender, instance, created=False, raw=False, **kwargs):
+    # Un evento recién creado todavía no tiene inscripciones
+    if not raw and not created:
+        sync_event(instance.pk)
+
+
+@receiver(post_save, sender=Category)
+def sync_timeline_on_category_save(sender, instance, created=False, raw=False, **kwargs):
+    if not raw and not created:
+        sync_category(instance)
+
+
+@receiver(pre_delete, sender=Category)
+def clear_timeline_category(sender, instance, **kwargs):
+    # Después del delete el SET_NULL ya borró la referencia
+    UserEventTimeline.objects.filter(event_category_id=instance.pk).update(event_category_name=None)
+
+
+@receiver(post_save, sender=EventRegistration)
+def notify_new_registration(sender, instance, created=False, raw=False, **kwargs):
+    if raw or not created:
+        return
+    if instance.status == RegistrationStatus.WAITLISTED:
+        notify(instance.user_id, NotificationKind.WAITLISTED, instance.event)
+    elif instance.status == RegistrationStatus.REGISTERED:
+        notify(instance.user_id, NotificationKind.REGISTERED, instance.event)
+
+
+def notified_values(event):
+    return tuple(getattr(event, name) for name in EVENT_NOTIFIED_FIELDS)
+
+
+@receiver(pre_save, sender=Event)
+def remember_notified_values(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Valores guardados antes del save, para avisar sólo si cambió algo visible
+    instance._notified_before = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not set(update_fields) & set(EVENT_NOTIFIED_FIELDS):
+        return
+    instance._notified_before = (
+        Event.objects.filter(pk=instance.pk).values_list(*EVENT_NOTIFIED_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=Event)
+def notify_event_update(sender, instance, created=False, raw=False, **kwargs):
+    if raw or created:
+        return
+    before = getattr(instance, "_notified_before", None)
+    if before is not None and before != notified_values(instance):
+        # Un INSERT por bloque de inscritos (ver notifications.py)
+        fan_out_event(instance, NotificationKind.EVENT_UPDATED)
+
+
+@receiver(pre_delete, sender=Event)
+def notify_event_deletion(sender, instance, **kwargs):
+    # Antes del borrado en cascada de las inscripciones; sin referencia al evento
+    fan_out_event(instance, NotificationKind.EVENT_CANCELLED, keep_event=False)
+
+
+@receiver(post_save, sender=Event)
+def index_event_for_search(sender, instance, raw=False, **kwargs):
+    if not raw:
+        get_search_backend().index_event(instance)
+
+
+@receiver(post_delete, sender=Event)
+def remove_event_from_search(sender, instance, **kwargs):
+    get_search_backend().remove_event(instance.pk)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=EventRegistration)
+@receiver(post_delete, sender=EventRegistration)
+def publish_live_update(sender, instance, raw=False, **kwargs):
+    # Suscriptores de /api/events/live/ (ver live.py)
+    if not raw:
+        publish_on_commit(instance.pk if sender is Event else instance.event_id)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=EventRegistration)
+@receiver(post_delete, sender=EventRegistration)
+def invalidate_public_cache(sender, **kwargs):
+    # Tras el commit, para no volver a cachear datos que aún no son visibles
+    transaction.on_commit(bump_generation)
@@ -0,0 +1,18 @@
+# backend/event_management/test_runner.py
+"""
+Runner de `manage.py test` (TEST_RUNNER en settings.py).
+
+Activa QueryBudgetMiddleware en modo estricto mientras corren los tests: una
+petición que excede el presupuesto de su vista lanza QueryBudgetExceeded y el
+test falla, en lugar de sólo dejar un warning en el log.
+"""
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class QueryBudgetTestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        # El middleware lee estos settings al crear la cadena de cada cliente de prueba
+        settings.QUERY_BUDGET_ENABLED = True
+        settings.QUERY_BUDGET_STRICT = True
@@ -1,3 +1,1157 @@
-from django.test import TestCase
+import asyncio
+import csv
+import gzip
+import io
+import json
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import skipIf, skipUnless
+from unittest.mock import patch
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test import AsyncClient, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .exports import EXPORT_TABLES, csv_gzip_chunks, export_chunks, parquet_chunks, pq
+from .live import CacheBroker, InProcessBroker, LiveHub, Subscriber, get_broker, issue_ticket
+from .models import (
+    Category, CheckInScan, Event, EventRegistration, Notification, NotificationKind, RegistrationStatus,
+    ReportJob, ReportJobStatus, UserEventTimeline,
+)
+from .query_budget import QueryBudgetExceeded
+from .report_jobs import FAILED_MESSAGE, JOB_TIMEOUT, claim_next, run_job, submit
+from .reports import build_admin_report
+from .rollups import refresh_rollups
+from .seats import SEATED_STATUSES, AlreadyRegistered, join_event, rebuild_seat_counts
+from .trends import TrendsError, build_trends
+from .views import EventRegistrationViewSet, EventViewSet
+
+
+def create_event(organizer, **kwargs):
+    kwargs.setdefault("title", "Evento de prueba")
+    kwargs.setdefault("start_time", timezone.now() + timedelta(days=1))
+    kwargs.setdefault("category", Category.objects.get_or_create(name="Cultural")[0])
+    return Event.objects.create(organizer=organizer.profile, **kwargs)
+
+
+def api_client(user=None):
+    client = APIClient()
+    if user is not None:
+        client.force_authenticate(user)
+    return client
+
+
+def jwt_client(user):
+    # Autenticación real: los presupuestos de consultas la incluyen
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+    return client
+
+
+class EventTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user("organizer", "organizer@example.com", "pw")
+        self.users = [
+            User.objects.create_user(f"user_{i}", f"user{i}@example.com", "pw") for i in range(5)
+        ]
+
+
+class SeatAccountingTests(EventTestCase):
+    def test_stale_save_keeps_seat_counter(self):
+        event = create_event(self.organizer, capacity=2)
+        stale = Event.objects.get(pk=event.pk)
+        join_event(event, self.users[0].profile)
+        join_event(event, self.users[1].profile)
+
+        # Un save() completo con la instancia leída antes de las inscripciones
+        stale.title = "Título editado"
+        stale.save()
+
+        event.refresh_from_db()
+        self.assertEqual(event.title, "Título editado")
+        self.assertEqual(event.seats_taken, 2)
+        self.assertEqual(join_event(event, self.users[2].profile).status, RegistrationStatus.WAITLISTED)
+
+    def test_stale_update_through_api_keeps_seat_counter(self):
+        event = create_event(self.organizer, capacity=1)
+        join_event(event, self.users[0].profile)
+
+        response = api_client(self.organizer).patch(
+            f"/api/events/{event.pk}/", {"title": "Otro título"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        event.refresh_from_db()
+        self.assertEqual(event.seats_taken, 1)
+        self.assertEqual(response.data["seats_left"], 0)
+
+    def test_capacity_increase_promotes_waitlist_in_order(self):
+        event = create_event(self.organizer, capacity=1)
+        registrations = [join_event(event, user.profile) for user in self.users]
+        self.assertEqual(
+            [registration.status for registration in registrations],
+            [RegistrationStatus.REGISTERED] + [RegistrationStatus.WAITLISTED] * 4,
+        )
+
+        response = api_client(self.organizer).patch(
+            f"/api/events/{event.pk}/", {"capacity": 3}, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data["seats_left"], 0)
+
+        statuses = [EventRegistration.objects.get(pk=registration.pk).status for registration in registrations]
+        self.assertEqual(statuses, [RegistrationStatus.REGISTERED] * 3 + [RegistrationStatus.WAITLISTED] * 2)
+        event.refresh_from_db()
+        self.assertEqual(event.seats_taken, 3)
+        self.assertEqual(self.users[1].profile.notifications.filter(kind="promoted").count(), 1)
+
+    def test_full_event_waitlists(self):
+        event = create_event(self.organizer, capacity=2)
+        statuses = [join_event(event, user.profile).status for user in self.users[:3]]
+        self.assertEqual(statuses, [RegistrationStatus.REGISTERED] * 2 + [RegistrationStatus.WAITLISTED])
+
+        response = api_client(self.users[3]).post(f"/api/events/{event.pk}/join/")
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.data["status"], RegistrationStatus.WAITLISTED)
+        with self.assertRaises(AlreadyRegistered):
+            join_event(event, self.users[0].profile)
+
+        event.refresh_from_db()
+        self.assertEqual(event.seats_taken, 2)
+
+    def test_freed_seat_promotes_oldest_waitlisted(self):
+        event = create_event(self.organizer, capacity=1)
+        registrations = [join_event(event, user.profile) for user in self.users[:3]]
+
+        registrations[0].delete()
+        statuses = [
+            EventRegistration.objects.get(pk=registration.pk).status for registration in registrations[1:]
+        ]
+        self.assertEqual(statuses, [RegistrationStatus.REGISTERED, RegistrationStatus.WAITLISTED])
+        self.assertEqual(self.users[1].profile.notifications.filter(kind="promoted").count(), 1)
+
+        # Cancelar desde la API también pasa el cupo al siguiente en la lista
+        response = api_client(self.users[1]).delete(f"/api/users/cancel-registration/{registrations[1].pk}/")
+        self.assertEqual(response.status_code, 200, response.content)
+        registrations[2].refresh_from_db()
+        self.assertEqual(registrations[2].status, RegistrationStatus.REGISTERED)
+        event.refresh_from_db()
+        self.assertEqual(event.seats_taken, 1)
+
+    def test_deleted_registration_releases_seat(self):
+        event = create_event(self.organizer, capacity=2)
+        registrations = [join_event(event, user.profile) for user in self.users[:3]]
+
+        # En espera: no ocupa cupo
+        registrations[2].delete()
+        event.refresh_from_db()
+        self.assertEqual(event.seats_taken, 2)
+
+        registrations[0].delete()
+        event.refresh_from_db()
+        self.assertEqual(event.seats_taken, 1)
+        self.assertEqual(join_event(event, self.users[3].profile).status, RegistrationStatus.REGISTERED)
+        # El contador coincide con las inscripciones: no hay nada que reparar
+        self.assertEqual(rebuild_seat_counts([event.pk]), 0)
+
+    def test_registration_event_and_status_are_read_only(self):
+        event = create_event(self.organizer, capacity=1)
+        other = create_event(self.organizer, capacity=5)
+        registration = join_event(event, self.users[0].profile)
+        join_event(event, self.users[1].profile)
+
+        response = api_client(self.users[0]).patch(
+            f"/api/registrations/{registration.pk}/",
+            {"event": str(other.pk), "status": RegistrationStatus.CANCELLED},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        registration.refresh_from_db()
+        self.assertEqual(registration.event_id, event.pk)
+        self.assertEqual(registration.status, RegistrationStatus.REGISTERED)
+        other.refresh_from_db()
+        self.assertEqual(other.seats_taken, 0)
+
+    def test_registrations_are_created_only_through_join(self):
+        event = create_event(self.organizer, capacity=1)
+        response = api_client(self.users[0]).post(
+            "/api/registrations/", {"event": str(event.pk)}, format="json"
+        )
+        self.assertEqual(response.status_code, 405)
+        self.assertFalse(EventRegistration.objects.exists())
+
+
+class ConcurrentJoinTests(TransactionTestCase):
+    """
+    Muchos hilos se inscriben a la vez (y repiten la inscripción) en un evento con
+    poca capacidad; luego se cancelan inscripciones en paralelo. Los hilos
+    necesitan datos confirmados, por eso TransactionTestCase.
+    """
+    users = 20
+    capacity = 5
+    cancel = 3
+
+    def setUp(self):
+        self.organizer = User.objects.create_user("stress_organizer", "stress@example.com")
+        self.profiles = [
+            User.objects.create_user(f"stress_user_{i}", f"stress{i}@example.com").profile
+            for i in range(self.users)
+        ]
+        self.event = create_event(self.organizer, capacity=self.capacity)
+
+    def parallel(self, targets):
+        barrier = threading.Barrier(len(targets))
+        results = []
+        lock = threading.Lock()
+
+        def worker(target):
+            try:
+                barrier.wait()
+                outcome = target()
+            except AlreadyRegistered:
+                outcome = "duplicada"
+            except DatabaseError as exc:
+                outcome = f"error: {exc}"
+            finally:
+                connection.close()
+            with lock:
+                results.append(outcome)
+
+        threads = [threading.Thread(target=worker, args=(target,)) for target in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def assert_seats_consistent(self):
+        self.event.refresh_from_db()
+        seated = EventRegistration.objects.filter(event=self.event, status__in=SEATED_STATUSES).count()
+        registered = EventRegistration.objects.filter(event=self.event).count()
+        self.assertLessEqual(seated, self.capacity)
+        # Tampoco puede quedar un cupo libre con gente en espera
+        self.assertEqual(seated, min(self.capacity, registered))
+        self.assertEqual(self.event.seats_taken, seated)
+
+    def test_concurrent_joins_and_cancellations(self):
+        # Cada usuario intenta inscribirse dos veces a la vez
+        targets = []
+        for profile in self.profiles:
+            targets.append(lambda profile=profile: join_event(self.event, profile).status)
+            targets.append(lambda profile=profile: join_event(self.event, profile).status)
+        results = self.parallel(targets)
+
+        self.assertEqual([result for result in results if result.startswith("error")], [])
+        self.assertEqual(results.count(RegistrationStatus.REGISTERED), self.capacity)
+        self.assertEqual(results.count(RegistrationStatus.WAITLISTED), self.users - self.capacity)
+        self.assertEqual(results.count("duplicada"), self.users)
+        self.assert_seats_consistent()
+
+        seated = list(
+            EventRegistration.objects.filter(event=self.event, status__in=SEATED_STATUSES)[:self.cancel]
+        )
+        waitlist = list(
+            EventRegistration.objects.filter(event=self.event, status=RegistrationStatus.WAITLISTED)
+            .order_by("created_at", "id")
+            .values_list("id", flat=True)
+        )
+        self.parallel([lambda registration=registration: registration.delete() for registration in seated])
+
+        promoted = set(
+            EventRegistration.objects.filter(id__in=waitlist, status__in=SEATED_STATUSES)
+            .values_list("id", flat=True)
+        )
+        self.assertEqual(promoted, set(waitlist[:self.cancel]))
+        self.assert_seats_consistent()
+
+
+class DetailLookupTests(EventTestCase):
+    def test_malformed_pk_returns_404(self):
+        create_event(self.organizer)
+        client = api_client()
+        for url in ("/api/events/no-es-un-uuid/", "/api/categories/abc/"):
+            self.assertEqual(client.get(url).status_code, 404, url)
+        self.assertEqual(client.get("/api/events/00000000-0000-0000-0000-000000000000/").status_code, 404)
+
+    def test_detail_sends_validators(self):
+        event = create_event(self.organizer)
+        client = api_client()
+        response = client.get(f"/api/events/{event.pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(client.get(f"/api/events/{event.pk}/", HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+
+
+class RatingTests(EventTestCase):
+    def test_rating_is_written_only_through_rate(self):
+        event = create_event(self.organizer)
+        registration = join_event(event, self.users[0].profile)
+        client = api_client(self.users[0])
+
+        response = client.patch(f"/api/registrations/{registration.pk}/rate/", {"rating": 4, "comment": "Bien"}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        # La actualización genérica ignora rating y comment
+        response = client.patch(f"/api/registrations/{registration.pk}/", {"rating": 1, "comment": "x"}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data["rating"], 4)
+
+        registration.refresh_from_db()
+        self.assertEqual((registration.rating, registration.comment), (4, "Bien"))
+        event.refresh_from_db()
+        self.assertEqual((event.rating_sum, event.rating_count, event.rating_hist_4), (4, 1, 1))
+
+        client.patch(f"/api/registrations/{registration.pk}/rate/", {"rating": 2}, format="json")
+        event.refresh_from_db()
+        self.assertEqual((event.rating_sum, event.rating_count, event.rating_hist_4, event.rating_hist_2), (2, 1, 0, 1))
+
+
+
+# Caché nula: se mide el peor caso (miss), como check_query_budgets
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}})
+class QueryBudgetTests(EventTestCase):
+    def seed(self, n_events):
+        for i in range(n_events):
+            event = create_event(self.organizer, title=f"Evento {i}", capacity=10)
+            for user in self.users:
+                registration = join_event(event, user.profile)
+                registration.rating = 4
+                registration.comment = "Comentario"
+                registration.save(update_fields=["rating", "comment"])
+        return event
+
+    def assert_queries(self, count, client, url, budget):
+        """`count` consultas con pocos y con más datos, sin pasar el presupuesto de la acción."""
+        self.assertLessEqual(count, budget)
+        for n_events in (2, 6):
+            self.seed(n_events)
+            with self.assertNumQueries(count):
+                response = client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+
+    def test_event_list(self):
+        budget = EventViewSet.query_budgets["list"]
+        # validadores + eventos (+ usuario del token)
+        self.assert_queries(2, api_client(), "/api/events/", budget)
+        self.assert_queries(3, jwt_client(self.users[0]), "/api/events/", budget)
+        # + perfil para ?mine
+        self.assert_queries(4, jwt_client(self.organizer), "/api/events/?mine=true&page_size=3", budget)
+
+    def test_event_retrieve(self):
+        event = self.seed(1)
+        budget = EventViewSet.query_budgets["retrieve"]
+        self.assert_queries(2, api_client(), f"/api/events/{event.pk}/", budget)
+        self.assert_queries(3, jwt_client(self.users[0]), f"/api/events/{event.pk}/", budget)
+
+    def test_my_events(self):
+        budget = EventRegistrationViewSet.query_budgets["my_events"]
+        client = jwt_client(self.users[0])
+        self.assert_queries(3, client, "/api/registrations/my_events/", budget)
+        self.assert_queries(3, client, "/api/registrations/my_events/?page_size=2", budget)
+
+    def test_sparse_roster(self):
+        event = self.seed(1)
+        budget = EventViewSet.query_budgets["registrations"]
+        client = jwt_client(self.organizer)
+        for fast in (True, False):
+            with self.settings(EVENT_FAST_SERIALIZATION=fast):
+                for query in ("", "?fields=id,user_username,rating", "?omit=event&page_size=2"):
+                    self.assert_queries(3, client, f"/api/events/{event.pk}/registrations/{query}", budget)
+
+    def test_exceeded_budget_fails_request(self):
+        event = self.seed(1)
+        client = jwt_client(self.users[0])
+        self.assertTrue(settings.QUERY_BUDGET_STRICT)
+        with patch.dict(EventViewSet.query_budgets, {"retrieve": 1}):
+            with self.assertLogs("event_management.query_budget", "WARNING"), self.assertRaises(QueryBudgetExceeded):
+                client.get(f"/api/events/{event.pk}/")
+        response = client.get(f"/api/events/{event.pk}/")
+        self.assertEqual((response["X-Query-Count"], response["X-Query-Budget"]), ("3", "3"))
+
+    def test_all_endpoints_within_budget(self):
+        call_command("check_query_budgets", stdout=StringIO())
+
+
+class CheckInTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = create_event(self.organizer, capacity=3)
+        self.registrations = [join_event(self.event, user.profile) for user in self.users[:4]]
+        self.client = api_client(self.organizer)
+        self.url = f"/api/events/{self.event.pk}/check_in/"
+
+    def scan(self, scan_id, registration, **extra):
+        return {
+            "scan_id": scan_id,
+            "registration_id": str(registration.pk),
+            "scanned_at": timezone.now().isoformat(),
+            **extra,
+        }
+
+    def test_double_check_in_is_idempotent(self):
+        batch = {"device_id": "puerta-1", "scans": [
+            self.scan("s1", self.registrations[0]),
+            self.scan("s2", self.registrations[1]),
+            # Lista de espera: no se acepta
+            self.scan("s3", self.registrations[3]),
+            self.scan("s4", self.registrations[0], scanned_at="no-es-fecha"),
+        ]}
+        first = self.client.post(self.url, batch, format="json")
+        self.assertEqual(first.status_code, 200, first.content)
+        self.assertEqual(first.data["accepted"], ["s1", "s2"])
+
+        # Reenvío del mismo lote y una segunda lectura de la misma persona
+        again = self.client.post(self.url, batch, format="json")
+        self.assertEqual(again.data["accepted"], ["s1", "s2"])
+        other_scan = self.client.post(self.url, {"scans": [self.scan("s5", self.registrations[0])]}, format="json")
+        self.assertEqual(other_scan.data["accepted"], ["s5"])
+
+        self.assertEqual(CheckInScan.objects.filter(event=self.event).count(), 3)
+        statuses = [EventRegistration.objects.get(pk=registration.pk).status for registration in self.registrations]
+        self.assertEqual(statuses, [
+            RegistrationStatus.ATTENDED, RegistrationStatus.ATTENDED,
+            RegistrationStatus.REGISTERED, RegistrationStatus.WAITLISTED,
+        ])
+        self.assertEqual(
+            UserEventTimeline.objects.get(registration=self.registrations[0]).registration_status,
+            RegistrationStatus.ATTENDED,
+        )
+        self.assertEqual(CheckInScan.objects.get(scan_id="s1").device_id, "puerta-1")
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken, 3)
+
+    def test_only_organizer_can_check_in(self):
+        response = api_client(self.users[0]).post(
+            self.url, {"scans": [self.scan("s1", self.registrations[0])]}, format="json"
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.client.post(self.url, {"scans": "s1"}, format="json").status_code, 400)
+        self.assertFalse(CheckInScan.objects.exists())
+
+
+class BulkStatusTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = create_event(self.organizer, capacity=3)
+        self.registrations = [join_event(self.event, user.profile) for user in self.users[:4]]
+        self.client = api_client(self.organizer)
+        self.url = f"/api/events/{self.event.pk}/bulk_status/"
+
+    def test_by_registration_id(self):
+        registration_ids = [str(registration.pk) for registration in self.registrations]
+        response = self.client.post(self.url, {
+            "status": RegistrationStatus.CONFIRMED,
+            "registration_ids": registration_ids + ["no-es-uuid", "00000000-0000-0000-0000-000000000000"],
+        }, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            [item["result"] for item in response.data["results"]],
+            ["updated", "updated", "updated", "skipped", "invalid", "not_found"],
+        )
+        self.assertEqual(response.data["summary"], {
+            "updated": 3, "unchanged": 0, "skipped": 1, "not_found": 1, "invalid": 1,
+        })
+
+        again = self.client.post(self.url, {
+            "status": RegistrationStatus.CONFIRMED, "registration_ids": registration_ids[:1],
+        }, format="json")
+        self.assertEqual(again.data["results"], [{"id": registration_ids[0], "result": "unchanged"}])
+
+        statuses = [EventRegistration.objects.get(pk=registration.pk).status for registration in self.registrations]
+        self.assertEqual(statuses, [RegistrationStatus.CONFIRMED] * 3 + [RegistrationStatus.WAITLISTED])
+        self.assertEqual(
+            UserEventTimeline.objects.get(registration=self.registrations[1]).registration_status,
+            RegistrationStatus.CONFIRMED,
+        )
+        self.assertEqual(self.users[0].profile.notifications.filter(kind="status_changed").count(), 1)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_taken, 3)
+
+    def test_by_user_id(self):
+        response = self.client.post(self.url, {
+            "status": RegistrationStatus.ATTENDED,
+            "user_ids": [self.users[0].pk, str(self.users[1].pk), self.organizer.pk, "x"],
+        }, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            [item["result"] for item in response.data["results"]],
+            ["updated", "updated", "not_found", "invalid"],
+        )
+        self.assertEqual(EventRegistration.objects.get(pk=self.registrations[1].pk).status, RegistrationStatus.ATTENDED)
+
+    def test_rejected_requests(self):
+        ids = [str(self.registrations[0].pk)]
+        cases = [
+            (api_client(self.users[0]), {"status": "confirmed", "registration_ids": ids}, 403),
+            # Cancelar o pasar a espera cambiaría los cupos: no se permite en masa
+            (self.client, {"status": "cancelled", "registration_ids": ids}, 400),
+            (self.client, {"status": "waitlisted", "registration_ids": ids}, 400),
+            (self.client, {"status": "confirmed", "registration_ids": []}, 400),
+            (self.client, {"status": "confirmed"}, 400),
+        ]
+        for client, data, expected in cases:
+            self.assertEqual(client.post(self.url, data, format="json").status_code, expected, data)
+        self.assertEqual(EventRegistration.objects.get(pk=self.registrations[0].pk).status, RegistrationStatus.REGISTERED)
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}})
+class FastSerializerTests(EventTestCase):
+    """La ruta rápida desde .values() debe producir el mismo JSON que los serializers DRF."""
+
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        for i in range(6):
+            event = create_event(
+                self.organizer,
+                title=f"Evento {i}",
+                description="Descripción",
+                category=None if i % 3 == 0 else Category.objects.get_or_create(name="Cultural")[0],
+                location="Bogotá",
+                start_time=now + timedelta(days=i, microseconds=i * 1234),
+                end_time=now + timedelta(days=i, hours=2) if i % 2 else None,
+                capacity=None if i % 4 == 0 else 2,
+                latitude=4.60 + i / 100 if i % 2 == 0 else None,
+                longitude=-74.08 if i % 2 == 0 else None,
+            )
+            for j, user in enumerate(self.users[:3]):
+                registration = join_event(event, user.profile)
+                if j:
+                    api_client(user).patch(
+                        f"/api/registrations/{registration.pk}/rate/",
+                        {"rating": (i + j) % 5 + 1, "comment": "Muy bueno" if j % 2 else None},
+                        format="json",
+                    )
+        self.event = event
+
+    def assert_same_output(self, client, urls):
+        for url in urls:
+            responses = []
+            for fast in (True, False):
+                with self.settings(EVENT_FAST_SERIALIZATION=fast):
+                    response = client.get(url)
+                self.assertEqual(response.status_code, 200, (url, response.content))
+                responses.append(response.content)
+            self.assertEqual(responses[0], responses[1], url)
+
+    def test_event_list(self):
+        urls = [
+            "/api/events/",
+            "/api/events/?page_size=2",
+            "/api/events/?fields=id,title,start_time,average_rating,seats_left",
+            "/api/events/?fields=id,category_name,organizer_username",
+            "/api/events/?omit=description,cover_url",
+            "/api/events/?omit=id",
+            "/api/events/?near=4.6,-74.08&radius_km=50",
+            "/api/events/?near=4.6,-74.08&radius_km=50&fields=id,distance_km",
+            "/api/events/?near=4.6,-74.08&radius_km=50&omit=distance_km",
+        ]
+        self.assert_same_output(api_client(), urls)
+        self.assert_same_output(api_client(self.organizer), ["/api/events/?mine=true", "/api/events/?omit=title"])
+        self.assertEqual(len(api_client().get("/api/events/?near=4.6,-74.08&radius_km=50").data), 3)
+
+    def test_registration_roster(self):
+        base = f"/api/events/{self.event.pk}/registrations/"
+        self.assert_same_output(api_client(self.organizer), [
+            base,
+            f"{base}?page_size=2",
+            f"{base}?fields=id,user_username,rating",
+            f"{base}?omit=user_email,comment",
+        ])
+
+
+class AdminReportRollupTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        event = create_event(self.organizer, capacity=10)
+        for user in self.users[:3]:
+            join_event(event, user.profile)
+
+    def test_fresh_rollups_are_used(self):
+        refresh_rollups()
+        stats = build_admin_report("all")["stats"]
+        self.assertEqual((stats["source"], stats["stale"], stats["totalRegistrations"]), ("rollups", False, 3))
+
+    def test_stale_rollups_fall_back_to_live(self):
+        refresh_rollups()
+        join_event(Event.objects.get(), self.users[3].profile)
+        later = timezone.now() + timedelta(hours=1)
+
+        with self.assertLogs("event_management.reports", "WARNING"):
+            stats = build_admin_report("all", now=later)["stats"]
+        self.assertEqual((stats["source"], stats["stale"], stats["totalRegistrations"]), ("live", False, 4))
+
+        # Forzando los rollups se marcan como desactualizados
+        stats = build_admin_report("all", now=later, source="rollups")["stats"]
+        self.assertEqual((stats["source"], stats["stale"], stats["totalRegistrations"]), ("rollups", True, 3))
+
+        with self.settings(ADMIN_REPORT_ROLLUP_MAX_AGE=2 * 3600):
+            self.assertEqual(build_admin_report("all", now=later)["stats"]["source"], "rollups")
+
+
+    def comparable(self, period, source, now):
+        report = build_admin_report(period, now=now, source=source)
+        for name in ("source", "dataAsOf", "stale"):
+            report["stats"].pop(name)
+        return report
+
+    def assert_rollups_match_live(self, now):
+        for period in ("today", "week", "month", "all"):
+            with self.subTest(period=period):
+                self.assertEqual(self.comparable(period, "rollups", now), self.comparable(period, "live", now))
+
+    def test_rollups_match_live_sections(self):
+        now = timezone.now()
+        sports = Category.objects.get_or_create(name="Deportivo")[0]
+        events = [
+            create_event(self.organizer, title="Hoy", start_time=now - timedelta(minutes=30), capacity=2),
+            create_event(self.organizer, title="Semana", start_time=now - timedelta(days=3), category=sports),
+            create_event(self.organizer, title="Mes", start_time=now - timedelta(days=20), category=None),
+            create_event(self.organizer, title="Antiguo", start_time=now - timedelta(days=90)),
+        ]
+        for i, event in enumerate(events):
+            for user in self.users[:i + 2]:
+                join_event(event, user.profile)
+        EventRegistration.objects.filter(event=events[1], user=self.users[0].profile).update(
+            status=RegistrationStatus.ATTENDED, updated_at=now
+        )
+        refresh_rollups()
+        self.assert_rollups_match_live(now)
+
+        # Tras cambios, el refresco incremental vuelve a coincidir
+        EventRegistration.objects.filter(event=events[0]).first().delete()
+        events[2].start_time = now - timedelta(days=2)
+        events[2].save()
+        events[3].delete()
+        refresh_rollups()
+        self.assert_rollups_match_live(now)
+
+    def test_missing_watermark_uses_live(self):
+        stats = build_admin_report("all")["stats"]
+        self.assertEqual((stats["source"], stats["totalRegistrations"]), ("live", 3))
+        with self.assertRaises(ValueError):
+            build_admin_report("all", source="rollups")
+
+class ReportJobTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admins = []
+        for user in self.users[:2]:
+            user.profile.role = "admin"
+            user.profile.save(update_fields=["role"])
+            self.admins.append(user)
+
+    def test_submit_reuses_pending_job_of_same_admin(self):
+        first, created = submit("week", self.admins[0].profile)
+        self.assertTrue(created)
+        self.assertEqual(first.status, ReportJobStatus.QUEUED)
+        self.assertEqual(submit("week", self.admins[0].profile), (first, False))
+        self.assertEqual(submit("week", self.admins[0].profile, refresh=True), (first, False))
+        # Otro administrador u otro período: job propio
+        self.assertTrue(submit("week", self.admins[1].profile)[1])
+        self.assertTrue(submit("all", self.admins[0].profile)[1])
+
+    def test_claim_and_run(self):
+        older, _ = submit("week", self.admins[0].profile)
+        newer, _ = submit("all", self.admins[0].profile)
+
+        job = claim_next("worker-1")
+        self.assertEqual((job.pk, job.status, job.worker, job.attempts), (older.pk, ReportJobStatus.RUNNING, "worker-1", 1))
+        self.assertEqual(claim_next("worker-2").pk, newer.pk)
+        self.assertIsNone(claim_next("worker-3"))
+
+        self.assertEqual(run_job(job, lambda period: {"period": period}), ReportJobStatus.DONE)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result, job.error), (ReportJobStatus.DONE, {"period": "week"}, ""))
+        # Terminado dentro del TTL: se reutiliza; con refresh se recalcula
+        self.assertEqual(submit("week", self.admins[0].profile), (job, False))
+        self.assertTrue(submit("week", self.admins[0].profile, refresh=True)[1])
+
+    def test_failed_job_stores_generic_error(self):
+        submit("week", self.admins[0].profile)
+        job = claim_next("worker-1")
+
+        def build(period):
+            raise DatabaseError("no such table: event_management_secret")
+
+        with self.assertLogs("event_management.report_jobs", "ERROR"):
+            self.assertEqual(run_job(job, build), ReportJobStatus.FAILED)
+        response = api_client(self.admins[0]).get(f"/api/admin-reports/jobs/{job.pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["status"], response.data["error"]), (ReportJobStatus.FAILED, FAILED_MESSAGE))
+        self.assertNotIn("secret", response.content.decode())
+
+    def test_stale_job_is_reclaimed(self):
+        submit("week", self.admins[0].profile)
+        lost = claim_next("worker-1")
+        ReportJob.objects.filter(pk=lost.pk).update(started_at=timezone.now() - JOB_TIMEOUT * 2)
+
+        job = claim_next("worker-2")
+        self.assertEqual((job.pk, job.attempts), (lost.pk, 2))
+        # El worker que perdió el job no pisa el resultado
+        with self.assertLogs("event_management.report_jobs", "WARNING"):
+            run_job(lost, lambda period: {"stale": True})
+        run_job(job, lambda period: {"stale": False})
+        job.refresh_from_db()
+        self.assertEqual(job.result, {"stale": False})
+
+    def test_jobs_are_scoped_to_requesting_admin(self):
+        response = api_client(self.admins[0]).post("/api/admin-reports/jobs/", {"period": "week"}, format="json")
+        self.assertEqual(response.status_code, 202, response.content)
+        url = f"/api/admin-reports/jobs/{response.data['id']}/"
+
+        self.assertEqual(api_client(self.admins[0]).get(url).status_code, 200)
+        self.assertEqual(api_client(self.admins[1]).get(url).status_code, 404)
+        self.assertEqual(api_client(self.users[2]).get(url).status_code, 403)
+        response = api_client(self.admins[1]).post("/api/admin-reports/jobs/", {"period": "week"}, format="json")
+        self.assertNotEqual(f"/api/admin-reports/jobs/{response.data['id']}/", url)
+
+class TrendsTests(EventTestCase):
+    # Lunes, para que los intervalos semanales empiecen aquí
+    base = datetime(2026, 3, 2, tzinfo=dt_timezone.utc)
+
+    def setUp(self):
+        super().setUp()
+        cultural = create_event(self.organizer, title="Concierto")
+        sports = create_event(
+            self.organizer, title="Torneo", category=Category.objects.get_or_create(name="Deportivo")[0]
+        )
+        for user, event, offset, status in (
+            (self.users[0], cultural, timedelta(hours=1), RegistrationStatus.ATTENDED),
+            (self.users[1], cultural, timedelta(hours=1, minutes=30), RegistrationStatus.REGISTERED),
+            (self.users[2], sports, timedelta(hours=3), RegistrationStatus.CONFIRMED),
+            (self.users[3], sports, timedelta(days=2), RegistrationStatus.ATTENDED),
+            (self.users[4], cultural, timedelta(days=14, hours=1), RegistrationStatus.REGISTERED),
+        ):
+            registration = join_event(event, user.profile)
+            EventRegistration.objects.filter(pk=registration.pk).update(created_at=self.base + offset, status=status)
+        self.organizer.profile.role = "admin"
+        self.organizer.profile.save(update_fields=["role"])
+
+    def test_hour_buckets_fill_gaps(self):
+        trends = build_trends("hour", self.base, self.base + timedelta(hours=5))
+        self.assertEqual(len(trends["buckets"]), 5)
+        self.assertEqual(trends["buckets"][1], (self.base + timedelta(hours=1)).isoformat())
+        self.assertEqual(trends["series"], {
+            "registrations": [0, 2, 0, 1, 0],
+            "confirmed": [0, 0, 0, 1, 0],
+            "attended": [0, 1, 0, 0, 0],
+            # Sin inscripciones la tasa es 0, no una división por cero
+            "attendance_rate": [0, 50.0, 0, 0, 0],
+        })
+
+    def test_day_and_week_buckets(self):
+        trends = build_trends("day", self.base, self.base + timedelta(days=4))
+        self.assertEqual(trends["series"]["registrations"], [3, 0, 1, 0])
+
+        # El inicio se lleva al lunes de su semana
+        trends = build_trends("week", self.base + timedelta(days=3), self.base + timedelta(days=15))
+        self.assertEqual(trends["start"], self.base.isoformat())
+        self.assertEqual(trends["series"]["registrations"], [4, 0, 1])
+        self.assertEqual(trends["series"]["attendance_rate"], [50.0, 0, 0])
+
+    def test_by_category(self):
+        trends = build_trends("week", self.base, self.base + timedelta(days=21), by_category=True)
+        categories = {category["name"]: category["series"] for category in trends["categories"]}
+        self.assertEqual([category["name"] for category in trends["categories"]], ["Cultural", "Deportivo"])
+        self.assertEqual(categories["Cultural"]["registrations"], [2, 0, 1])
+        self.assertEqual(categories["Deportivo"]["attended"], [1, 0, 0])
+
+    def test_endpoint(self):
+        client = api_client(self.organizer)
+        response = client.get("/api/admin-reports/trends/", {"bucket": "day", "start": "2026-03-02", "end": "2026-03-05"})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data["series"]["registrations"], [3, 0, 1])
+        self.assertEqual(api_client(self.users[0]).get("/api/admin-reports/trends/").status_code, 403)
+
+    def test_invalid_parameters(self):
+        client = api_client(self.organizer)
+        for params in (
+            {"bucket": "month"},
+            {"start": "ayer"},
+            {"end": "2026-02-30"},
+            {"start": "2026-03-05", "end": "2026-03-02"},
+            {"bucket": "hour", "start": "2024-01-01", "end": "2026-01-01"},
+        ):
+            with self.subTest(params=params):
+                response = client.get("/api/admin-reports/trends/", params)
+                self.assertEqual(response.status_code, 400, response.content)
+                self.assertIn("error", response.data)
+        with self.assertRaises(TrendsError):
+            build_trends("day", self.base, self.base)
+
+class ExportTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = create_event(
+            self.organizer, capacity=10, latitude=4.6, longitude=-74.08,
+            metadata={"idioma": "español", "tags": ["música", 1]},
+        )
+        create_event(self.organizer, category=None)
+        self.registrations = [join_event(self.event, user.profile) for user in self.users]
+        self.organizer.profile.role = "admin"
+        self.organizer.profile.save(update_fields=["role"])
+
+    def read_csv(self, chunks):
+        return list(csv.DictReader(io.StringIO(gzip.decompress(b"".join(chunks)).decode("utf-8"))))
+
+    def test_csv_gzip_round_trip(self):
+        # Varios bloques: el resultado sigue siendo un único .csv.gz válido
+        rows = self.read_csv(csv_gzip_chunks("events", chunk_size=1))
+        self.assertEqual(list(rows[0]), list(EXPORT_TABLES["events"][1]))
+        row = next(row for row in rows if row["id"] == str(self.event.pk))
+        self.assertEqual(json.loads(row["metadata"]), {"idioma": "español", "tags": ["música", 1]})
+        self.assertEqual(
+            (row["organizer_id"], row["seats_taken"], row["latitude"], row["is_public"]),
+            (str(self.organizer.pk), "5", "4.6", "True"),
+        )
+        self.assertEqual(row["start_time"], self.event.start_time.isoformat())
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(next(row for row in rows if row["id"] != str(self.event.pk))["category_id"], "")
+
+        rows = self.read_csv(csv_gzip_chunks("registrations", chunk_size=2))
+        self.assertEqual({row["id"] for row in rows}, {str(registration.pk) for registration in self.registrations})
+
+    def test_endpoint_streams_csv(self):
+        response = api_client(self.organizer).get("/api/admin-reports/export/registrations/", {"format": "csv"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn(".csv.gz", response["Content-Disposition"])
+        self.assertEqual(len(self.read_csv(response.streaming_content)), 5)
+
+        client = api_client(self.organizer)
+        self.assertEqual(client.get("/api/admin-reports/export/users/").status_code, 404)
+        self.assertEqual(client.get("/api/admin-reports/export/events/", {"since": "ayer"}).status_code, 400)
+        self.assertEqual(api_client(self.users[0]).get("/api/admin-reports/export/events/").status_code, 403)
+
+    def test_incremental_since(self):
+        response = api_client(self.organizer).get("/api/admin-reports/export/registrations/", {"format": "csv"})
+        since = response["X-Export-Started-At"]
+        b"".join(response.streaming_content)
+
+        later = timezone.now() + timedelta(minutes=1)
+        EventRegistration.objects.filter(pk=self.registrations[1].pk).update(rating=5, updated_at=later)
+        response = api_client(self.organizer).get(
+            "/api/admin-reports/export/registrations/", {"format": "csv", "since": since}
+        )
+        rows = self.read_csv(response.streaming_content)
+        self.assertEqual([(row["id"], row["rating"]) for row in rows], [(str(self.registrations[1].pk), "5")])
+        self.assertEqual(self.read_csv(export_chunks("registrations", "csv", since=later + timedelta(seconds=1))), [])
+
+    @skipUnless(pq, "requiere pyarrow")
+    def test_parquet_schema(self):
+        table = pq.read_table(io.BytesIO(b"".join(parquet_chunks("events", chunk_size=1))))
+        schema = {field.name: str(field.type) for field in table.schema}
+        self.assertEqual(list(schema), list(EXPORT_TABLES["events"][1]))
+        self.assertEqual(
+            [schema[name] for name in ("id", "organizer_id", "category_id", "metadata", "latitude", "start_time")],
+            ["string", "int64", "int64", "string", "double", "timestamp[us, tz=UTC]"],
+        )
+        row = next(row for row in table.to_pylist() if row["id"] == str(self.event.pk))
+        self.assertEqual(json.loads(row["metadata"]), {"idioma": "español", "tags": ["música", 1]})
+        self.assertEqual((row["organizer_id"], row["start_time"]), (self.organizer.pk, self.event.start_time))
+
+        table = pq.read_table(io.BytesIO(b"".join(parquet_chunks("registrations", chunk_size=2))))
+        self.assertEqual(str(table.schema.field("event_id").type), "string")
+        self.assertEqual(set(table.column("event_id").to_pylist()), {str(self.event.pk)})
+        self.assertEqual(table.num_rows, 5)
+
+    @skipIf(pq, "pyarrow instalado")
+    def test_parquet_requires_pyarrow(self):
+        response = api_client(self.organizer).get("/api/admin-reports/export/events/", {"format": "parquet"})
+        self.assertEqual(response.status_code, 400)
+
+class CommentTests(EventTestCase):
+    def test_comments_ordered_by_comment_time(self):
+        event = create_event(self.organizer)
+        registrations = [join_event(event, user.profile) for user in self.users[:3]]
+
+        def rate(index, rating, comment):
+            response = api_client(self.users[index]).patch(
+                f"/api/registrations/{registrations[index].pk}/rate/",
+                {"rating": rating, "comment": comment}, format="json",
+            )
+            self.assertEqual(response.status_code, 200, response.content)
+
+        # El primero en inscribirse comenta al final
+        rate(2, 3, "Tercero en inscribirse")
+        rate(1, 4, "Segundo en inscribirse")
+        rate(0, 5, "Primero en inscribirse")
+        # Cambiar sólo la calificación no mueve el comentario
+        rate(2, 1, "Tercero en inscribirse")
+
+        response = api_client().get(f"/api/events/{event.pk}/comments/?page_size=2")
+        self.assertEqual(response.status_code, 200, response.content)
+        comments = [item["comment"] for item in response.data["results"]]
+        next_page = api_client().get(response.data["next"])
+        comments += [item["comment"] for item in next_page.data["results"]]
+        self.assertEqual(comments, ["Primero en inscribirse", "Segundo en inscribirse", "Tercero en inscribirse"])
+        self.assertEqual(response.data["summary"]["count"], 3)
+
+        # Borrar el comentario lo saca de la lista
+        rate(1, 4, "")
+        response = api_client().get(f"/api/events/{event.pk}/comments/")
+        self.assertEqual([item["comment"] for item in response.data["results"]], ["Primero en inscribirse", "Tercero en inscribirse"])
+
+
+class EventPaginationTests(EventTestCase):
+    def test_cursor_pagination_keeps_start_time_order(self):
+        for day in (3, 1, 2):
+            create_event(self.organizer, title=f"Día {day}", start_time=timezone.now() + timedelta(days=day))
+        client = api_client()
+        first = client.get("/api/events/?page_size=2")
+        second = client.get(first.data["next"])
+        titles = [item["title"] for item in first.data["results"] + second.data["results"]]
+        self.assertEqual(titles, ["Día 3", "Día 2", "Día 1"])
+
+    def test_search_and_near_paginate_by_start_time(self):
+        for day in (3, 1, 4, 2):
+            create_event(
+                self.organizer, title=f"Concierto día {day}", latitude=4.6, longitude=-74.08,
+                start_time=timezone.now() + timedelta(days=day),
+            )
+        create_event(self.organizer, title="Taller", latitude=4.6, longitude=-74.08)
+        client = api_client()
+        for query in ("search=concierto", "near=4.6,-74.08&radius_km=5&search=concierto"):
+            first = client.get(f"/api/events/?{query}&page_size=3")
+            self.assertEqual(first.status_code, 200, first.content)
+            second = client.get(first.data["next"])
+            self.assertEqual(second.status_code, 200, second.content)
+            self.assertIsNone(second.data["next"])
+            titles = [item["title"] for item in first.data["results"] + second.data["results"]]
+            self.assertEqual(titles, [f"Concierto día {day}" for day in (4, 3, 2, 1)], query)
+
+        near = client.get("/api/events/?near=4.6,-74.08&radius_km=5&page_size=10")
+        self.assertEqual(len(near.data["results"]), 5)
+
+    def test_explicit_relevance_or_distance_ordering_is_not_paginated(self):
+        client = api_client()
+        for query in ("search=concierto&ordering=relevance", "near=4.6,-74.08&ordering=distance"):
+            self.assertEqual(client.get(f"/api/events/?{query}").status_code, 200, query)
+            for pagination in ("page_size=10", "cursor=abc"):
+                response = client.get(f"/api/events/?{query}&{pagination}")
+                self.assertEqual(response.status_code, 400, query)
+                self.assertIn("ordering", response.data["detail"])
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}})
+class SearchIndexTests(EventTestCase):
+    def search(self, value):
+        return [item["title"] for item in api_client().get("/api/events/", {"search": value}).data]
+
+    def test_index_follows_event_changes(self):
+        event = create_event(self.organizer, title="Concierto de jazz", description="Música en vivo")
+        other = create_event(self.organizer, title="Taller de jazz", location="Biblioteca")
+        self.assertEqual(sorted(self.search("jazz")), ["Concierto de jazz", "Taller de jazz"])
+        self.assertEqual(self.search("musica"), ["Concierto de jazz"])
+
+        event.title = "Concierto de salsa"
+        event.save()
+        self.assertEqual(self.search("jazz"), ["Taller de jazz"])
+        self.assertEqual(self.search("salsa"), ["Concierto de salsa"])
+
+        other.delete()
+        self.assertEqual(self.search("jazz"), [])
+        self.assertEqual(self.search("biblio"), [])
+
+    def test_rank_orders_by_field_weight(self):
+        create_event(self.organizer, title="Charla", description="Sobre fotografía")
+        create_event(self.organizer, title="Fotografía nocturna")
+        self.assertEqual(self.search("fotografia"), ["Fotografía nocturna", "Charla"])
+
+    def test_sqlite_backend_is_not_cached_before_migration(self):
+        from unittest import mock
+        from . import search
+
+        if connection.vendor != "sqlite" or getattr(settings, "EVENT_SEARCH_BACKEND", None):
+            self.skipTest("Sólo aplica al backend FTS de SQLite")
+        search._backends.clear()
+        with mock.patch.object(search, "_sqlite_fts_available", return_value=False):
+            self.assertIsInstance(search.get_search_backend(), search.BasicSearchBackend)
+        self.assertIsInstance(search.get_search_backend(), search.SQLiteSearchBackend)
+
+
+class EventUpdateNotificationTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = create_event(self.organizer, capacity=10, location="Auditorio")
+        for user in self.users[:3]:
+            join_event(self.event, user.profile)
+
+    def updates(self):
+        return Notification.objects.filter(kind=NotificationKind.EVENT_UPDATED).count()
+
+    def test_unchanged_save_does_not_notify(self):
+        Event.objects.get(pk=self.event.pk).save()
+        self.event.description = "Otra descripción"
+        self.event.save()
+        self.event.save(update_fields=["updated_at"])
+        response = api_client(self.organizer).patch(
+            f"/api/events/{self.event.pk}/", {"location": "Auditorio"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.updates(), 0)
+
+    def test_visible_change_notifies_attendees(self):
+        response = api_client(self.organizer).patch(
+            f"/api/events/{self.event.pk}/",
+            {"start_time": (self.event.start_time + timedelta(hours=2)).isoformat()},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.updates(), 3)
+
+        self.event.refresh_from_db()
+        self.event.location = "Sala 2"
+        self.event.save(update_fields=["location", "updated_at"])
+        self.assertEqual(self.updates(), 6)
+
+
+class LiveStreamAuthTests(EventTestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = create_event(self.organizer, is_public=False)
+
+    def stream(self, query):
+        return self.client.get(f"/api/events/live/?events={self.event.pk}&{query}")
+
+    def test_ticket_requires_authentication(self):
+        self.assertEqual(api_client().post("/api/events/live/ticket/").status_code, 401)
+
+        response = jwt_client(self.organizer).post("/api/events/live/ticket/")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data["expires_in"], settings.EVENT_LIVE_TICKET_MAX_AGE)
+
+    def test_ticket_opens_stream(self):
+        ticket = jwt_client(self.organizer).post("/api/events/live/ticket/").data["ticket"]
+        response = self.stream(f"ticket={ticket}")
+        self.assertEqual(response.status_code, 200, response.content)
+        # Sin ASGI: instantánea actual, con los campos de organizador
+        self.assertIn(b'"attended":0', response.content)
+
+    def test_jwt_in_query_is_not_accepted(self):
+        token = RefreshToken.for_user(self.organizer).access_token
+        # Se ignora: como anónimo, el evento privado no existe
+        self.assertEqual(self.stream(f"token={token}").status_code, 404)
+        self.assertEqual(self.stream(f"ticket={token}").status_code, 401)
+
+    def test_forged_or_expired_ticket(self):
+        self.assertEqual(self.stream(f"ticket={signing.dumps(self.organizer.pk)}").status_code, 401)
+        ticket = issue_ticket(self.organizer)
+        with self.settings(EVENT_LIVE_TICKET_MAX_AGE=-1):
+            self.assertEqual(self.stream(f"ticket={ticket}").status_code, 401)
+        self.organizer.is_active = False
+        self.organizer.save(update_fields=["is_active"])
+        self.assertEqual(self.stream(f"ticket={ticket}").status_code, 401)
+
+    def test_authorization_header_still_works(self):
+        response = jwt_client(self.organizer).get(f"/api/events/live/?events={self.event.pk}")
+        self.assertEqual(response.status_code, 200)
+
+    def test_join_publishes_on_commit(self):
+        event = create_event(self.organizer, capacity=5)
+        before = get_broker().versions([event.pk])[event.pk]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = api_client(self.users[0]).post(f"/api/events/{event.pk}/join/")
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertGreater(get_broker().versions([event.pk])[event.pk], before)
+
+    @override_settings(QUERY_BUDGET_ENABLED=True)
+    async def test_query_budget_middleware_runs_async(self):
+        # Con ASGI el middleware no pasa por un hilo, pero sigue contando las
+        # consultas que la vista ejecuta en el hilo de sync_to_async
+        response = await AsyncClient().get("/api/categories/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Query-Count"], "2")
+
+
+def fake_snapshots(event_ids, versions):
+    # Eventos inexistentes se omiten, como en build_snapshots
+    return {
+        event_id: {"organizer_id": 1, "seats_taken": 1, "attended": 0, "version": versions[event_id]}
+        for event_id in event_ids if event_id != DELETED_EVENT
+    }
+
+
+DELETED_EVENT = uuid.uuid4()
+
+
+@patch("event_management.live.build_snapshots", side_effect=fake_snapshots)
+class LiveHubTests(SimpleTestCase):
+    async def settle(self, hub):
+        for subscriber in list(hub.subscribers):
+            hub.unsubscribe(subscriber)
+        await hub.task
+
+    async def test_fan_out_one_snapshot_per_tick(self, build):
+        broker = InProcessBroker()
+        hub = LiveHub(broker, tick=0.01)
+        event, other = uuid.uuid4(), uuid.uuid4()
+        organizer = Subscriber({event}, {event}, broker.versions([event]))
+        attendee = Subscriber({event, other}, set(), broker.versions([event, other]))
+        bystander = Subscriber({other}, set(), broker.versions([other]))
+        for subscriber in (organizer, attendee, bystander):
+            hub.subscribe(subscriber)
+
+        # Ráfaga antes del tick: una sola instantánea con la última versión
+        broker.publish(event)
+        broker.publish(event)
+        [data] = await organizer.next_batch(1)
+        self.assertEqual((data["event_id"], data["version"]), (event, 2))
+        self.assertIn("attended", data)
+        self.assertNotIn("organizer_id", data)
+        [data] = await attendee.next_batch(1)
+        self.assertEqual(data["version"], 2)
+        self.assertNotIn("attended", data)
+        self.assertEqual(await bystander.next_batch(0.05), [])
+
+        # Una consulta por tick para todos los suscriptores; sin cambios no se repite
+        self.assertEqual(await organizer.next_batch(0.05), [])
+        build.assert_called_once_with([event], {event: 2, other: 0})
+        await self.settle(hub)
+
+    async def test_slow_subscriber_keeps_latest(self, build):
+        broker = InProcessBroker()
+        hub = LiveHub(broker, tick=0.01)
+        event = uuid.uuid4()
+        subscriber = Subscriber({event, DELETED_EVENT}, set(), broker.versions([event, DELETED_EVENT]))
+        hub.subscribe(subscriber)
+
+        broker.publish(event)
+        await asyncio.sleep(0.05)
+        broker.publish(event)
+        broker.publish(DELETED_EVENT)
+        await asyncio.sleep(0.05)
+        batch = {data["event_id"]: data for data in await subscriber.next_batch(1)}
+        self.assertEqual(batch[event]["version"], 2)
+        self.assertEqual(batch[DELETED_EVENT], {"event_id": DELETED_EVENT, "deleted": True, "version": 1})
+        self.assertEqual(await subscriber.next_batch(0.05), [])
+        await self.settle(hub)
+
+
+class LiveBrokerTests(SimpleTestCase):
+    def test_in_process_versions(self):
+        broker = InProcessBroker()
+        event = uuid.uuid4()
+        self.assertEqual(broker.versions([event]), {event: 0})
+        broker.publish(event)
+        broker.publish(event)
+        self.assertEqual(broker.versions([event]), {event: 2})
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_cache_broker_shared_between_instances(self):
+        # Dos instancias equivalen a dos procesos con la misma caché
+        writer, reader = CacheBroker(), CacheBroker()
+        event, other = uuid.uuid4(), uuid.uuid4()
+        self.assertEqual(reader.versions([event, other]), {event: 0, other: 0})
+        writer.publish(event)
+        first = reader.versions([event])[event]
+        writer.publish(event)
+        self.assertEqual(reader.versions([event, other]), {event: first + 1, other: 0})
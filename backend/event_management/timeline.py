@@ -0,0 +1,129 @@
+# backend/event_management/timeline.py
+"""
+Mantenimiento de UserEventTimeline, el modelo de lectura de "mis eventos".
+
+Cada inscripción tiene una fila con sus campos y los del evento que definen la
+agenda (título, fechas, lugar, categoría, portada). my_events la lee con una
+sola consulta sobre idx_timeline_user_start; los datos volátiles del evento
+(calificaciones, cupos, descripción) salen del JOIN por pk en esa misma consulta.
+
+- Inscripción guardada -> upsert de su fila (signals.py).
+- Inscripción borrada -> la fila se borra en cascada.
+- Evento o categoría guardados -> un UPDATE sobre sus filas (signals.py).
+- Cambios de estado masivos (bulk_status, check_in) -> sync_registration_status().
+"""
+from django.utils import timezone
+
+from .models import Event, EventRegistration, UserEventTimeline
+
+# Campo de la fila -> columna de Event
+EVENT_COLUMNS = {
+    "event_title": "title",
+    "event_start_time": "start_time",
+    "event_end_time": "end_time",
+    "event_location": "location",
+    "event_category_id": "category_id",
+    "event_category_name": "category__name",
+    "event_cover_url": "cover_url",
+    "event_is_public": "is_public",
+}
+# Campo de la fila -> columna de EventRegistration
+REGISTRATION_COLUMNS = {
+    "registration_id": "id",
+    "user_id": "user_id",
+    "event_id": "event_id",
+    "registration_status": "status",
+    "rating": "rating",
+    "comment": "comment",
+    "registration_created_at": "created_at",
+    "registration_updated_at": "updated_at",
+}
+# Campos a actualizar en el upsert (nombres de campo, no de columna)
+UPSERT_FIELDS = [
+    "user", "event", "registration_status", "rating", "comment",
+    "registration_created_at", "registration_updated_at",
+    "event_title", "event_start_time", "event_end_time", "event_location",
+    "event_category", "event_category_name", "event_cover_url", "event_is_public",
+    "updated_at",
+]
+
+
+def event_values(event_id):
+    columns = Event.objects.filter(pk=event_id).values(*EVENT_COLUMNS.values()).first()
+    if columns is None:
+        return None
+    return {name: columns[column] for name, column in EVENT_COLUMNS.items()}
+
+
+def sync_registration(registration):
+    """Inserta o actualiza la fila de la inscripción con un solo upsert."""
+    values = event_values(registration.event_id)
+    if values is None:
+        return
+    row = UserEventTimeline(
+        **{name: getattr(registration, column) for name, column in REGISTRATION_COLUMNS.items()},
+        **values,
+        updated_at=timezone.now(),
+    )
+    UserEventTimeline.objects.bulk_create(
+        [row],
+        update_conflicts=True,
+        unique_fields=["registration"],
+        update_fields=UPSERT_FIELDS,
+    )
+
+
+def sync_event(event_id):
+    """Propaga los campos de agenda del evento a todas sus filas (un UPDATE)."""
+    values = event_values(event_id)
+    if values is not None:
+        UserEventTimeline.objects.filter(event_id=event_id).update(**values, updated_at=timezone.now())
+
+
+def sync_category(category):
+    UserEventTimeline.objects.filter(event_category_id=category.pk).update(
+        event_category_name=category.name, updated_at=timezone.now()
+    )
+
+
+def sync_registration_status(registration_ids, status, updated_at, from_statuses=None):
+    """
+    Para los UPDATE masivos de inscripciones, que no disparan señales.
+    `from_statuses` repite la condición de estado del UPDATE original.
+    """
+    entries = UserEventTimeline.objects.filter(registration_id__in=registration_ids)
+    if from_statuses is not None:
+        entries = entries.filter(registration_status__in=from_statuses)
+    entries.update(
+        registration_status=status,
+        registration_updated_at=updated_at,
+        updated_at=updated_at,
+    )
+
+
+def rebuild_timeline(user_ids=None, batch_size=1000):
+    """Reconstruye las filas desde las inscripciones. Devuelve cuántas se crearon."""
+    registrations = EventRegistration.objects.all()
+    entries = UserEventTimeline.objects.all()
+    if user_ids is not None:
+        registrations = registrations.filter(user_id__in=user_ids)
+        entries = entries.filter(user_id__in=user_ids)
+    entries.delete()
+
+    names = list(REGISTRATION_COLUMNS) + list(EVENT_COLUMNS)
+    columns = list(REGISTRATION_COLUMNS.values()) + [f"event__{column}" for column in EVENT_COLUMNS.values()]
+    rows = registrations.order_by().values_list(*columns).iterator(chunk_size=batch_size)
+
+    now = timezone.now()
+    created = 0
+    batch = []
+    for row in rows:
+        batch.append(UserEventTimeline(**dict(zip(names, row)), updated_at=now))
+        if len(batch) >= batch_size:
+            UserEventTimeline.objects.bulk_create(batch)
+            created += len(batch)
+            batch = []
+    if batch:
+        UserEventTimeline.objects.bulk_create(batch)
+        created += len(batch)
+    return created
@@ -0,0 +1,150 @@
+# backend/event_management/trends.py
+"""
+Series de tiempo de inscripciones para los reportes de administrador.
+
+Las inscripciones se agrupan por el intervalo (hora, día o semana, en UTC) en
+que se crearon, con una sola consulta agrupada por Trunc* (y por categoría si
+se pide). Confirmados y asistentes son los de las inscripciones de ese
+intervalo, así attendance_rate es la tasa de asistencia de cada cohorte.
+
+La respuesta es columnar: una lista con el inicio de cada intervalo y, por cada
+serie, una lista de valores en el mismo orden. Los intervalos sin inscripciones
+van con 0.
+"""
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDay, TruncHour, TruncWeek
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import EventRegistration, RegistrationStatus
+
+# intervalo -> (función Trunc, paso, rango por defecto)
+BUCKETS = {
+    "hour": (TruncHour, timedelta(hours=1), timedelta(days=2)),
+    "day": (TruncDay, timedelta(days=1), timedelta(days=30)),
+    "week": (TruncWeek, timedelta(weeks=1), timedelta(weeks=26)),
+}
+MAX_BUCKETS = 1000
+COUNT_SERIES = ("registrations", "confirmed", "attended")
+
+
+class TrendsError(ValueError):
+    """Parámetros inválidos (se responde 400 con el mensaje)."""
+
+
+def floor_bucket(value, bucket):
+    """Inicio (UTC) del intervalo que contiene `value`; las semanas empiezan el lunes, como TruncWeek."""
+    value = value.astimezone(dt_timezone.utc)
+    if bucket == "hour":
+        return value.replace(minute=0, second=0, microsecond=0)
+    start = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if bucket == "week":
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+def parse_bound(value, name):
+    """Fecha (YYYY-MM-DD, se toma su inicio en UTC) o fecha y hora ISO 8601."""
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            parsed = datetime.combine(day, time.min) if day else None
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise TrendsError(f"'{name}' debe ser una fecha (YYYY-MM-DD) o fecha y hora ISO 8601.")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_timezone.utc)
+    return parsed
+
+
+def bucket_starts(bucket, start, end):
+    """Inicios de los intervalos que cubren [start, end)."""
+    step = BUCKETS[bucket][1]
+    current = floor_bucket(start, bucket)
+    starts = []
+    while current < end:
+        starts.append(current)
+        if len(starts) > MAX_BUCKETS:
+            raise TrendsError(f"El rango abarca más de {MAX_BUCKETS} intervalos; usa uno más grande.")
+        current += step
+    return starts
+
+
+def empty_series(size):
+    return {name: [0] * size for name in COUNT_SERIES}
+
+
+def add_rates(series):
+    series["attendance_rate"] = [
+        round(attended / registrations * 100, 2) if registrations else 0
+        for attended, registrations in zip(series["attended"], series["registrations"])
+    ]
+    return series
+
+
+def build_trends(bucket="day", start=None, end=None, by_category=False, now=None):
+    """Payload del endpoint de tendencias. `start`/`end` son datetimes (end exclusivo)."""
+    if bucket not in BUCKETS:
+        raise TrendsError(f"'bucket' debe ser uno de: {', '.join(BUCKETS)}.")
+    trunc, step, default_span = BUCKETS[bucket]
+    end = end or now or timezone.now()
+    start = start or end - default_span
+    if start >= end:
+        raise TrendsError("'start' debe ser anterior a 'end'.")
+
+    starts = bucket_starts(bucket, start, end)
+    position = {value: index for index, value in enumerate(starts)}
+
+    group_by = ["bucket"]
+    if by_category:
+        group_by += ["event__category_id", "event__category__name"]
+    # Una consulta: GROUP BY intervalo (y categoría) con conteos condicionales
+    rows = (
+        EventRegistration.objects.filter(created_at__gte=starts[0], created_at__lt=end)
+        .annotate(bucket=trunc("created_at", tzinfo=dt_timezone.utc))
+        .values(*group_by)
+        .annotate(
+            registrations=Count("id"),
+            confirmed=Count("id", filter=Q(status=RegistrationStatus.CONFIRMED)),
+            attended=Count("id", filter=Q(status=RegistrationStatus.ATTENDED)),
+        )
+        .order_by()
+    )
+
+    totals = empty_series(len(starts))
+    categories = {}
+    for row in rows:
+        index = position.get(floor_bucket(row["bucket"], bucket))
+        if index is None:
+            continue
+        targets = [totals]
+        if by_category:
+            category_id = row["event__category_id"]
+            if category_id not in categories:
+                categories[category_id] = {
+                    "id": category_id,
+                    "name": row["event__category__name"] or "Sin categoría",
+                    "series": empty_series(len(starts)),
+                }
+            targets.append(categories[category_id]["series"])
+        for series in targets:
+            for name in COUNT_SERIES:
+                series[name][index] += row[name]
+
+    payload = {
+        "bucket": bucket,
+        "start": starts[0].isoformat(),
+        "end": end.isoformat(),
+        "buckets": [value.isoformat() for value in starts],
+        "series": add_rates(totals),
+    }
+    if by_category:
+        payload["categories"] = [
+            {**category, "series": add_rates(category["series"])}
+            for category in sorted(categories.values(), key=lambda item: -sum(item["series"]["registrations"]))
+        ]
+    return payload
@@ -2,7 +2,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import EventViewSet, CategoryViewSet, EventRegistrationViewSet
-from . import reports
+from . import live, reports
 
 router = DefaultRouter()
 router.register(r'events', EventViewSet, basename='event')
@@ -10,6 +10,13 @@ router.register(r'categories', CategoryViewSet, basename='category')
 router.register(r"registrations", EventRegistrationViewSet, basename="registration")
 
 urlpatterns = [
+    # Antes del router: si no, "live" se tomaría como pk de un evento
+    path('events/live/', live.event_stream, name='event-live'),
+    path('events/live/ticket/', live.stream_ticket, name='event-live-ticket'),
     path('', include(router.urls)),
     path('admin-reports/', reports.admin_reports, name='admin-reports'),
+    path('admin-reports/trends/', reports.admin_report_trends, name='admin-report-trends'),
+    path('admin-reports/export/<slug:table>/', reports.admin_export, name='admin-export'),
+    path('admin-reports/jobs/', reports.admin_report_jobs, name='admin-report-jobs'),
+    path('admin-reports/jobs/<uuid:job_id>/', reports.admin_report_job_detail, name='admin-report-job-detail'),
 ]
\ No newline at end of file
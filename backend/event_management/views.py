@@ -1,18 +1,35 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly, AllowAny
-from rest_framework.filters import SearchFilter
 from .serializers import EventSerializer, CategorySerializer, EventRegistrationSerializer, EventCommentSerializer
-from django.db.models import Q, Avg
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from .filters import EventFilter
-from .models import Event, RegistrationStatus, EventRegistration, Category
+from .filters import EventFilter, EventSearchFilter
+from .pagination import (
+    CommentCursorPagination, EventCursorPagination, RegistrationCursorPagination, TimelineCursorPagination,
+)
+from .ratings import apply_rating_change
+from .seats import AlreadyRegistered, join_event, lock_event, promote_waitlisted
+from .checkin import MAX_SCANS_PER_BATCH, ingest_scans
+from .live import publish_on_commit
+from .attendance import build_report, stream_report
+from .renderers import CSVRenderer, NDJSONRenderer
+from .bulk_status import BULK_TARGET_STATUSES, MAX_BULK_ITEMS, apply_bulk_status, summarize
+from . import cache as event_cache
+from .conditional import ConditionalGetMixin
+from .event_calendar import build_calendar, calendar_queryset, parse_range
+from .fast_serializers import FastEventRegistrationSerializer, FastEventSerializer, FastTimelineSerializer
+from .models import Event, RegistrationStatus, EventRegistration, Category, UserEventTimeline
 from rest_framework.decorators import action
+from rest_framework.settings import api_settings
 from rest_framework.response import Response
 from rest_framework import status
 #from users.models import Profile # No necesaria si usamos self.request.user.profile
 
 
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CategoryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing categories.
     Public access - anyone can view categories.
@@ -20,22 +37,51 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Category.objects.all().order_by('name')
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]  # Public access
+    # Consultas SQL por acción, incluida la autenticación (ver query_budget.py)
+    query_budgets = {"list": 2, "retrieve": 2}
 
+    def list(self, request, *args, **kwargs):
+        not_modified = self.check_conditions(request, self.get_queryset())
+        if not_modified is not None:
+            return not_modified
+        return super().list(request, *args, **kwargs)
 
-class EventViewSet(viewsets.ModelViewSet):
+    def retrieve(self, request, *args, **kwargs):
+        queryset = self.get_detail_queryset(self.get_queryset())
+        not_modified = self.check_conditions(request, queryset)
+        if not_modified is not None:
+            return not_modified
+        return super().retrieve(request, *args, **kwargs)
+
+
+class EventViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     # Allow anyone to view events (GET), but require authentication for create/update/delete
     permission_classes = [IsAuthenticatedOrReadOnly]
     serializer_class = EventSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filter_backends = [DjangoFilterBackend, EventSearchFilter]
     filterset_class = EventFilter
-    search_fields = ['title', 'description', 'location']
+    # Opcional: sólo pagina si se envía ?cursor= o ?page_size=
+    pagination_class = EventCursorPagination
+    # Consultas SQL por acción, incluida la autenticación (ver query_budget.py)
+    query_budgets = {
+        "list": 4,
+        "retrieve": 3,
+        "join": 11,
+        "registrations": 3,
+        "check_registration": 4,
+        "my_event_count": 3,
+        "attendance_report": 4,
+        "comments": 2,
+        "calendar": 4,
+        "bulk_status": 9,
+        "check_in": 9,
+    }
     
     # 1. Función para LISTAR eventos (GET)
     def get_queryset(self):
         # Filter to show only public events for unauthenticated users
         # Authenticated users can see all events (or filter by 'mine' parameter)
-        qs = Event.objects.all().order_by("-start_time")
-        qs = qs.annotate(average_rating=Avg("registrations__rating"))
+        qs = Event.objects.all().order_by("-start_time", "-id")
         # If user is not authenticated, only show public events
         if not self.request.user.is_authenticated:
             qs = qs.filter(is_public=True)
@@ -51,29 +97,97 @@ class EventViewSet(viewsets.ModelViewSet):
                 # Unauthenticated users cannot filter by 'mine'
                 return Event.objects.none()
 
+        # En lecturas, traer sólo las columnas y JOINs de los campos pedidos (?fields= / ?omit=)
+        if self.action in ("list", "retrieve"):
+            qs = EventSerializer.prune_queryset(qs, self.request)
+
         return qs
 
+    # Columnas que determinan la representación de un evento (ETag / Last-Modified)
+    validator_timestamps = ("updated_at", "category__updated_at")
+
+    def list(self, request, *args, **kwargs):
+        # Primero el GET condicional: un 304 evita incluso la caché
+        queryset = self.filter_queryset(self.get_queryset())
+        not_modified = self.check_conditions(request, queryset, self.validator_timestamps)
+        if not_modified is not None:
+            return not_modified
+
+        # Los anónimos comparten pocas combinaciones de filtros: se cachea la respuesta
+        if request.user.is_authenticated:
+            return self.list_response(request, queryset)
+
+        key = event_cache.build_key("list", request)
+        data = event_cache.get_cached(key)
+        if data is not None:
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        response = self.list_response(request, queryset)
+        if response.status_code == status.HTTP_200_OK:
+            event_cache.set_cached(key, response.data)
+        response["X-Cache"] = "MISS"
+        return response
+
+    def list_response(self, request, queryset):
+        # Ruta rápida desde .values(): mismo JSON que EventSerializer
+        if not settings.EVENT_FAST_SERIALIZATION:
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                return self.get_paginated_response(self.get_serializer(page, many=True).data)
+            return Response(self.get_serializer(queryset, many=True).data)
+
+        serializer = FastEventSerializer(request)
+        rows = serializer.values(queryset)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows))
+
+    def retrieve(self, request, *args, **kwargs):
+        queryset = self.get_detail_queryset(self.get_queryset())
+        not_modified = self.check_conditions(request, queryset, self.validator_timestamps)
+        if not_modified is not None:
+            return not_modified
+        return super().retrieve(request, *args, **kwargs)
+
             # 2. Función para CREAR eventos (POST)
     def perform_create(self, serializer):
         # ASIGNA EL ORGANIZADOR USANDO LA RELACIÓN INVERSA
         serializer.save(organizer=self.request.user.profile)
 
+    def perform_update(self, serializer):
+        # Con el evento bloqueado: si aumentó la capacidad, los cupos nuevos pasan
+        # a la lista de espera en orden de llegada
+        with transaction.atomic():
+            lock_event(serializer.instance.pk)
+            event = serializer.save()
+            if promote_waitlisted(event.pk):
+                event.refresh_from_db(fields=["seats_taken", "updated_at"])
+
     @action(detail=True, methods=['post'])
     def join(self, request, pk=None):
         event = self.get_object()
         user = request.user.profile
 
-        # Verificar si ya está inscrito
-        if EventRegistration.objects.filter(event=event, user=user).exists():
+        # Cupo atómico: sin cupo queda en lista de espera (ver seats.py)
+        try:
+            registration = join_event(event, user)
+        except AlreadyRegistered:
             return Response(
                 {"detail": "Ya estás inscrito en este evento."},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        # Crear inscripción
-        EventRegistration.objects.create(event=event, user=user)
+
+        if registration.status == RegistrationStatus.WAITLISTED:
+            detail = "El evento está lleno. Quedaste en la lista de espera."
+        else:
+            detail = "Inscripción exitosa."
         return Response(
-            {"detail": "Inscripción exitosa."},
+            {
+                "detail": detail,
+                "registration_id": str(registration.id),
+                "status": registration.status,
+            },
             status=status.HTTP_201_CREATED
         )
     
@@ -81,12 +195,49 @@ class EventViewSet(viewsets.ModelViewSet):
     def registrations(self, request, pk=None):
         """
         Get all registrations for this event.
-        Requires authentication.
+        ?status=registered,attended filtra por estado y ?username= busca por prefijo.
+        Con ?page_size= o ?cursor= pagina por fecha de inscripción.
         """
         event = self.get_object()
-        registrations = event.registrations.all().select_related('user')
-        serializer = EventRegistrationSerializer(registrations, many=True)
-        return Response(serializer.data)
+        # No event.registrations: el related manager asigna el evento a cada fila y,
+        # con ?fields= sin `event`, carga event_id diferido una vez por fila
+        registrations = EventRegistration.objects.filter(event_id=event.pk)
+
+        statuses = [value for value in request.query_params.get("status", "").split(",") if value]
+        if statuses:
+            invalid = set(statuses) - set(RegistrationStatus.values)
+            if invalid:
+                return Response(
+                    {"status": f"Estados inválidos: {', '.join(sorted(invalid))}."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            registrations = registrations.filter(status__in=statuses)
+
+        # No se usa ?search=: get_object() lo aplicaría como búsqueda de eventos
+        username = request.query_params.get("username", "").strip()
+        if username:
+            registrations = registrations.filter(user__user__username__istartswith=username)
+
+        # Mismo orden con o sin paginación (usa idx_reg_event_status_created)
+        registrations = registrations.order_by("created_at", "id")
+        paginator = RegistrationCursorPagination()
+
+        if settings.EVENT_FAST_SERIALIZATION:
+            serializer = FastEventRegistrationSerializer(request)
+            rows = serializer.values(registrations)
+            page = paginator.paginate_queryset(rows, request, view=self)
+            if page is not None:
+                return paginator.get_paginated_response(serializer.serialize(page))
+            return Response(serializer.serialize(rows))
+
+        registrations = EventRegistrationSerializer.prune_queryset(registrations, request)
+        page = paginator.paginate_queryset(registrations, request, view=self)
+        context = {"request": request}
+        if page is not None:
+            return paginator.get_paginated_response(
+                EventRegistrationSerializer(page, many=True, context=context).data
+            )
+        return Response(EventRegistrationSerializer(registrations, many=True, context=context).data)
     
     @action(detail=True, methods=['get'])
     def check_registration(self, request, pk=None):
@@ -124,130 +275,221 @@ class EventViewSet(viewsets.ModelViewSet):
         except:
             return Response({"count": 0}, status=status.HTTP_200_OK)
         
-    @action(detail=True, methods=['get'])
+    @action(
+        detail=True,
+        methods=['get'],
+        renderer_classes=api_settings.DEFAULT_RENDERER_CLASSES + [CSVRenderer, NDJSONRenderer],
+    )
     def attendance_report(self, request, pk=None):
         """
-        Reporte - Solo usernames de las personas
+        Reporte - Solo usernames de las personas.
+        ?format=csv / ?format=ndjson lo exporta en streaming (ver attendance.py).
         """
         event = self.get_object()
         
-        # Verificar que el usuario es el organizador
-        if event.organizer != request.user.profile:
+        # Verificar que el usuario es el organizador (Profile usa el id del usuario como pk)
+        if event.organizer_id != request.user.pk:
             return Response(
                 {"detail": "Solo el organizador puede ver este reporte."},
                 status=status.HTTP_403_FORBIDDEN
             )
-        
-        # Estadísticas básicas
-        total_registered = event.registrations.count()
-        total_attended = event.registrations.filter(status=RegistrationStatus.ATTENDED).count()
-        
-        # Obtener usernames de forma simple
-        def get_usernames(queryset):
-            usernames = []
-            for reg in queryset.select_related('user__user'):
-                try:
-                    if hasattr(reg.user, 'user') and reg.user.user:
-                        usernames.append(reg.user.user.username)
-                    else:
-                        usernames.append(f"user_{reg.user_id}")
-                except:
-                    usernames.append("usuario")
-            return usernames
-        
-        # Listas de usernames
-        all_usernames = get_usernames(event.registrations.all())
-        attendee_usernames = get_usernames(event.registrations.filter(status=RegistrationStatus.ATTENDED))
-        pending_usernames = get_usernames(event.registrations.exclude(status=RegistrationStatus.ATTENDED))
-        
+
+        export_format = request.accepted_renderer.format
+        if export_format in ("csv", "ndjson"):
+            return stream_report(event, export_format)
+        return Response(build_report(event))
+
+    @action(detail=True, methods=['post'])
+    def bulk_status(self, request, pk=None):
+        """
+        Cambia el estado de muchas inscripciones del evento (sólo el organizador).
+        Body: {"status": "attended", "registration_ids": [...]} o {"status": ..., "user_ids": [...]}
+        """
+        event = self.get_object()
+        if event.organizer_id != request.user.profile.pk:
+            return Response(
+                {"detail": "Solo el organizador puede modificar estas inscripciones."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        target = request.data.get("status")
+        if target not in BULK_TARGET_STATUSES:
+            return Response(
+                {"detail": f"Estado inválido. Opciones: {', '.join(BULK_TARGET_STATUSES)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        by_user = "user_ids" in request.data
+        ids = request.data.get("user_ids" if by_user else "registration_ids")
+        if not isinstance(ids, list) or not ids:
+            return Response(
+                {"detail": "Se requiere una lista registration_ids o user_ids."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(ids) > MAX_BULK_ITEMS:
+            return Response(
+                {"detail": f"Máximo {MAX_BULK_ITEMS} inscripciones por petición."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results, updated_ids = apply_bulk_status(event, target, ids, by_user=by_user)
+        if updated_ids:
+            # El UPDATE masivo no dispara señales
+            transaction.on_commit(event_cache.bump_generation)
+            publish_on_commit(event.pk)
+
         return Response({
-            "event": {
-                "id": str(event.id),
-                "title": event.title,
-            },
-            "statistics": {
-                "total_registered": total_registered,
-                "total_attended": total_attended,
-                "attendance_rate": round((total_attended / total_registered * 100) if total_registered > 0 else 0, 2),
-                "pending": total_registered - total_attended
-            },
-            "usernames": {
-                "all": all_usernames,  # Todos los que se unieron
-                "attended": attendee_usernames,  # Los que confirmaron asistencia
-                "pending": pending_usernames  # Los que no han confirmado
-            },
-            "counts": {
-                "unique_users": len(set(all_usernames)),
-                "unique_attended": len(set(attendee_usernames))
-            }
+            "status": target,
+            "summary": summarize(results),
+            "results": results,
         })
 
+    @action(detail=True, methods=['post'])
+    def check_in(self, request, pk=None):
+        """
+        Lote de lecturas de los escáneres de la puerta (sólo el organizador).
+        Body: {"device_id": "...", "scans": [{"scan_id", "registration_id", "scanned_at"}, ...]}
+        Responde sólo los scan_id aceptados; reenviar un lote es idempotente.
+        """
+        event = self.get_object()
+        if event.organizer_id != request.user.profile.pk:
+            return Response(
+                {"detail": "Solo el organizador puede registrar asistencia."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        scans = request.data.get("scans")
+        if not isinstance(scans, list):
+            return Response(
+                {"detail": "Se requiere una lista scans."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(scans) > MAX_SCANS_PER_BATCH:
+            return Response(
+                {"detail": f"Máximo {MAX_SCANS_PER_BATCH} lecturas por lote."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        accepted, checked_in = ingest_scans(event, scans, device_id=str(request.data.get("device_id") or "")[:64])
+        if accepted:
+            # Nuevas lecturas (último check-in) aunque nadie cambie de estado
+            publish_on_commit(event.pk)
+        if checked_in:
+            # El UPDATE masivo no dispara señales
+            transaction.on_commit(event_cache.bump_generation)
+        return Response({"accepted": accepted})
+
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """
+        Eventos agrupados por día para la vista mes/semana.
+        ?month=AAAA-MM o ?start=AAAA-MM-DD&end=AAAA-MM-DD (inclusivos), más los filtros de EventFilter.
+        """
+        start, end = parse_range(request.query_params)
+        rows = calendar_queryset(self.filter_queryset(self.get_queryset()), start, end)
+
+        not_modified = self.check_conditions(request, rows, self.validator_timestamps)
+        if not_modified is not None:
+            return not_modified
+
+        # La respuesta sólo depende de la visibilidad (públicos vs todos) salvo con ?mine=
+        mine = request.query_params.get("mine", "").lower() in ['true', '1', 'yes']
+        if mine and request.user.is_authenticated:
+            return Response(build_calendar(rows, start, end))
+
+        visibility = "all" if request.user.is_authenticated else "public"
+        key = event_cache.build_key(f"calendar:{visibility}", request)
+        data = event_cache.get_cached(key)
+        if data is not None:
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        data = build_calendar(rows, start, end)
+        event_cache.set_cached(key, data)
+        return Response(data, headers={"X-Cache": "MISS"})
+
     @action(detail=True, methods=['get'])
     def comments(self, request, pk=None):
-        """Return comments + rating for this event."""
+        """
+        Resumen de calificaciones (desde los agregados del evento) y comentarios
+        paginados por cursor, los más recientes primero.
+        """
+        event = self.get_object()
+        # commented_at sólo está en las inscripciones con comentario (ver `rate`)
         registrations = EventRegistration.objects.filter(
-            event_id=pk,
-            comment__isnull=False
-        ).exclude(comment="")  # Only with actual comments
+            event=event,
+            commented_at__isnull=False,
+        ).exclude(comment="").select_related("user__user")
 
-        serializer = EventCommentSerializer(registrations, many=True)
-        return Response(serializer.data)
+        paginator = CommentCursorPagination()
+        page = paginator.paginate_queryset(registrations, request, view=self)
+        serializer = EventCommentSerializer(page, many=True)
+        return Response({
+            "summary": {
+                "count": event.rating_count,
+                "average": event.average_rating,
+                "histogram": event.rating_histogram,
+            },
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
+            "results": serializer.data,
+        })
 
 
-class EventRegistrationViewSet(viewsets.ModelViewSet):
+class EventRegistrationViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = EventRegistration.objects.all()
     serializer_class = EventRegistrationSerializer
     permission_classes = [IsAuthenticated]
+    query_budgets = {
+        "list": 3,
+        "retrieve": 3,
+        "my_events": 3,
+        "rate": 10,
+        "confirm_attendance": 6,
+    }
 
     # Restrict editing to the user who owns the registration
     def get_queryset(self):
-        return EventRegistration.objects.filter(user=self.request.user.profile)
+        return EventRegistration.objects.filter(user=self.request.user.profile).select_related("user__user")
+
+    def create(self, request, *args, **kwargs):
+        # Las inscripciones se crean con POST /api/events/<id>/join/, que asigna el cupo
+        return Response(
+            {"detail": "Usa POST /api/events/<id>/join/ para inscribirte a un evento."},
+            status=status.HTTP_405_METHOD_NOT_ALLOWED,
+        )
 
     def perform_update(self, serializer):
         serializer.save()
 
     @action(detail=False, methods=["get"])
     def my_events(self, request):
-        user_profile = request.user.profile
-
-        # Obtener TODOS los registros del usuario con toda la información
-        regs = EventRegistration.objects.filter(user=user_profile) \
-            .select_related("event", "event__category", "event__organizer")
-
-        # Crear un diccionario con toda la información de cada registro
-        reg_info_map = {}
-        for reg in regs:
-            reg_info_map[str(reg.event_id)] = {
-                "registration_id": str(reg.id),
-                "status": reg.status,
-                "rating": reg.rating,
-                "comment": reg.comment,
-                "created_at": reg.created_at,
-                "updated_at": reg.updated_at
-            }
-
-        # Obtener los eventos y aplicar filtros
-        events_qs = Event.objects.filter(id__in=regs.values("event_id")) \
-            .select_related("category", "organizer") \
-            .annotate(average_rating=Avg("registrations__rating"))
-        
-        # Aplicar filtros si existen
-        filtered_events = EventFilter(request.GET, queryset=events_qs).qs
-
-        # Serializar eventos
-        event_data = EventSerializer(filtered_events, many=True).data
-
-        # Inyectar información del registro en cada evento
-        for event in event_data:
-            reg_info = reg_info_map.get(event["id"], {})
-            event["registration_id"] = reg_info.get("registration_id")
-            event["registration_status"] = reg_info.get("status", RegistrationStatus.REGISTERED)
-            event["rating"] = reg_info.get("rating")
-            event["comment"] = reg_info.get("comment")
-            event["registration_created_at"] = reg_info.get("created_at")
-            event["registration_updated_at"] = reg_info.get("updated_at")
-
-        return Response(event_data, status=status.HTTP_200_OK)
+        """
+        Eventos del usuario con los datos de su inscripción, desde UserEventTimeline
+        (ver timeline.py). Acepta los filtros de EventFilter y, con ?page_size= o
+        ?cursor=, pagina por fecha de inicio.
+        """
+        # Profile usa el id del usuario como pk
+        entries = UserEventTimeline.objects.filter(user_id=request.user.pk)
+
+        # Los filtros de eventos se aplican como subconsulta sobre Event
+        if set(request.query_params) & set(EventFilter.base_filters):
+            filtered_events = EventFilter(request.query_params, queryset=Event.objects.all()).qs
+            entries = entries.filter(event__in=filtered_events.order_by().values("pk"))
+
+        # El resultado cambia si cambia una fila del timeline o un dato volátil del evento
+        not_modified = self.check_conditions(request, entries, ("updated_at", "event__updated_at"))
+        if not_modified is not None:
+            return not_modified
+
+        entries = entries.order_by("-event_start_time", "-registration_id")
+        serializer = FastTimelineSerializer(request)
+        rows = serializer.values(entries)
+
+        paginator = TimelineCursorPagination()
+        page = paginator.paginate_queryset(rows, request, view=self)
+        if page is not None:
+            return paginator.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows), status=status.HTTP_200_OK)
     
     @action(detail=True, methods=["patch"])
     def rate(self, request, pk=None):
@@ -260,13 +502,29 @@ class EventRegistrationViewSet(viewsets.ModelViewSet):
             return Response({"detail": "Rating is required."},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        if not (1 <= int(rating) <= 5):
+        try:
+            rating = int(rating)
+        except (TypeError, ValueError):
             return Response({"detail": "Rating must be between 1 and 5."},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        registration.rating = rating
-        registration.comment = comment
-        registration.save()
+        if not (1 <= rating <= 5):
+            return Response({"detail": "Rating must be between 1 and 5."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        # Bloquear la fila para que la calificación anterior sea consistente
+        # con el ajuste de los agregados del evento
+        with transaction.atomic():
+            registration = EventRegistration.objects.select_for_update().get(pk=registration.pk)
+            previous_rating = registration.rating
+            registration.rating = rating
+            if not comment:
+                registration.commented_at = None
+            elif comment != registration.comment:
+                registration.commented_at = timezone.now()
+            registration.comment = comment
+            registration.save()
+            apply_rating_change(registration.event_id, previous_rating, rating)
 
         return Response(
             {"detail": "Review saved successfully."},
@@ -281,12 +539,18 @@ class EventRegistrationViewSet(viewsets.ModelViewSet):
         registration = self.get_object()
         
         # Verificar que el usuario es quien dice ser
-        if registration.user != request.user.profile:
+        if registration.user_id != request.user.profile.pk:
             return Response(
                 {"detail": "No tienes permiso para confirmar asistencia en esta inscripción."},
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        if registration.status in (RegistrationStatus.WAITLISTED, RegistrationStatus.CANCELLED):
+            return Response(
+                {"detail": "Tu inscripción no tiene cupo asignado en este evento."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         # Cambiar estado a ATTENDED
         registration.status = RegistrationStatus.ATTENDED
         registration.save()
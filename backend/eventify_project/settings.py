@@ -56,6 +56,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'event_management.query_budget.QueryBudgetMiddleware',
 ]
 
 ROOT_URLCONF = 'eventify_project.urls'
@@ -95,10 +96,80 @@ else:
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            # Las transacciones toman el bloqueo de escritura al empezar y esperan
+            # en lugar de fallar con "database is locked" (inscripciones concurrentes)
+            'OPTIONS': {
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': 20,
+            },
+            # Base de pruebas en archivo: en memoria (cache compartida) los hilos de
+            # las pruebas de concurrencia fallan con "table is locked" sin esperar
+            'TEST': {
+                'NAME': BASE_DIR / 'test_db.sqlite3',
+            },
         }
     }
 
 
+# Caché (LocMem en desarrollo; Redis si se define REDIS_URL)
+# Con varios workers conviene Redis: con LocMem cada proceso tiene su propia caché.
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'eventify',
+        }
+    }
+
+# Segundos que vive una respuesta cacheada de los listados públicos de eventos
+EVENT_CACHE_TIMEOUT = int(os.environ.get('EVENT_CACHE_TIMEOUT', '300'))
+
+# Segundos que un reporte de administrador se sirve desde la caché sin recalcular
+# (ver event_management/report_cache.py)
+ADMIN_REPORT_CACHE_TTL = int(os.environ.get('ADMIN_REPORT_CACHE_TTL', '60'))
+
+# Antigüedad máxima (segundos) de los rollups de reportes: si el último
+# refresh_report_rollups es más viejo, los reportes se calculan en vivo
+# (ver event_management/reports.py y el cron en DEPLOY.md)
+ADMIN_REPORT_ROLLUP_MAX_AGE = int(os.environ.get('ADMIN_REPORT_ROLLUP_MAX_AGE', '900'))
+
+# Segundos durante los que el resultado de un job de reporte se reutiliza en vez
+# de encolar otro (ver event_management/report_jobs.py)
+ADMIN_REPORT_JOB_RESULT_TTL = int(os.environ.get('ADMIN_REPORT_JOB_RESULT_TTL', '300'))
+
+# Actualizaciones en vivo por SSE (ver event_management/live.py; requiere servidor ASGI).
+# InProcessBroker sirve con un solo proceso; con varios workers usar
+# 'event_management.live.CacheBroker' junto con REDIS_URL.
+EVENT_LIVE_BROKER = os.environ.get(
+    'EVENT_LIVE_BROKER',
+    'event_management.live.CacheBroker' if REDIS_URL else 'event_management.live.InProcessBroker',
+)
+# Segundos entre revisiones: los cambios dentro de un tick se envían como una sola actualización
+EVENT_LIVE_TICK = float(os.environ.get('EVENT_LIVE_TICK', '1.0'))
+EVENT_LIVE_HEARTBEAT = float(os.environ.get('EVENT_LIVE_HEARTBEAT', '15'))
+# Vigencia (segundos) del ticket con el que el navegador abre el stream
+EVENT_LIVE_TICKET_MAX_AGE = int(os.environ.get('EVENT_LIVE_TICKET_MAX_AGE', '60'))
+
+# Presupuesto de consultas SQL por endpoint (ver event_management/query_budget.py)
+# Activo por defecto en desarrollo; en modo estricto la petición que se pase falla.
+QUERY_BUDGET_ENABLED = os.environ.get('QUERY_BUDGET_ENABLED', str(DEBUG)) == 'True'
+QUERY_BUDGET_STRICT = os.environ.get('QUERY_BUDGET_STRICT', 'False') == 'True'
+# manage.py test corre con ambos activos: exceder un presupuesto hace fallar el test
+TEST_RUNNER = 'event_management.test_runner.QueryBudgetTestRunner'
+
+# Listados de sólo lectura serializados desde .values() (ver event_management/fast_serializers.py)
+EVENT_FAST_SERIALIZATION = os.environ.get('EVENT_FAST_SERIALIZATION', 'True') == 'True'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -1,13 +1,19 @@
 # backend/users/urls.py
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
-from .views import RegisterView, UserNotificationsView, CancelRegistrationView, CustomTokenObtainPairView, ChangePasswordView, UserProfileView
+from .views import (
+    RegisterView, UserNotificationsView, NotificationInboxView, NotificationUnreadView, NotificationReadView,
+    CancelRegistrationView, CustomTokenObtainPairView, ChangePasswordView, UserProfileView,
+)
 
 urlpatterns = [
     path('login/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('register/', RegisterView.as_view(), name='auth_register'),
     path('notifications/', UserNotificationsView.as_view(), name='user-notifications'),
+    path('notifications/inbox/', NotificationInboxView.as_view(), name='notification-inbox'),
+    path('notifications/unread/', NotificationUnreadView.as_view(), name='notification-unread'),
+    path('notifications/read/', NotificationReadView.as_view(), name='notification-read'),
     path('cancel-registration/<uuid:registration_id>/', CancelRegistrationView.as_view(), name='cancel-registration'),
     path("profile/", UserProfileView.as_view(), name='user-profile'),
     path("profile/change-password/", ChangePasswordView.as_view(), name='change-password'),
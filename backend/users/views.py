@@ -6,7 +6,9 @@ from rest_framework.views import APIView
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from event_management.models import EventRegistration, Event
+from event_management.models import EventRegistration, Event, Notification, UserEventTimeline
+from event_management.notifications import mark_read, unread_count
+from event_management.pagination import NotificationCursorPagination
 from event_management.serializers import EventSerializer
 from .serializers import UserSerializer, ChangePasswordSerializer, UserProfileSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView
@@ -36,34 +38,40 @@ class UserNotificationsView(APIView):
     Se usará para el icono de notificaciones.
     """
     permission_classes = [permissions.IsAuthenticated]
+    # Consultas SQL por método, incluida la autenticación (ver event_management/query_budget.py)
+    query_budgets = {'get': 4}
     
     def get(self, request):
         try:
-            # Obtener las inscripciones del usuario con información del evento
-            registrations = EventRegistration.objects.filter(
-                user=request.user.profile
-            ).select_related('event').order_by('-created_at')
-            
+            # Filas de UserEventTimeline: ya traen la categoría; la descripción sale del JOIN por pk
+            entries = UserEventTimeline.objects.filter(user_id=request.user.pk)
+            rows = entries.order_by('-registration_created_at', '-registration_id').values(
+                'event_id', 'event_title', 'event__description', 'event_start_time', 'event_location',
+                'event_category_name', 'event_cover_url', 'registration_id', 'registration_created_at',
+                'registration_status',
+            )[:10]  # Limitar a los últimos 10
+
             # Preparar los datos de los eventos
             events_data = []
-            for registration in registrations[:10]:  # Limitar a los últimos 10
-                event = registration.event
+            for row in rows:
+                description = row['event__description']
                 events_data.append({
-                    'id': event.id,
-                    'title': event.title,
-                    'description': event.description[:100] + '...' if event.description and len(event.description) > 100 else event.description,
-                    'start_time': event.start_time,
-                    'location': event.location,
-                    'category': event.category.name if event.category else None,
-                    'cover_url': event.cover_url,
-                    'registration_id': str(registration.id),  # ¡IMPORTANTE para cancelar!
-                    'registration_date': registration.created_at,
-                    'status': registration.status,
+                    'id': row['event_id'],
+                    'title': row['event_title'],
+                    'description': description[:100] + '...' if description and len(description) > 100 else description,
+                    'start_time': row['event_start_time'],
+                    'location': row['event_location'],
+                    'category': row['event_category_name'],
+                    'cover_url': row['event_cover_url'],
+                    'registration_id': str(row['registration_id']),  # ¡IMPORTANTE para cancelar!
+                    'registration_date': row['registration_created_at'],
+                    'status': row['registration_status'],
                 })
             
             return Response({
-                'event_count': registrations.count(),
+                'event_count': entries.count(),
                 'events': events_data,
+                'unread_count': unread_count(request.user.pk),
                 'user_id': request.user.id,
                 'username': request.user.username
             }, status=status.HTTP_200_OK)
@@ -76,17 +84,69 @@ class UserNotificationsView(APIView):
             }, status=status.HTTP_200_OK)
 
 
+class NotificationInboxView(generics.GenericAPIView):
+    """
+    Bandeja de notificaciones del usuario, paginada por cursor (las más nuevas primero).
+    ?unread=true devuelve sólo las no leídas.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NotificationCursorPagination
+    query_budgets = {'get': 2}
+
+    def get(self, request):
+        entries = Notification.objects.filter(user_id=request.user.pk)
+        if request.query_params.get('unread', '').lower() in ('1', 'true'):
+            entries = entries.filter(read_at__isnull=True)
+        page = self.paginate_queryset(
+            entries.values('id', 'kind', 'message', 'event_id', 'created_at', 'read_at')
+        )
+        return self.get_paginated_response(page)
+
+
+class NotificationUnreadView(APIView):
+    """
+    Conteo de notificaciones no leídas: lo que consulta el icono en cada sondeo
+    (una consulta sobre idx_notifications_unread).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    query_budgets = {'get': 2}
+
+    def get(self, request):
+        return Response({'unread_count': unread_count(request.user.pk)})
+
+
+class NotificationReadView(APIView):
+    """
+    Marca notificaciones como leídas. Body: {"ids": [...]}; sin ids marca todas.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    query_budgets = {'post': 3}
+
+    def post(self, request):
+        ids = request.data.get('ids')
+        if ids is not None and (
+            not isinstance(ids, list) or not all(isinstance(value, int) for value in ids)
+        ):
+            return Response(
+                {'detail': 'ids debe ser una lista de enteros.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        updated = mark_read(request.user.pk, ids)
+        return Response({'updated': updated, 'unread_count': unread_count(request.user.pk)})
+
+
 class CancelRegistrationView(APIView):
     """
     View para cancelar la inscripción a un evento.
     """
     permission_classes = [permissions.IsAuthenticated]
+    query_budgets = {'delete': 10}
     
     def delete(self, request, registration_id):
         try:
             # Buscar la inscripción
             registration = get_object_or_404(
-                EventRegistration,
+                EventRegistration.objects.select_related('event'),
                 id=registration_id,
                 user=request.user.profile  # Solo puede cancelar sus propias inscripciones
             )
@@ -17,6 +17,7 @@ import {
     useToast,
 } from "@chakra-ui/react";
 import axios from "axios";
+import { liveAPI } from "services/api";
 
 const API_BASE = process.env.REACT_APP_API_BASE || "http://127.0.0.1:8000";
 
@@ -35,6 +36,19 @@ export default function AttendeeList({ isOpen, onClose, eventId, onUserJoined})
         }
     }, [isOpen, eventId]);
 
+    // Mientras la lista está abierta, se recarga cuando cambian las inscripciones del evento
+    useEffect(() => {
+        if (!isOpen || !eventId) return;
+        let lastVersion = null;
+        const unsubscribe = liveAPI.subscribe([eventId], (snapshot) => {
+            // La primera instantánea es el estado ya cargado; al reconectar puede repetirse
+            const changed = lastVersion !== null && snapshot.version !== lastVersion;
+            lastVersion = snapshot.version;
+            if (changed && !snapshot.deleted) fetchAttendees();
+        });
+        return unsubscribe;
+    }, [isOpen, eventId]);
+
     const fetchAttendees = async () => {
         setLoading(true);
         const token = localStorage.getItem("access_token");
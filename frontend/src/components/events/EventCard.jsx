@@ -33,6 +33,8 @@ export default function EventCard({ event }) {
     const [isJoining, setIsJoining] = useState(false);
     const [isRegistered, setIsRegistered] = useState(false);
     const [comments, setComments] = useState([]);
+    const [ratingSummary, setRatingSummary] = useState(null);
+    const [nextComments, setNextComments] = useState(null);
     const [isCheckingRegistration, setIsCheckingRegistration] = useState(false);
 
     // Check if user is registered when modal opens
@@ -116,10 +118,15 @@ export default function EventCard({ event }) {
         }
     };
 
-    const loadComments = async () => {
+    const loadComments = async (nextUrl = null) => {
         try {
-            const data = await eventAPI.getComments(event.id);
-            setComments(data);
+            const data = await eventAPI.getComments(event.id, nextUrl);
+            const results = data.results || [];
+            setComments((prev) => (nextUrl ? [...prev, ...results] : results));
+            setNextComments(data.next || null);
+            if (!nextUrl) {
+                setRatingSummary(data.summary || null);
+            }
         } catch (e) {
             console.error(e);
         }
@@ -304,6 +311,12 @@ export default function EventCard({ event }) {
                     <DrawerHeader>Comentarios</DrawerHeader>
 
                     <DrawerBody>
+                        {ratingSummary && ratingSummary.count > 0 && (
+                            <Text color={textColor} fontWeight="bold" mb="3">
+                                ★ {ratingSummary.average.toFixed(1)} ({ratingSummary.count} calificaciones)
+                            </Text>
+                        )}
+
                         {comments.length === 0 && (
                             <Text color={textColor}>No hay comentarios todavía.</Text>
                         )}
@@ -333,6 +346,12 @@ export default function EventCard({ event }) {
                                 <Text mt="2">{c.comment}</Text>
                             </Box>
                         ))}
+
+                        {nextComments && (
+                            <Button variant="outline" colorScheme="purple" w="100%" onClick={() => loadComments(nextComments)}>
+                                Cargar más
+                            </Button>
+                        )}
                     </DrawerBody>
                 </DrawerContent>
             </Drawer>
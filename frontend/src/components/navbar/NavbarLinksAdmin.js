@@ -58,6 +58,7 @@ export default function HeaderLinks(props) {
   const [events, setEvents] = useState([]);
   const [loadingNotifications, setLoadingNotifications] = useState(false);
   const [cancellingRegistration, setCancellingRegistration] = useState(null);
+  const unreadCountRef = useRef(null);
   
   // Estados para el diálogo de confirmación
   const [isCancelDialogOpen, setIsCancelDialogOpen] = useState(false);
@@ -101,6 +102,7 @@ export default function HeaderLinks(props) {
       
       setEventCount(count);
       setEvents(eventsData);
+      unreadCountRef.current = data.unread_count ?? null;
       
     } catch (error) {
       console.error('Error fetching notifications:', error);
@@ -115,8 +117,16 @@ export default function HeaderLinks(props) {
   useEffect(() => {
     fetchNotifications();
     
-    // Actualizar cada 60 segundos
-    const interval = setInterval(fetchNotifications, 60000);
+    // Cada 60 segundos se consulta sólo el conteo de no leídas;
+    // la lista se vuelve a pedir cuando ese conteo cambia
+    const checkUnread = async () => {
+      if (!user) return;
+      const unread = await userAPI.getUnreadCount();
+      if (unread !== null && unread !== unreadCountRef.current) {
+        fetchNotifications();
+      }
+    };
+    const interval = setInterval(checkUnread, 60000);
     
     return () => clearInterval(interval);
   }, [user]);
@@ -53,6 +53,17 @@ export const userAPI = {
       return { event_count: 0, events: [] };
     }
   },
+
+  // Conteo de notificaciones no leídas (sondeo liviano del icono)
+  getUnreadCount: async () => {
+    try {
+      const response = await api.get('/api/users/notifications/unread/');
+      return response.data.unread_count;
+    } catch (error) {
+      console.error('Error fetching unread notifications:', error);
+      return null;
+    }
+  },
   
   // Cancelar inscripción a un evento
   cancelRegistration: async (registrationId) => {
@@ -108,17 +119,61 @@ export const eventAPI = {
     }
   },
 
-  getComments: async (eventId) => {
+  // nextUrl: enlace "next" de la página anterior para cargar más comentarios
+  getComments: async (eventId, nextUrl = null) => {
     try {
-      const response = await api.get(`/api/events/${eventId}/comments/`);
-      return response.data; // lista de comentarios
+      const response = await api.get(nextUrl || `/api/events/${eventId}/comments/`);
+      return response.data; // { summary, next, previous, results }
     } catch (error) {
       console.error("Error fetching comments:", error);
-      return []; // fallback super seguro
+      return { summary: null, next: null, results: [] }; // fallback super seguro
     }
   },
 };
 
+// Actualizaciones en vivo (Server-Sent Events). EventSource no admite headers,
+// así que el token viaja en la query. Devuelve una función para cerrar la conexión.
+export const liveAPI = {
+  // El JWT no va en la URL: se pide un ticket de corta duración sólo para el stream
+  getTicket: () => api.post('/api/events/live/ticket/'),
+
+  subscribe: (eventIds, onSnapshot) => {
+    let source = null;
+    let closed = false;
+    let retryTimer = null;
+
+    const open = async () => {
+      const params = new URLSearchParams({ events: eventIds.join(',') });
+      if (localStorage.getItem('access_token')) {
+        try {
+          const { data } = await liveAPI.getTicket();
+          params.set('ticket', data.ticket);
+        } catch (error) {
+          console.warn('No se pudo obtener el ticket del stream', error);
+        }
+      }
+      if (closed) return;
+      source = new EventSource(`${API_BASE}/api/events/live/?${params}`);
+      source.addEventListener('snapshot', (message) => {
+        onSnapshot(JSON.parse(message.data));
+      });
+      source.onerror = () => {
+        // Cerrado por el servidor (p. ej. ticket vencido al reconectar): nuevo ticket
+        if (source.readyState === EventSource.CLOSED && !closed) {
+          retryTimer = setTimeout(open, 5000);
+        }
+      };
+    };
+
+    open();
+    return () => {
+      closed = true;
+      clearTimeout(retryTimer);
+      if (source) source.close();
+    };
+  },
+};
+
 // Exportar la instancia de axios por si la necesitas directamente
 export { api };
 export default api;
\ No newline at end of file
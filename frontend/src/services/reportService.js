@@ -102,19 +102,60 @@ axiosInstance.interceptors.response.use(
   }
 );
 
+// Sondeo de los jobs de reportes en segundo plano
+const JOB_POLL_INTERVAL = 2000;
+const JOB_MAX_WAIT = 5 * 60 * 1000;
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+// La petición directa no alcanzó a responder (timeout del cliente o del proxy)
+const isTimeout = (error) =>
+  error.code === 'ECONNABORTED' || [502, 503, 504].includes(error.response?.status);
+
 export const reportService = {
-  getAdminReports: async (period = 'all') => {
+  // Encola el reporte en el backend y consulta el job hasta que termine
+  runAdminReportJob: async (period = 'all', refresh = false) => {
+    let { data: job } = await axiosInstance.post('/admin-reports/jobs/', { period, refresh });
+    const deadline = Date.now() + JOB_MAX_WAIT;
+
+    while (job.status === 'queued' || job.status === 'running') {
+      if (Date.now() > deadline) {
+        throw new Error('El reporte está tardando demasiado. Intenta de nuevo en unos minutos.');
+      }
+      await sleep(JOB_POLL_INTERVAL);
+      ({ data: job } = await axiosInstance.get(`/admin-reports/jobs/${job.id}/`));
+    }
+
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'No se pudo generar el reporte.');
+    }
+    return job.result;
+  },
+
+  // params: { bucket: 'hour' | 'day' | 'week', start, end, by_category }
+  getTrends: async (params = {}) => {
+    const response = await axiosInstance.get('/admin-reports/trends/', { params });
+    return response.data;
+  },
+
+  getAdminReports: async (period = 'all', refresh = false) => {
     try {
       console.log('🔄 Obteniendo reportes admin...');
 
       const response = await axiosInstance.get('/admin-reports/', {
-        params: { period }
+        // refresh: ignora la caché del backend (botón "Actualizar")
+        params: { period, ...(refresh ? { refresh: 1 } : {}) }
       });
 
       console.log('✅ Reportes recibidos');
       return response.data;
 
     } catch (error) {
+      if (isTimeout(error)) {
+        console.log('⏳ El reporte tarda demasiado, calculándolo en segundo plano...');
+        return reportService.runAdminReportJob(period, refresh);
+      }
+
       console.error('❌ Error en getAdminReports:', {
         status: error.response?.status,
         message: error.message
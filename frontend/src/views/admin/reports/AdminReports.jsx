@@ -23,6 +23,7 @@ import {
 import Card from 'components/card/Card.js';
 import { useAuthStore } from 'stores/useAuthStore';
 import { reportService } from 'services/reportService';
+import RegistrationTrends from './components/RegistrationTrends';
 
 const AdminReports = () => {
   const [events, setEvents] = useState([]);
@@ -46,31 +47,8 @@ const AdminReports = () => {
   const role = useAuthStore((state) => state.role);
   const user = useAuthStore((state) => state.user);
 
-  // Función de prueba directa
-  const testDirectFetch = async () => {
-    try {
-      const token = localStorage.getItem('access_token');
-      console.log('🔑 Token length:', token?.length);
-
-      const API_BASE = process.env.REACT_APP_API_BASE || 'http://127.0.0.1:8000';
-      const response = await fetch(`${API_BASE}/api/admin-reports/?period=${dateRange}`, {
-        headers: {
-          'Authorization': `Bearer ${token}`,
-          'Content-Type': 'application/json',
-        },
-      });
-
-      console.log('📊 Response status:', response.status);
-      const data = await response.json();
-      console.log('📦 Data received:', data);
-      return data;
-    } catch (error) {
-      console.error('❌ Direct fetch error:', error);
-      throw error;
-    }
-  };
-
-  const fetchAdminReports = async () => {
+  // refresh=true pide al backend recalcular el reporte en lugar de usar la caché
+  const fetchAdminReports = async (refresh = false) => {
     console.log('🔄 Starting fetchAdminReports...');
     console.log('👤 User:', user);
     console.log('🎭 Role:', role);
@@ -80,12 +58,7 @@ const AdminReports = () => {
       setLoading(true);
       setError(null);
 
-      console.log('1. Testing direct fetch...');
-      const testData = await testDirectFetch();
-      console.log('✅ Direct fetch successful');
-
-      console.log('2. Now trying with reportService...');
-      const data = await reportService.getAdminReports(dateRange);
+      const data = await reportService.getAdminReports(dateRange, refresh);
       console.log('✅ Service fetch successful:', data);
 
       // Verificar estructura de datos
@@ -321,6 +294,8 @@ const AdminReports = () => {
         </Card>
       </SimpleGrid>
 
+      <RegistrationTrends />
+
       {/* Distribución por categoría */}
       {stats.eventsByCategory && Object.keys(stats.eventsByCategory).length > 0 && (
         <Card mb='20px' p="20px">
@@ -368,7 +343,7 @@ const AdminReports = () => {
               colorScheme='blue'
               onClick={() => {
                 console.log('Manual refresh clicked');
-                fetchAdminReports();
+                fetchAdminReports(true);
               }}
               isLoading={loading}
             >
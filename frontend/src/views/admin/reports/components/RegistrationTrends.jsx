@@ -0,0 +1,84 @@
+import React, { useEffect, useState } from 'react';
+import ReactApexChart from 'react-apexcharts';
+import { Box, Flex, Select, Spinner, Text, useColorModeValue } from '@chakra-ui/react';
+import Card from 'components/card/Card.js';
+import { reportService } from 'services/reportService';
+
+const BUCKET_LABELS = {
+  hour: 'Por hora (últimos 2 días)',
+  day: 'Por día (últimos 30 días)',
+  week: 'Por semana (últimos 6 meses)',
+};
+
+// Inscripciones, confirmados y asistentes por intervalo (/api/admin-reports/trends/)
+const RegistrationTrends = () => {
+  const [bucket, setBucket] = useState('day');
+  const [trends, setTrends] = useState(null);
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState(null);
+  const textColor = useColorModeValue('secondaryGray.900', 'white');
+
+  useEffect(() => {
+    let cancelled = false;
+    setLoading(true);
+    setError(null);
+    reportService.getTrends({ bucket })
+      .then(data => { if (!cancelled) setTrends(data); })
+      .catch(() => { if (!cancelled) setError('No se pudieron cargar las tendencias'); })
+      .finally(() => { if (!cancelled) setLoading(false); });
+    return () => { cancelled = true; };
+  }, [bucket]);
+
+  // La respuesta es columnar: cada serie es un arreglo alineado con `buckets`
+  const series = trends ? [
+    { name: 'Inscripciones', type: 'column', data: trends.series.registrations },
+    { name: 'Confirmados', type: 'column', data: trends.series.confirmed },
+    { name: 'Asistentes', type: 'column', data: trends.series.attended },
+    { name: 'Tasa de asistencia (%)', type: 'line', data: trends.series.attendance_rate },
+  ] : [];
+
+  const options = {
+    chart: { stacked: false, toolbar: { show: false } },
+    xaxis: {
+      type: 'datetime',
+      categories: trends ? trends.buckets : [],
+      labels: { datetimeUTC: true },
+    },
+    yaxis: [
+      { seriesName: 'Inscripciones', title: { text: 'Inscripciones' } },
+      { seriesName: 'Inscripciones', show: false },
+      { seriesName: 'Inscripciones', show: false },
+      { opposite: true, max: 100, min: 0, title: { text: '% asistencia' } },
+    ],
+    stroke: { width: [0, 0, 0, 3] },
+    dataLabels: { enabled: false },
+    legend: { position: 'top' },
+    tooltip: { x: { format: bucket === 'hour' ? 'dd MMM HH:mm' : 'dd MMM yyyy' } },
+  };
+
+  return (
+    <Card mb='20px' p='20px'>
+      <Flex justify='space-between' align='center' mb='15px'>
+        <Text fontSize='xl' fontWeight='bold' color={textColor}>
+          Tendencia de inscripciones
+        </Text>
+        <Select width='260px' value={bucket} onChange={(e) => setBucket(e.target.value)}>
+          {Object.entries(BUCKET_LABELS).map(([value, label]) => (
+            <option key={value} value={value}>{label}</option>
+          ))}
+        </Select>
+      </Flex>
+      {loading ? (
+        <Flex justify='center' py='40px'><Spinner /></Flex>
+      ) : error ? (
+        <Text color='red.500'>{error}</Text>
+      ) : (
+        <Box height='320px'>
+          <ReactApexChart key={bucket} options={options} series={series} type='line' height='100%' width='100%' />
+        </Box>
+      )}
+    </Card>
+  );
+};
+
+export default RegistrationTrends;